@@ -0,0 +1,63 @@
+"""
+Cœur analytique de l'application (NumPy / pandas)
+
+Ce paquet ne dépend pas de Streamlit : il peut être importé depuis un
+traitement batch ou un notebook. L'application Streamlit (app.py) n'en est
+qu'une interface.
+
+Exemple :
+    from analytics import load_data, apply_labels, calculate_dimension_stats
+    df = apply_labels(load_data('Etudes_relations_amoureuses.xlsx'))
+    print(calculate_dimension_stats(df))
+"""
+
+from analytics.cache import (
+    CacheBackend,
+    MemoryCache,
+    NullCache,
+    cached,
+    estimate_nbytes,
+    fingerprint,
+    get_cache_backend,
+    get_cache_stats,
+    reset_cache_stats,
+    set_cache_backend
+)
+import pandas as pd
+
+# Copy-on-Write : les DataFrames partagés (cache, magasin de jeux de données)
+# ne peuvent pas être modifiés à travers une référence obtenue par un appelant.
+# Toujours actif à partir de pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+from analytics.processing import *
+from analytics.jobs import (
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_RUNNING,
+    JobCancelledError,
+    JobManager
+)
+from analytics.catalog import DatasetCatalog
+from analytics.weighting import add_weights, effective_sample_size, get_weights, rake
+from analytics.waves import (
+    load_waves,
+    stack_waves,
+    wave_correlations,
+    wave_differences,
+    wave_group_statistics,
+    wave_statistics
+)
+from analytics.panel import change_correlations, change_scores, link_panel, paired_tests
+from analytics.likert import LikertCube, count_responses, dimension_categories
+from analytics.sampling import StratifiedSample
+from analytics.profiling import Trace, current_trace, span, start_trace, stop_trace, traced
+from analytics.store import (
+    DatasetLease,
+    DatasetStore,
+    MemoryBudgetError,
+    get_dataset_store,
+    get_memory_usage
+)
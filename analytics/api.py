@@ -0,0 +1,364 @@
+"""
+API HTTP/JSON locale exposant les calculs de l'application
+
+Serveur asyncio sans dépendance externe : les requêtes sont servies en
+parallèle à partir d'un jeu de données chargé une seule fois en mémoire, les
+calculs passent par le cache partagé du paquet analytics et les réponses sont
+identifiées par un ETag dérivé du jeu de données et de l'état des filtres.
+
+Usage :
+    python -m analytics.api --data Etudes_relations_amoureuses.xlsx --port 8765
+
+Endpoints (GET ou HEAD) :
+    /health              État du serveur et empreinte du jeu de données
+    /kpis                Indicateurs clés (effectif, scores moyens)
+    /averages            Moyennes de tous les items et totaux
+    /dimension-stats     Statistiques par dimension
+    /grouped-stats       Statistiques groupées (paramètre group_by, défaut Genre)
+    /correlations        Corrélations entre scores totaux
+
+Paramètres de filtre (identiques à la barre latérale de l'application) :
+    age, genre, etude, cohabitation, satisfaction : codes séparés par des virgules
+    duree_min, duree_max : bornes incluses de la durée de relation (mois)
+    weighted : 1 (défaut) pour pondérer par les poids de redressement du jeu de
+        données s'il en a, 0 pour des résultats non pondérés
+
+Exemple :
+    curl 'http://127.0.0.1:8765/averages?genre=1,2&age=1'
+    curl -H 'If-None-Match: "<etag>"' ...   →  304 si rien n'a changé
+"""
+
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from analytics.cache import MISSING, MemoryCache, fingerprint
+from analytics.processing import (
+    calculate_averages_by_filters,
+    calculate_dimension_stats,
+    calculate_kpis,
+    filter_data,
+    get_correlation_matrix,
+    get_grouped_statistics
+)
+from analytics.store import get_dataset_store
+
+# Paramètre d'URL -> colonne filtrée
+FILTER_PARAMS = {
+    'age': 'Age',
+    'genre': 'Genre',
+    'etude': 'Etude',
+    'cohabitation': 'Item6',
+    'satisfaction': 'Item7'
+}
+
+GROUP_BY_OPTIONS = ['Genre', 'Age', 'Etude', 'Item6', 'Item7']
+
+TOTAL_COLUMNS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+HTTP_REASONS = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error'
+}
+
+
+class RequestError(Exception):
+    """Erreur imputable à la requête (code HTTP 4xx)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================================
+# PARAMÈTRES ET SÉRIALISATION
+# ============================================================================
+
+def parse_filter_state(params):
+    """
+    Convertit les paramètres d'URL en état de filtres canonique
+
+    Args:
+        params: Dict issu de urllib.parse.parse_qs
+
+    Returns:
+        Tuple (filters, duree_range) utilisable par filter_data
+    """
+    filters = {}
+    for param, column in FILTER_PARAMS.items():
+        if param not in params:
+            continue
+        try:
+            codes = sorted({int(code) for value in params[param]
+                            for code in value.split(',') if code.strip()})
+        except ValueError:
+            raise RequestError(400, f"Paramètre '{param}' : codes entiers attendus")
+        if codes:
+            filters[column] = codes
+
+    duree_range = None
+    if 'duree_min' in params or 'duree_max' in params:
+        try:
+            duree_min = float(params.get('duree_min', ['-inf'])[0])
+            duree_max = float(params.get('duree_max', ['inf'])[0])
+        except ValueError:
+            raise RequestError(400, "Paramètres 'duree_min'/'duree_max' : nombres attendus")
+        duree_range = (duree_min, duree_max)
+
+    return filters, duree_range
+
+
+def parse_weighted(params):
+    """
+    Lit le paramètre weighted (pondération par les poids de redressement)
+
+    Returns:
+        Booléen (True par défaut)
+    """
+    value = params.get('weighted', ['1'])[0]
+    if value not in ('0', '1'):
+        raise RequestError(400, "Paramètre 'weighted' : 0 ou 1 attendu")
+    return value == '1'
+
+
+def to_jsonable(value):
+    """
+    Convertit un résultat d'analyse en structure JSON (NaN -> null)
+
+    Les DataFrames sont encodés au format {'columns', 'index', 'data'}.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {
+            'columns': [to_jsonable(col) for col in value.columns],
+            'index': [to_jsonable(idx) for idx in value.index],
+            'data': to_jsonable(value.to_numpy().tolist())
+        }
+    if isinstance(value, pd.Series):
+        return {
+            'index': [to_jsonable(idx) for idx in value.index],
+            'data': to_jsonable(value.to_numpy().tolist())
+        }
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        return to_jsonable(value.item())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# ============================================================================
+# SERVEUR
+# ============================================================================
+
+class AnalyticsServer:
+    """
+    Serveur HTTP/JSON asyncio
+
+    Args:
+        df: DataFrame labellisé (résultat de apply_labels)
+        max_workers: Nombre de threads de calcul
+        max_responses: Nombre de réponses sérialisées conservées
+        filter_index: Index bitmap des lignes de df (FilterIndex), optionnel
+    """
+
+    def __init__(self, df, max_workers=4, max_responses=512, filter_index=None):
+        self.df = df
+        self.filter_index = filter_index
+        self.dataset_id = fingerprint(df)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="analytics-api")
+        self.responses = MemoryCache(max_entries=max_responses)
+        self.in_flight = {}
+        self.endpoints = {
+            '/health': self.compute_health,
+            '/kpis': self.compute_kpis,
+            '/averages': self.compute_averages,
+            '/dimension-stats': self.compute_dimension_stats,
+            '/grouped-stats': self.compute_grouped_stats,
+            '/correlations': self.compute_correlations
+        }
+
+    # -- Calculs ------------------------------------------------------------
+
+    def filtered(self, params):
+        filters, duree_range = parse_filter_state(params)
+        return filter_data(self.df, filters, duree_range, self.filter_index)
+
+    def compute_health(self, params):
+        return {'status': 'ok', 'dataset': self.dataset_id, 'n_rows': len(self.df)}
+
+    def compute_kpis(self, params):
+        return calculate_kpis(self.filtered(params), weighted=parse_weighted(params))
+
+    def compute_averages(self, params):
+        return calculate_averages_by_filters(self.filtered(params), weighted=parse_weighted(params))
+
+    def compute_dimension_stats(self, params):
+        return calculate_dimension_stats(self.filtered(params), weighted=parse_weighted(params))
+
+    def compute_grouped_stats(self, params):
+        group_by = params.get('group_by', ['Genre'])[0]
+        if group_by not in GROUP_BY_OPTIONS:
+            raise RequestError(400, f"group_by doit valoir l'un de {GROUP_BY_OPTIONS}")
+        return get_grouped_statistics(self.filtered(params), group_by, TOTAL_COLUMNS,
+                                      weighted=parse_weighted(params))
+
+    def compute_correlations(self, params):
+        return get_correlation_matrix(self.filtered(params), weighted=parse_weighted(params))
+
+    # -- Réponses -----------------------------------------------------------
+
+    def etag_for(self, path, params):
+        """ETag d'une réponse : jeu de données + endpoint + état de filtres et pondération"""
+        filters, duree_range = parse_filter_state(params)
+        extra = params.get('group_by', ['Genre'])[0] if path == '/grouped-stats' else None
+        weighted = parse_weighted(params)
+        return '"' + fingerprint((self.dataset_id, path, filters, duree_range, extra, weighted)) + '"'
+
+    def render(self, path, params):
+        """Calcule et sérialise une réponse (exécuté dans un thread)"""
+        result = {
+            'endpoint': path,
+            'dataset': self.dataset_id,
+            'result': to_jsonable(self.endpoints[path](params))
+        }
+        return json.dumps(result, ensure_ascii=False).encode('utf-8')
+
+    async def get_body(self, path, params, etag):
+        """
+        Renvoie le corps de la réponse, depuis le cache si possible
+
+        Deux requêtes simultanées pour le même ETag partagent un seul calcul.
+        """
+        body = self.responses.get(etag)
+        if body is not MISSING:
+            return body
+
+        if etag not in self.in_flight:
+            loop = asyncio.get_running_loop()
+            self.in_flight[etag] = loop.run_in_executor(self.executor, self.render, path, params)
+        future = self.in_flight[etag]
+        try:
+            body = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.in_flight.pop(etag, None)
+
+        self.responses.set(etag, body)
+        return body
+
+    async def respond(self, method, target, headers):
+        """
+        Traite une requête
+
+        Returns:
+            Tuple (statut, en-têtes, corps)
+        """
+        if method not in ('GET', 'HEAD'):
+            raise RequestError(405, "Seules les méthodes GET et HEAD sont acceptées")
+
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        if path not in self.endpoints:
+            raise RequestError(404, f"Endpoint inconnu : {path}")
+        params = parse_qs(url.query)
+
+        etag = self.etag_for(path, params)
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+            return 304, response_headers, b''
+
+        body = await self.get_body(path, params, etag)
+        response_headers['Content-Type'] = 'application/json; charset=utf-8'
+        return 200, response_headers, body
+
+    async def handle_connection(self, reader, writer):
+        """Boucle HTTP/1.1 d'une connexion (keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except RequestError as e:
+                    method, version = 'GET', 'HTTP/1.1'
+                    status, response_headers = e.status, {'Content-Type': 'application/json; charset=utf-8'}
+                    body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+                except ValueError:
+                    status, response_headers, body = 400, {}, b''
+                    method, version = 'GET', 'HTTP/1.0'
+                except Exception as e:
+                    status, response_headers = 500, {'Content-Type': 'application/json; charset=utf-8'}
+                    body = json.dumps({'error': repr(e)}, ensure_ascii=False).encode('utf-8')
+                    method, version = 'GET', 'HTTP/1.1'
+
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                response_headers['Content-Length'] = str(len(body))
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+                head = f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                head += "".join(f"{name}: {value}\r\n" for name, value in response_headers.items())
+                writer.write(head.encode('latin-1') + b"\r\n")
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """Démarre le serveur et sert les requêtes jusqu'à interruption"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"API d'analyse sur http://{host}:{port} "
+              f"({len(self.df)} participants, jeu {self.dataset_id[:12]})")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP/JSON locale des analyses")
+    parser.add_argument("--data", required=True, help="Fichier Excel du questionnaire")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4, help="Threads de calcul")
+    args = parser.parse_args()
+
+    lease = get_dataset_store().acquire(args.data, source_id=args.data)
+    server = AnalyticsServer(lease.df, max_workers=args.workers, filter_index=lease.filter_index)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
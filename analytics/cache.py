@@ -0,0 +1,433 @@
+"""
+Cache des résultats d'analyse, indépendant de Streamlit
+
+Les fonctions décorées par @cached mémorisent leurs résultats dans le backend
+actif. Par défaut, un cache mémoire LRU partagé par tout le processus
+(équivalent de st.cache_data) ; un traitement batch peut installer un autre
+backend avec set_cache_backend (NullCache pour désactiver le cache, ou toute
+sous-classe de CacheBackend).
+
+Les résultats mis en cache sont partagés entre appelants : ils ne doivent pas
+être modifiés en place. get_cache_stats() donne, par fonction, le taux de succès,
+les temps de hachage et de calcul et la mémoire occupée.
+"""
+
+import functools
+import hashlib
+import inspect
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analytics.profiling import annotate
+
+# Valeur renvoyée par CacheBackend.get lorsqu'une clé est absente
+MISSING = object()
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class CacheBackend:
+    """
+    Interface d'un backend de cache
+
+    Les clés sont des chaînes (empreinte de la fonction et de ses arguments).
+    """
+
+    def get(self, key):
+        """Renvoie la valeur associée à la clé, ou MISSING"""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Enregistre une valeur"""
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix):
+        """Supprime toutes les entrées dont la clé commence par prefix"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Vide le cache"""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    Cache mémoire LRU, thread-safe, avec comptabilité de la mémoire occupée
+
+    Les entrées les moins récemment utilisées sont évincées dès que le nombre
+    d'entrées ou la taille totale dépasse sa limite ; un résultat plus gros que
+    le budget entier n'est jamais conservé.
+
+    Args:
+        max_entries: Nombre maximal d'entrées (None = illimité)
+        max_bytes: Taille totale maximale en octets (None = illimitée)
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()  # clé -> (valeur, taille)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return MISSING
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def set(self, key, value):
+        size = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            self.evict()
+
+    def evict(self):
+        """Évince les entrées les plus anciennes jusqu'à respecter les limites (verrou tenu)"""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+    def resize(self, max_bytes):
+        """
+        Change la taille maximale du cache et évince l'excédent
+
+        Args:
+            max_bytes: Nouvelle taille maximale en octets (None = illimitée)
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.evict()
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def usage_by_prefix(self):
+        """
+        Entrées et mémoire occupée par préfixe de clé (une fonction @cached)
+
+        Returns:
+            Dict {préfixe: {'entries', 'nbytes'}}
+        """
+        usage = {}
+        with self._lock:
+            for key, (_, size) in self._entries.items():
+                prefix = key.split(':', 1)[0] + ':'
+                entry = usage.setdefault(prefix, {'entries': 0, 'nbytes': 0})
+                entry['entries'] += 1
+                entry['nbytes'] += size
+        return usage
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullCache(CacheBackend):
+    """Backend sans mémorisation (chaque appel recalcule)"""
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+    def clear(self):
+        pass
+
+
+_backend = MemoryCache()
+
+
+def get_cache_backend():
+    """Renvoie le backend de cache actif"""
+    return _backend
+
+
+def set_cache_backend(backend):
+    """
+    Installe le backend de cache utilisé par toutes les fonctions @cached
+
+    Args:
+        backend: Instance de CacheBackend
+
+    Returns:
+        Le backend précédent (pour pouvoir le restaurer)
+    """
+    global _backend
+    if not isinstance(backend, CacheBackend):
+        raise TypeError("Le backend de cache doit hériter de CacheBackend")
+    previous, _backend = _backend, backend
+    return previous
+
+
+# ============================================================================
+# TAILLE ET EMPREINTE DES VALEURS
+# ============================================================================
+
+def estimate_nbytes(value):
+    """
+    Estime la mémoire occupée par une valeur
+
+    Args:
+        value: DataFrame, Series, tableau NumPy, conteneur ou scalaire
+
+    Returns:
+        Taille approximative en octets
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(key) + estimate_nbytes(val)
+                                          for key, val in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def hash_value(value, hasher):
+    """
+    Ajoute l'empreinte d'une valeur au hasher (contenu, pas identité)
+
+    Args:
+        value: DataFrame, Series, tableau NumPy, conteneur, scalaire ou fichier
+        hasher: Objet hashlib
+    """
+    hasher.update(type(value).__name__.encode())
+
+    if isinstance(value, pd.DataFrame):
+        hasher.update(repr(list(value.columns)).encode())
+        hasher.update(repr(list(value.dtypes.astype(str))).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        hasher.update(repr(value.name).encode())
+        hasher.update(str(value.dtype).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        hasher.update(str(value.dtype).encode())
+        hasher.update(repr(value.shape).encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            hash_value(key, hasher)
+            hash_value(value[key], hasher)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        for item in items:
+            hash_value(item, hasher)
+    elif isinstance(value, (str, bytes, int, float, bool, np.generic)) or value is None:
+        hasher.update(repr(value).encode())
+    elif hasattr(value, 'getvalue'):
+        # Fichier en mémoire (io.BytesIO, UploadedFile Streamlit) : hash du contenu
+        hasher.update(value.getvalue())
+    else:
+        try:
+            hasher.update(pickle.dumps(value))
+        except Exception as e:
+            raise TypeError(
+                f"Impossible de calculer l'empreinte d'un argument de type "
+                f"{type(value).__name__} : {e}"
+            ) from e
+
+
+def fingerprint(value):
+    """
+    Empreinte de contenu d'une valeur (DataFrame, tableau, conteneur...)
+
+    Returns:
+        Chaîne hexadécimale de 32 caractères
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hash_value(value, hasher)
+
+    return hasher.hexdigest()
+
+
+def make_key(func, args, kwargs, signature=None):
+    """
+    Clé de cache d'un appel : nom qualifié de la fonction + empreinte des arguments
+
+    Les arguments sont rattachés à la signature de la fonction, valeurs par
+    défaut comprises : f(df), f(df, False) et f(df, weighted=False) partagent
+    la même clé.
+
+    Args:
+        func: Fonction appelée (non décorée)
+        args, kwargs: Arguments de l'appel
+        signature: inspect.Signature de func (calculée si absente)
+
+    Returns:
+        Chaîne "module.fonction:empreinte"
+    """
+    if signature is None:
+        signature = inspect.signature(func)
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        # Appel invalide : la fonction lèvera elle-même l'erreur
+        bound = None
+    if bound is not None:
+        bound.apply_defaults()
+        args, kwargs = bound.args, bound.kwargs
+
+    return f"{func.__module__}.{func.__qualname__}:{fingerprint((args, kwargs))}"
+
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+class CacheStats:
+    """
+    Compteurs d'une fonction @cached
+
+    Attributes:
+        calls, hits, misses: Nombre d'appels, de succès et d'échecs
+        hash_time: Temps total passé à calculer les clés (empreinte des arguments)
+        compute_time: Temps total passé dans la fonction lors des échecs
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.hash_time = 0.0
+        self.compute_time = 0.0
+
+    def reset(self):
+        self.calls = self.hits = self.misses = 0
+        self.hash_time = self.compute_time = 0.0
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_cache_stats():
+    """
+    Statistiques de toutes les fonctions @cached
+
+    Le temps de hachage moyen est à comparer au temps de calcul moyen : une
+    fonction dont les clés coûtent autant que le calcul ne gagne rien au cache.
+
+    Returns:
+        Liste de dicts {'function', 'calls', 'hits', 'misses', 'hit_rate',
+        'hash_ms_mean', 'compute_ms_mean', 'hash_ms_total', 'compute_ms_total',
+        'entries', 'nbytes'} ; entries et nbytes valent None si le backend
+        actif ne sait pas les mesurer
+    """
+    backend = _backend
+    usage = backend.usage_by_prefix() if isinstance(backend, MemoryCache) else None
+
+    with _stats_lock:
+        stats = list(_stats.items())
+
+    report = []
+    for prefix, counters in stats:
+        entry_usage = usage.get(prefix, {'entries': 0, 'nbytes': 0}) if usage is not None else None
+        report.append({
+            'function': counters.name,
+            'calls': counters.calls,
+            'hits': counters.hits,
+            'misses': counters.misses,
+            'hit_rate': counters.hits / counters.calls if counters.calls else None,
+            'hash_ms_mean': counters.hash_time * 1000 / counters.calls if counters.calls else None,
+            'compute_ms_mean': counters.compute_time * 1000 / counters.misses if counters.misses else None,
+            'hash_ms_total': counters.hash_time * 1000,
+            'compute_ms_total': counters.compute_time * 1000,
+            'entries': entry_usage['entries'] if entry_usage is not None else None,
+            'nbytes': entry_usage['nbytes'] if entry_usage is not None else None
+        })
+
+    return report
+
+
+def reset_cache_stats():
+    """Remet à zéro les compteurs de toutes les fonctions @cached"""
+    with _stats_lock:
+        for counters in _stats.values():
+            counters.reset()
+
+
+# ============================================================================
+# DÉCORATEUR
+# ============================================================================
+
+def cached(func):
+    """
+    Mémorise les résultats d'une fonction dans le backend de cache actif
+
+    La clé dépend du contenu des arguments (un DataFrame identique d'une session
+    à l'autre donne la même clé), rattachés à la signature de la fonction. La
+    fonction décorée expose clear_cache() pour invalider ses propres entrées,
+    key_prefix (préfixe de ses clés) et uncached, la fonction d'origine.
+    """
+    prefix = f"{func.__module__}.{func.__qualname__}:"
+    counters = _stats[prefix] = CacheStats(f"{func.__module__}.{func.__qualname__}")
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        backend = _backend
+        start = time.perf_counter()
+        key = make_key(func, args, kwargs, signature)
+        hash_time = time.perf_counter() - start
+
+        value = backend.get(key)
+        if value is MISSING:
+            annotate(cache='miss')
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            compute_time = time.perf_counter() - start
+            backend.set(key, value)
+        else:
+            annotate(cache='hit')
+            compute_time = None
+
+        with _stats_lock:
+            counters.calls += 1
+            counters.hash_time += hash_time
+            if compute_time is None:
+                counters.hits += 1
+            else:
+                counters.misses += 1
+                counters.compute_time += compute_time
+
+        return value
+
+    wrapper.clear_cache = lambda: _backend.delete_prefix(prefix)
+    wrapper.key_prefix = prefix
+    wrapper.uncached = func
+
+    return wrapper
@@ -0,0 +1,107 @@
+"""
+Catalogue de métadonnées d'un jeu de données
+
+Le catalogue est construit une fois au chargement (un passage par colonne) et
+conservé avec le jeu de données partagé : la barre latérale (options des
+filtres, bornes de la durée) et le tableau de bord (répartitions du jeu
+complet) le lisent au lieu de reparcourir des colonnes qui ne changent pas.
+
+Exemple :
+    catalog = DatasetCatalog.build(df)
+    catalog.distinct['Genre']            # [1, 2, 3]
+    catalog.labels['Genre'][1]           # 'Femme'
+    catalog.ranges['Item5']              # (1, 120)
+    catalog.value_counts['Age_label']    # Series {modalité: effectif}
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import *
+
+# Version du format du catalogue et du schéma de colonnes qu'il décrit
+SCHEMA_VERSION = 1
+
+# Variables catégorielles codées et labels des codes (mêmes mappings que apply_labels)
+CATEGORICAL_LABELS = {
+    'Age': AGE_LABELS,
+    'Genre': GENRE_LABELS,
+    'Etude': ETUDE_LABELS,
+    'Item4': SITUATION_LABELS,
+    'Item6': COHABITATION_LABELS,
+    'Item7': SATISFACTION_LABELS
+}
+
+# Colonnes de labels ajoutées par apply_labels (répartitions du tableau de bord)
+LABEL_COLUMNS = ['Age_label', 'Genre_label', 'Etude_label', 'Item4_label',
+                 'Item6_label', 'Item7_label', 'Satisfaction_group']
+
+
+class DatasetCatalog:
+    """
+    Métadonnées d'un jeu de données
+
+    Attributes:
+        schema_version: Version du schéma (SCHEMA_VERSION)
+        n_rows: Nombre de lignes
+        schema: {colonne: type (str)}
+        distinct: {variable catégorielle: valeurs distinctes triées (hors manquantes)}
+        labels: {variable catégorielle: {valeur: label}} (valeur brute si le code est inconnu)
+        value_counts: {variable catégorielle ou colonne de labels: Series des effectifs,
+            par effectif décroissant}
+        ranges: {colonne numérique: (min, max)} ((None, None) si la colonne est vide)
+        missing: {colonne: nombre de valeurs manquantes}
+    """
+
+    def __init__(self, n_rows, schema, distinct, labels, value_counts, ranges, missing,
+                 schema_version=SCHEMA_VERSION):
+        self.schema_version = schema_version
+        self.n_rows = n_rows
+        self.schema = schema
+        self.distinct = distinct
+        self.labels = labels
+        self.value_counts = value_counts
+        self.ranges = ranges
+        self.missing = missing
+
+    @classmethod
+    def build(cls, df):
+        """
+        Construit le catalogue d'un jeu de données labellisé
+
+        Args:
+            df: DataFrame (résultat de apply_labels)
+
+        Returns:
+            DatasetCatalog
+        """
+        distinct, labels, value_counts = {}, {}, {}
+        for col, mapping in CATEGORICAL_LABELS.items():
+            if col not in df.columns:
+                continue
+            counts = df[col].value_counts()
+            value_counts[col] = counts
+            distinct[col] = sorted(counts.index.tolist())
+            labels[col] = {value: mapping.get(value, str(value)) for value in distinct[col]}
+
+        for col in LABEL_COLUMNS:
+            if col in df.columns:
+                value_counts[col] = df[col].value_counts()
+
+        ranges = {}
+        for col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                values = df[col].to_numpy()
+                if np.issubdtype(values.dtype, np.floating):
+                    values = values[~np.isnan(values)]
+                ranges[col] = (values.min().item(), values.max().item()) if len(values) else (None, None)
+
+        return cls(
+            n_rows=len(df),
+            schema={col: str(dtype) for col, dtype in df.dtypes.items()},
+            distinct=distinct,
+            labels=labels,
+            value_counts=value_counts,
+            ranges=ranges,
+            missing={col: int(count) for col, count in df.isna().sum().items()}
+        )
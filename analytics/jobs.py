@@ -0,0 +1,462 @@
+"""
+Analyses longues exécutées en arrière-plan dans un pool de processus
+
+Une analyse est découpée en lots indépendants (par exemple 100
+rééchantillonnages bootstrap chacun) exécutés par un pool de processus ; leurs
+résultats sont combinés dans le processus principal. Le script Streamlit ne
+fait que soumettre la tâche : il en affiche l'avancement (lots terminés) et
+reste interactif pendant le calcul.
+
+- Déduplication : une tâche est identifiée par (jeu de données, état de
+  filtres, analyse, paramètres). Une nouvelle soumission, depuis la même
+  session ou une autre, rattache le demandeur à la tâche en cours ou terminée.
+- Annulation : un demandeur se détache d'une tâche (release), par exemple
+  quand l'état de filtres de sa session change ; une tâche qui n'a plus aucun
+  demandeur est annulée, ses lots non commencés sont retirés du pool.
+- Conservation : les résultats terminés restent en mémoire (les max_results
+  plus récents) et, avec un répertoire de résultats, sur disque (JSON, sans
+  pickle), où ils sont retrouvés après un redémarrage.
+- Données : les tableaux d'une tâche sont écrits une fois dans des fichiers
+  .npy temporaires que les processus mappent en lecture seule ; chaque lot ne
+  reçoit que ses propres paramètres (nombre de rééchantillonnages, graine).
+
+Exemple :
+    manager = JobManager(workers=4)
+    params = {'columns': ('Total ES', 'Total valo'), 'n_resamples': 2000}
+    job = manager.submit('bootstrap_means', params, df, key=(dataset_key, filters))
+    job.progress            # 0.375
+    job.result()            # DataFrame (bloque jusqu'à la fin de la tâche)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from analytics.shared import frame_from_json, frame_to_json
+from analytics.weighting import get_weights
+
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+# Rééchantillonnages bootstrap calculés par lot
+BOOTSTRAP_BATCH_SIZE = 100
+
+
+class JobCancelledError(Exception):
+    """Résultat demandé à une tâche annulée"""
+
+
+# ============================================================================
+# ANALYSES
+# ============================================================================
+#
+# Chaque analyse est décrite par trois fonctions :
+#   split(df, params, data_dir) -> liste des arguments de chaque lot ; les
+#                                  tableaux partagés par les lots sont écrits
+#                                  une fois dans data_dir (save_array)
+#   task(*args)                 -> résultat d'un lot (fonction de niveau module,
+#                                  exécutée dans un autre processus)
+#   combine(results, params)    -> résultat final (résultats des lots dans l'ordre)
+# Les lots d'une même analyse reçoivent des graines dérivées de params['seed'] :
+# le résultat ne dépend pas de l'ordre d'exécution, ce qui permet de le
+# conserver et de le partager.
+
+def save_array(data_dir, name, values):
+    """Écrit un tableau partagé par les lots d'une tâche"""
+    np.save(os.path.join(data_dir, f'{name}.npy'), values)
+
+
+# Tableaux mappés par le processus courant : un lot ne remappe pas les
+# fichiers déjà ouverts par un lot précédent de la même tâche
+_mapped_arrays = OrderedDict()
+_MAX_MAPPED_ARRAYS = 8
+
+
+def load_array(data_dir, name):
+    """
+    Tableau partagé par les lots d'une tâche, mappé en lecture seule
+
+    Returns:
+        Tableau NumPy (mmap_mode='r'), ou None si la tâche n'a pas écrit ce tableau
+    """
+    path = os.path.join(data_dir, f'{name}.npy')
+    if path not in _mapped_arrays:
+        if not os.path.exists(path):
+            return None
+        _mapped_arrays[path] = np.load(path, mmap_mode='r')
+        while len(_mapped_arrays) > _MAX_MAPPED_ARRAYS:
+            _mapped_arrays.popitem(last=False)
+    _mapped_arrays.move_to_end(path)
+    return _mapped_arrays[path]
+
+
+def bootstrap_split(df, params, data_dir):
+    """
+    Lots du bootstrap : nombre de rééchantillonnages et graine de chaque lot
+
+    Les colonnes analysées et les poids des lignes (params['weighted'] :
+    moyennes pondérées par WEIGHT_COLUMN) sont écrits une fois dans data_dir.
+    """
+    save_array(data_dir, 'values',
+               df[list(params['columns'])].to_numpy(dtype=np.float64, na_value=np.nan))
+    weights = get_weights(df, params.get('weighted', False))
+    if weights is not None:
+        save_array(data_dir, 'weights', weights)
+
+    n_resamples = params['n_resamples']
+    starts = range(0, n_resamples, BOOTSTRAP_BATCH_SIZE)
+    seeds = np.random.SeedSequence(params.get('seed', 0)).spawn(len(starts))
+    return [(data_dir, min(BOOTSTRAP_BATCH_SIZE, n_resamples - start), seed)
+            for start, seed in zip(starts, seeds)]
+
+
+def bootstrap_task(data_dir, n_resamples, seed):
+    """Lot du bootstrap sur les tableaux écrits par bootstrap_split"""
+    return bootstrap_batch(load_array(data_dir, 'values'), n_resamples, seed,
+                           load_array(data_dir, 'weights'))
+
+
+def bootstrap_batch(values, n_resamples, seed, weights=None):
+    """
+    Moyennes de rééchantillonnages avec remise des lignes
+
+    Un rééchantillonnage est représenté par le nombre de tirages de chaque
+    ligne (bincount des indices tirés) : ses sommes et effectifs sont deux
+    produits matrice-vecteur, sans copier les lignes tirées. Avec des poids,
+    chaque tirage compte pour le poids de la ligne tirée.
+
+    Returns:
+        Tableau (n_resamples x colonnes) des moyennes (NaN ignorés)
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = len(values)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    valid = valid.astype(np.float64)
+
+    means = np.empty((n_resamples, values.shape[1]))
+    for i in range(n_resamples):
+        counts = np.bincount(rng.integers(0, n_rows, n_rows), minlength=n_rows).astype(np.float64)
+        if weights is not None:
+            counts *= weights
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means[i] = (counts @ filled) / (counts @ valid)
+    return means
+
+
+def bootstrap_combine(results, params):
+    """Erreurs-types et intervalles de confiance à 95 % (méthode des percentiles)"""
+    means = np.vstack(results)
+    low, high = np.nanpercentile(means, [2.5, 97.5], axis=0)
+    results_df = pd.DataFrame({
+        'Moyenne bootstrap': np.nanmean(means, axis=0),
+        'Erreur-type': np.nanstd(means, axis=0, ddof=1),
+        'IC 95 % bas': low,
+        'IC 95 % haut': high
+    }, index=pd.Index(params['columns'], name='Variable'))
+    return results_df.round(3)
+
+
+ANALYSES = {
+    'bootstrap_means': {
+        'label': "Intervalles de confiance bootstrap des moyennes",
+        'split': bootstrap_split,
+        'task': bootstrap_task,
+        'combine': bootstrap_combine
+    }
+}
+
+
+# ============================================================================
+# TÂCHES
+# ============================================================================
+
+class Job:
+    """
+    Tâche d'analyse en arrière-plan
+
+    Attributes:
+        key: Identifiant de déduplication (clé, analyse, paramètres)
+        analysis: Nom de l'analyse (clé de ANALYSES)
+        status: JOB_RUNNING, JOB_DONE, JOB_FAILED ou JOB_CANCELLED
+        n_tasks: Nombre de lots
+        n_done: Nombre de lots terminés
+        error: Exception d'un lot ou de la combinaison (status JOB_FAILED)
+        data_dir: Répertoire temporaire des tableaux partagés par les lots
+            (supprimé à la fin de la tâche)
+        owners: Demandeurs rattachés à la tâche
+        elapsed: Durée du calcul en secondes (tâche terminée)
+    """
+
+    def __init__(self, key, analysis, n_tasks):
+        self.key = key
+        self.analysis = analysis
+        self.status = JOB_RUNNING
+        self.n_tasks = n_tasks
+        self.n_done = 0
+        self.error = None
+        self.owners = set()
+        self.elapsed = None
+        self.data_dir = None
+        self._started = time.perf_counter()
+        self._futures = []
+        self._results = [None] * n_tasks
+        self._result = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def finished(cls, key, analysis, result, elapsed=None):
+        """Tâche déjà terminée (résultat retrouvé sur disque)"""
+        job = cls(key, analysis, 0)
+        job._finish(JOB_DONE, result=result)
+        job.elapsed = elapsed
+        return job
+
+    @property
+    def label(self):
+        return ANALYSES[self.analysis]['label']
+
+    @property
+    def progress(self):
+        """Part des lots terminés (entre 0 et 1)"""
+        return self.n_done / self.n_tasks if self.n_tasks else 1.0
+
+    def result(self, timeout=None):
+        """
+        Résultat de la tâche, en attendant au plus timeout secondes
+
+        Raises:
+            TimeoutError: Tâche toujours en cours
+            JobCancelledError: Tâche annulée
+            Exception: Erreur d'un lot ou de la combinaison
+        """
+        if not self._finished.wait(timeout):
+            raise TimeoutError(f"Tâche {self.analysis} toujours en cours")
+        if self.status == JOB_CANCELLED:
+            raise JobCancelledError(f"Tâche {self.analysis} annulée")
+        if self.status == JOB_FAILED:
+            raise self.error
+        return self._result
+
+    def cancel(self):
+        """Annule la tâche : les lots non commencés sont retirés du pool"""
+        with self._lock:
+            if self.status != JOB_RUNNING:
+                return
+            self._finish(JOB_CANCELLED)
+        for future in self._futures:
+            future.cancel()
+
+    def _finish(self, status, result=None, error=None, persist=None):
+        # persist(job) conserve le résultat avant que les demandeurs ne soient
+        # prévenus : un résultat reçu est déjà sur disque
+        self.status = status
+        self._result = result
+        self.error = error
+        self._results = None
+        self.elapsed = time.perf_counter() - self._started
+        # Les processus qui mappent encore les fichiers gardent leurs données
+        # jusqu'à la fin de leur lot
+        if self.data_dir is not None:
+            shutil.rmtree(self.data_dir, ignore_errors=True)
+        if persist is not None:
+            persist(self)
+        self._finished.set()
+
+
+class JobManager:
+    """
+    File de tâches d'analyse partagée par les sessions du processus
+
+    Args:
+        workers: Nombre de processus du pool (défaut : nombre de CPU)
+        result_dir: Répertoire où conserver les résultats terminés (None = en mémoire)
+        max_results: Nombre de tâches terminées gardées en mémoire
+    """
+
+    def __init__(self, workers=None, result_dir=None, max_results=128):
+        self.workers = workers or os.cpu_count() or 1
+        self.result_dir = result_dir
+        self.max_results = max_results
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Pas de fork : le serveur Streamlit est multi-thread (boucle Tornado,
+        # verrous du cache, pools de préchargement) et un processus issu d'un
+        # fork peut hériter d'un verrou tenu par un autre thread. Les lots sont
+        # des fonctions de ce module : forkserver (ou spawn) ne réimporte que
+        # analytics.jobs, et le module __main__ du lanceur streamlit, pas app.py
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            if context.get_start_method() == 'forkserver':
+                context.set_forkserver_preload(['analytics.jobs'])
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def get(self, analysis, params, key):
+        """
+        Tâche existante (en cours ou terminée) pour ces paramètres, sans en lancer
+
+        Returns:
+            Job, ou None si l'analyse n'a pas été soumise pour cette clé
+        """
+        job_key = (key, analysis, tuple(sorted(params.items())))
+        with self._lock:
+            job = self._jobs.get(job_key)
+            if job is not None and job.status in (JOB_RUNNING, JOB_DONE):
+                self._jobs.move_to_end(job_key)
+                return job
+            job = self._load(job_key, analysis)
+            if job is not None:
+                self._store(job)
+            return job
+
+    def submit(self, analysis, params, df, key, owner=None):
+        """
+        Lance une analyse, ou rattache le demandeur à la même analyse déjà lancée
+
+        Args:
+            analysis: Nom de l'analyse (clé de ANALYSES)
+            params: Paramètres de l'analyse (dict de valeurs hashables)
+            df: Données analysées (seules les colonnes utiles sont écrites pour les processus)
+            key: Identifiant hashable des données (empreinte du jeu et état de filtres)
+            owner: Demandeur (par exemple un identifiant de session)
+
+        Returns:
+            Job
+        """
+        job_key = (key, analysis, tuple(sorted(params.items())))
+        with self._lock:
+            job = self._jobs.get(job_key)
+            if job is None or job.status not in (JOB_RUNNING, JOB_DONE):
+                job = self._load(job_key, analysis)
+            if job is None:
+                spec = ANALYSES[analysis]
+                data_dir = tempfile.mkdtemp(prefix='analyse-job-')
+                try:
+                    tasks = spec['split'](df, params, data_dir)
+                except Exception:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                    raise
+                job = Job(job_key, analysis, len(tasks))
+                job.data_dir = data_dir
+                executor = self._get_executor()
+                for index, args in enumerate(tasks):
+                    future = executor.submit(spec['task'], *args)
+                    job._futures.append(future)
+                    future.add_done_callback(partial(self._task_done, job, params, index))
+            if owner is not None and job.status == JOB_RUNNING:
+                job.owners.add(owner)
+            self._store(job)
+        return job
+
+    def release(self, job, owner):
+        """Détache un demandeur ; la tâche est annulée si plus personne ne l'attend"""
+        with self._lock:
+            job.owners.discard(owner)
+            if job.owners or job.status != JOB_RUNNING:
+                return
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        job.cancel()
+
+    def jobs(self):
+        """Tâches connues, des plus anciennes aux plus récentes"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self):
+        """Annule les tâches en cours et arrête le pool de processus"""
+        for job in self.jobs():
+            job.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _store(self, job):
+        self._jobs[job.key] = job
+        self._jobs.move_to_end(job.key)
+        finished = [key for key, other in self._jobs.items() if other.status != JOB_RUNNING]
+        for key in finished[:max(0, len(finished) - self.max_results)]:
+            del self._jobs[key]
+
+    def _task_done(self, job, params, index, future):
+        # Appelé par le thread de gestion du pool à la fin de chaque lot
+        if future.cancelled():
+            return
+        error = future.exception()
+        with job._lock:
+            if job.status != JOB_RUNNING:
+                return
+            if error is None:
+                job._results[index] = future.result()
+                job.n_done += 1
+                if job.n_done < job.n_tasks:
+                    return
+                try:
+                    result = ANALYSES[job.analysis]['combine'](job._results, params)
+                except Exception as e:
+                    error = e
+            if error is not None:
+                job._finish(JOB_FAILED, error=error)
+            else:
+                job._finish(JOB_DONE, result=result, persist=self._persist)
+
+        if error is not None:
+            for future in job._futures:
+                future.cancel()
+
+    # ========================================================================
+    # CONSERVATION SUR DISQUE
+    # ========================================================================
+
+    def _path(self, job_key):
+        digest = hashlib.sha256(repr(job_key).encode('utf-8')).hexdigest()
+        return os.path.join(self.result_dir, f'{digest}.json')
+
+    def _persist(self, job):
+        # Résultats DataFrame uniquement, en JSON : relire un fichier du
+        # répertoire de résultats n'exécute jamais de code
+        if self.result_dir is None or not isinstance(job._result, pd.DataFrame):
+            return
+        os.makedirs(self.result_dir, exist_ok=True)
+        # Écriture atomique : un lecteur ne voit jamais de fichier partiel
+        fd, tmp_path = tempfile.mkstemp(dir=self.result_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': repr(job.key), 'result': frame_to_json(job._result),
+                           'elapsed': job.elapsed}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(job.key))
+        except (OSError, TypeError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, job_key, analysis):
+        if self.result_dir is None:
+            return None
+        try:
+            with open(self._path(job_key), encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('key') != repr(job_key):
+                return None
+            result = frame_from_json(saved['result'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return Job.finished(job_key, analysis, result, saved.get('elapsed'))
@@ -0,0 +1,272 @@
+"""
+Répartition des réponses aux items de Likert (cube de fréquences)
+
+Les moyennes d'items masquent la forme des réponses : deux items de moyenne 3
+peuvent être consensuels ou polarisés. Les effectifs de chaque modalité,
+pour les 27 items, sont comptés en un seul np.bincount sur les codes (item,
+réponse). Chaque dimension a son échelle (clé 'scale' de sa configuration) :
+4 modalités pour l'échelle de Rosenberg, 5 pour les autres dimensions.
+
+Le cube ajoute à ces codes la cellule de filtres de chaque ligne (combinaison
+des valeurs des colonnes filtrables de la barre latérale) : il est construit
+une fois par jeu de données, et la répartition d'un sous-ensemble filtré
+s'obtient en sommant les cellules sélectionnées, sans relire les lignes. Les
+filtres qu'il ne couvre pas (durée partielle, autres colonnes) passent par
+count_responses sur le jeu filtré. Le cube compte l'échelle la plus large
+(LIKERT_CATEGORIES) et frequencies n'en garde que les modalités demandées.
+
+Exemple :
+    items = ITEMS_ESTIME_SOI['items']
+    categories = dimension_categories(ITEMS_ESTIME_SOI)   # [1, 2, 3, 4]
+    cube = LikertCube.build(df)
+    if cube.covers(filters, duree_range):
+        counts = cube.frequencies(filters, duree_range, items=items, categories=categories)
+    else:
+        counts = count_responses(filter_data(df, filters, duree_range), items, categories)
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import *
+from analytics.cache import cached
+from analytics.processing import get_all_items
+from analytics.profiling import traced
+from analytics.shared import FILTER_INDEX_COLUMNS
+from analytics.weighting import get_weights
+
+# Échelle la plus large : modalités comptées par défaut et par le cube
+LIKERT_CATEGORIES = list(LIKERT_5_LABELS)
+
+
+def dimension_categories(items_config):
+    """Modalités de l'échelle d'une dimension (5 points par défaut)"""
+    return list(items_config.get('scale', LIKERT_5_LABELS))
+
+
+# ============================================================================
+# CODES (ITEM, RÉPONSE)
+# ============================================================================
+
+def response_codes(df, items, categories=LIKERT_CATEGORIES):
+    """
+    Code (item, réponse) de chaque réponse : item x n_modalités + rang de la modalité
+
+    Args:
+        df: DataFrame
+        items: Items à coder
+        categories: Modalités (entiers consécutifs)
+
+    Returns:
+        Tableau (lignes x items) des codes, -1 pour une réponse manquante ou
+        hors échelle
+    """
+    values = df[items].to_numpy(dtype=np.float64, na_value=np.nan)
+    ranks = values - categories[0]
+    # Conversion directe en entiers : NaN et valeurs non entières ne
+    # survivent pas à la comparaison avec le rang flottant
+    with np.errstate(invalid='ignore'):
+        int_ranks = ranks.astype(np.int64)
+    valid = (int_ranks == ranks) & (int_ranks >= 0) & (int_ranks < len(categories))
+
+    return np.where(valid, int_ranks + np.arange(len(items)) * len(categories), -1)
+
+
+def frequency_table(counts, items, categories=LIKERT_CATEGORIES):
+    """DataFrame des effectifs (items x modalités) d'un tableau de comptes aplati"""
+    return pd.DataFrame(counts.reshape(len(items), len(categories)),
+                        index=pd.Index(items, name='Item'),
+                        columns=pd.Index(categories, name='Réponse'))
+
+
+@traced('processing')
+@cached
+def count_responses(df, items=None, categories=LIKERT_CATEGORIES, weighted=False):
+    """
+    Effectifs de chaque modalité de chaque item (un seul np.bincount)
+
+    Args:
+        df: DataFrame (éventuellement filtré)
+        items: Items à compter (par défaut les 27 items psychométriques)
+        categories: Modalités de l'échelle (entiers consécutifs) ; les
+            réponses hors échelle ne sont pas comptées
+        weighted: Sommer les poids de redressement au lieu de compter les lignes
+
+    Returns:
+        DataFrame indexé par item, une colonne par modalité
+    """
+    items = list(items) if items is not None else get_all_items()
+    categories = list(categories)
+    n_codes = len(items) * len(categories)
+    codes = response_codes(df, items, categories)
+
+    valid = codes >= 0
+    weights = get_weights(df, weighted)
+    if weights is not None:
+        weights = np.broadcast_to(weights[:, None], codes.shape)[valid]
+    counts = np.bincount(codes[valid], weights, minlength=n_codes)
+
+    return frequency_table(counts, items, categories)
+
+
+# ============================================================================
+# CUBE PAR CELLULE DE FILTRES
+# ============================================================================
+
+class LikertCube:
+    """
+    Effectifs des réponses par cellule de filtres
+
+    Chaque colonne filtrable est un axe du cube : une position par valeur
+    distincte, plus une position pour les valeurs manquantes (retenue
+    seulement si la colonne n'est pas filtrée, comme dans get_filter_mask).
+    Un dernier axe distingue les lignes dont la durée (Item5) est renseignée :
+    une plage de durée couvrant toutes les valeurs ne retient qu'elles.
+
+    Attributes:
+        items: Items comptés
+        categories: Modalités comptées (entiers consécutifs)
+        axes: Liste de (colonne, valeurs distinctes) des axes de filtres
+        counts: Tableau (cellules..., items, modalités) des effectifs
+        weighted_counts: Même tableau pour les sommes des poids, ou None
+        duree_bounds: (min, max) de la durée, ou None si la colonne est absente
+    """
+
+    def __init__(self, items, categories, axes, counts, weighted_counts=None, duree_bounds=None):
+        self.items = items
+        self.categories = categories
+        self.axes = axes
+        self.counts = counts
+        self.weighted_counts = weighted_counts
+        self.duree_bounds = duree_bounds
+
+    @classmethod
+    @traced('processing')
+    def build(cls, df, items=None, columns=FILTER_INDEX_COLUMNS, categories=LIKERT_CATEGORIES):
+        """
+        Construit le cube d'un jeu de données (un seul np.bincount sur les
+        codes (cellule, item, réponse))
+
+        Args:
+            df: DataFrame complet
+            items: Items à compter (par défaut les 27 items psychométriques)
+            columns: Colonnes filtrables à croiser
+            categories: Modalités comptées (l'échelle la plus large : les
+                échelles plus courtes en sont extraites par frequencies)
+
+        Returns:
+            LikertCube
+        """
+        items = [item for item in (items or get_all_items()) if item in df.columns]
+        categories = list(categories)
+        n_codes = len(items) * len(categories)
+
+        # Cellule de chaque ligne (numération à base mixte des positions sur les axes)
+        axes, shape = [], []
+        cells = np.zeros(len(df), dtype=np.int64)
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            distinct = np.unique(values[~np.isnan(values)])
+            positions = pd.Index(distinct).get_indexer(values)
+            positions[positions < 0] = len(distinct)
+            cells = cells * (len(distinct) + 1) + positions
+            axes.append((col, distinct.tolist()))
+            shape.append(len(distinct) + 1)
+
+        duree_bounds = None
+        if 'Item5' in df.columns:
+            duree = df['Item5'].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(duree)
+            cells = cells * 2 + present
+            shape.append(2)
+            if present.any():
+                duree_bounds = (duree[present].min().item(), duree[present].max().item())
+
+        codes = response_codes(df, items, categories)
+        valid = codes >= 0
+        codes = (cells[:, None] * n_codes + codes)[valid]
+        n_cells = int(np.prod(shape))
+        cube_shape = (*shape, len(items), len(categories))
+
+        counts = np.bincount(codes, minlength=n_cells * n_codes).reshape(cube_shape)
+
+        weighted_counts = None
+        weights = get_weights(df)
+        if weights is not None:
+            weights = np.broadcast_to(weights[:, None], valid.shape)[valid]
+            weighted_counts = np.bincount(codes, weights, minlength=n_cells * n_codes).reshape(cube_shape)
+
+        return cls(items, categories, axes, counts, weighted_counts, duree_bounds)
+
+    @property
+    def nbytes(self):
+        """Taille des tableaux d'effectifs (octets)"""
+        return self.counts.nbytes + (self.weighted_counts.nbytes if self.weighted_counts is not None else 0)
+
+    def covers(self, filters, duree_range=None):
+        """
+        Indique si le cube peut répondre pour cet état de filtres
+
+        Args:
+            filters: Dictionnaire de filtres {colonne: [valeurs]}
+            duree_range: Bornes incluses (min, max) de la durée de relation
+
+        Returns:
+            True si tous les filtres portent sur des axes du cube et que la
+            plage de durée (éventuelle) couvre toutes les durées observées
+        """
+        axis_columns = {col for col, _ in self.axes}
+        if any(values and col not in axis_columns for col, values in filters.items()):
+            return False
+
+        if duree_range is not None and self.duree_bounds is not None:
+            return duree_range[0] <= self.duree_bounds[0] and duree_range[1] >= self.duree_bounds[1]
+        return True
+
+    @traced('processing')
+    def frequencies(self, filters, duree_range=None, weighted=False, items=None, categories=None):
+        """
+        Effectifs des réponses d'un sous-ensemble filtré (somme des cellules
+        sélectionnées)
+
+        Args:
+            filters: Dictionnaire de filtres {colonne: [valeurs]} (voir covers)
+            duree_range: Bornes incluses (min, max) de la durée de relation
+            weighted: Sommes des poids de redressement au lieu des effectifs
+            items: Items à retenir (par défaut tous les items du cube)
+            categories: Modalités à retenir, incluses dans celles du cube (par
+                défaut toutes)
+
+        Returns:
+            DataFrame indexé par item, une colonne par modalité (mêmes valeurs
+            que count_responses(df_filtré, items, categories))
+        """
+        counts = self.weighted_counts if weighted and self.weighted_counts is not None else self.counts
+
+        selections = []
+        for col, distinct in self.axes:
+            values = filters.get(col)
+            if values:
+                selections.append(np.append(np.isin(distinct, values), False))
+            else:
+                selections.append(None)
+        if counts.ndim - 2 > len(self.axes):
+            # Axe de la durée : sans plage, toutes les lignes ; avec, les durées renseignées
+            selections.append(np.array([duree_range is None, True]))
+
+        # Réduction axe par axe : chaque somme retire le premier axe restant
+        for selected in selections:
+            if selected is not None and not selected.all():
+                counts = counts.compress(selected, axis=0)
+            counts = counts.sum(axis=0)
+
+        items = self.items if items is None else list(items)
+        categories = self.categories if categories is None else list(categories)
+        rows = pd.Index(self.items).get_indexer(items)
+        columns = np.asarray(categories) - self.categories[0]
+        if (rows < 0).any() or (columns < 0).any() or (columns >= len(self.categories)).any():
+            raise ValueError("Items ou modalités absents du cube de réponses")
+
+        return frequency_table(counts[np.ix_(rows, columns)], items, categories)
@@ -0,0 +1,528 @@
+"""
+Statistiques hors mémoire : agrégation par blocs de lignes, en parallèle
+
+Pour les jeux de données qui ne tiennent pas en mémoire sous forme de
+DataFrame, le fichier (Parquet ou CSV) est lu par blocs de lignes dans des
+processus de travail. Chaque bloc est résumé par des statistiques suffisantes
+fusionnables (effectifs, moyennes et sommes des carrés des écarts, co-moments,
+esquisse des valeurs pour les médianes, moments par groupe), puis les résumés
+sont fusionnés. Les résultats ont le même format que les fonctions en mémoire :
+
+    calculate_averages_by_filters  ->  OutOfCoreStatistics.averages_by_filters()
+    calculate_dimension_stats      ->  OutOfCoreStatistics.dimension_stats()
+    get_correlation_matrix         ->  OutOfCoreStatistics.correlation_matrix()
+    get_grouped_statistics         ->  OutOfCoreStatistics.grouped_statistics(...)
+
+Exemple :
+    stats = scan_statistics('panel.parquet', filters={'Genre': [1]}, workers=8)
+    print(stats.dimension_stats())
+
+Usage :
+    python -m analytics.outofcore panel.parquet --workers 8
+"""
+
+import argparse
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from config import *
+from analytics.processing import detect_file_format, get_filter_mask, load_data
+
+# Taille cible d'un bloc : lignes (Parquet, Excel) ou octets (CSV)
+CHUNK_ROWS = 250_000
+CHUNK_BYTES = 32 * 2**20
+
+# Nombre maximal de valeurs distinctes conservées par esquisse (médianes)
+MAX_SKETCH_BINS = 4096
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+DIMENSIONS = {
+    'Estime de Soi': ITEMS_ESTIME_SOI,
+    'Valorisation': ITEMS_VALORISATION,
+    'Manque de Reconnaissance': ITEMS_MANQUE_RECONNAISSANCE,
+    'Gestion des Conflits': ITEMS_GESTION_CONFLITS
+}
+
+ALL_ITEMS = [item for config in DIMENSIONS.values() for item in config['items']]
+
+# Colonnes résumées par leurs moments (ordre de calculate_averages_by_filters)
+MOMENT_COLUMNS = ALL_ITEMS + TOTALS + ['Item5']
+
+# Colonnes de regroupement codées ; les colonnes de labels sont obtenues en
+# fusionnant les groupes des codes qui partagent un même label
+GROUP_COLUMNS = ['Age', 'Genre', 'Etude', 'Item4', 'Item6', 'Item7']
+
+LABEL_COLUMNS = {
+    'Age_label': ('Age', AGE_LABELS),
+    'Genre_label': ('Genre', GENRE_LABELS),
+    'Etude_label': ('Etude', ETUDE_LABELS),
+    'Item4_label': ('Item4', SITUATION_LABELS),
+    'Item6_label': ('Item6', COHABITATION_LABELS),
+    'Item7_label': ('Item7', SATISFACTION_LABELS),
+    'Satisfaction_group': ('Item7', SATISFACTION_GROUP_LABELS)
+}
+
+
+# ============================================================================
+# STATISTIQUES SUFFISANTES FUSIONNABLES
+# ============================================================================
+
+class Moments:
+    """
+    Effectif, moyenne, somme des carrés des écarts, minimum et maximum par colonne
+
+    La fusion suit la formule de Chan et al. (variance par paires), stable
+    numériquement quel que soit le nombre de blocs. Les valeurs manquantes
+    sont ignorées, comme dans pandas.
+    """
+
+    def __init__(self, n, mean, m2, minimum, maximum):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.min = minimum
+        self.max = maximum
+
+    @classmethod
+    def from_array(cls, values):
+        """Moments des colonnes d'un tableau 2D (lignes x colonnes)"""
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0)
+        filled = np.where(valid, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, filled.sum(axis=0) / n, np.nan)
+        m2 = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0)
+        minimum = np.where(n > 0, np.where(valid, values, np.inf).min(axis=0, initial=np.inf), np.nan)
+        maximum = np.where(n > 0, np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+        return cls(n, mean, m2, minimum, maximum)
+
+    def merge(self, other):
+        n = self.n + other.n
+        delta = np.nan_to_num(other.mean) - np.nan_to_num(self.mean)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, other.n / n, 0.0)
+            mean = np.where(n > 0, np.nan_to_num(self.mean) + delta * weight, np.nan)
+            m2 = self.m2 + other.m2 + np.where(n > 0, delta ** 2 * self.n * weight, 0.0)
+        return Moments(n, mean, m2, np.fmin(self.min, other.min), np.fmax(self.max, other.max))
+
+    @property
+    def std(self):
+        """Écart-type corrigé (ddof=1, comme pandas)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 1, np.sqrt(self.m2 / (self.n - 1)), np.nan)
+
+
+class CoMoments:
+    """
+    Sommes croisées pour la corrélation de Pearson par paires d'observations complètes
+
+    Pour chaque paire de colonnes (i, j), seules les lignes où les deux valeurs
+    sont présentes sont comptées (comme DataFrame.corr). Les sommes sont
+    calculées en float64 : exactes pour des scores entiers jusqu'à des
+    milliards de lignes.
+    """
+
+    def __init__(self, n, sum_x, sum_xx, sum_xy):
+        self.n = n
+        self.sum_x = sum_x
+        self.sum_xx = sum_xx
+        self.sum_xy = sum_xy
+
+    @classmethod
+    def from_array(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        valid = (~np.isnan(values)).astype(np.float64)
+        filled = np.where(valid > 0, values, 0.0)
+        # sum_x[i, j] : somme de x_i sur les lignes où x_i et x_j sont présents
+        return cls(valid.T @ valid, filled.T @ valid, (filled ** 2).T @ valid, filled.T @ filled)
+
+    def merge(self, other):
+        return CoMoments(self.n + other.n, self.sum_x + other.sum_x,
+                         self.sum_xx + other.sum_xx, self.sum_xy + other.sum_xy)
+
+    def correlation(self):
+        """Matrice de corrélation (NaN si moins de deux paires ou variance nulle)"""
+        n, sx, sxx = self.n, self.sum_x, self.sum_xx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * self.sum_xy - sx * sx.T
+            var_i = n * sxx - sx ** 2
+            corr = cov / np.sqrt(var_i * var_i.T)
+        corr = np.where((n > 1) & (var_i > 0) & (var_i.T > 0), corr, np.nan)
+        return np.clip(corr, -1.0, 1.0)
+
+
+class ValueSketch:
+    """
+    Esquisse des valeurs d'une colonne : effectif de chaque valeur distincte
+
+    Exacte tant que le nombre de valeurs distinctes reste sous max_bins (scores
+    et moyennes d'items prennent peu de valeurs) ; au-delà, les valeurs voisines
+    sont regroupées en max_bins classes d'effectifs égaux et les quantiles
+    deviennent approchés.
+    """
+
+    def __init__(self, values, counts, exact=True, max_bins=MAX_SKETCH_BINS):
+        self.values = values
+        self.counts = counts
+        self.exact = exact
+        self.max_bins = max_bins
+        if len(values) > max_bins:
+            self.compress()
+
+    @classmethod
+    def from_array(cls, values, max_bins=MAX_SKETCH_BINS):
+        values = np.asarray(values, dtype=np.float64)
+        values, counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        return cls(values, counts.astype(np.int64), max_bins=max_bins)
+
+    def merge(self, other):
+        values, inverse = np.unique(np.concatenate([self.values, other.values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, other.counts]))
+        return ValueSketch(values, counts.astype(np.int64), self.exact and other.exact, self.max_bins)
+
+    def compress(self):
+        """Regroupe les valeurs voisines en max_bins classes d'effectifs égaux"""
+        bins = np.minimum(
+            (np.cumsum(self.counts) - 1) * self.max_bins // self.counts.sum(), self.max_bins - 1)
+        counts = np.bincount(bins, weights=self.counts)
+        keep = counts > 0
+        values = np.bincount(bins, weights=self.values * self.counts)[keep] / counts[keep]
+        self.values, self.counts, self.exact = values, counts[keep].astype(np.int64), False
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def median(self):
+        """Médiane (moyenne des deux valeurs centrales pour un effectif pair, comme pandas)"""
+        n = self.n
+        if n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        lower = self.values[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+        upper = self.values[np.searchsorted(cumulative, n // 2, side='right')]
+        return (lower + upper) / 2
+
+
+class ChunkStatistics:
+    """
+    Résumé fusionnable d'un bloc de lignes
+
+    Attributes:
+        n_rows: Nombre de lignes résumées
+        columns: Colonnes présentes dans les données
+        moments: Moments de MOMENT_COLUMNS
+        row_means: Moments des moyennes d'items par ligne de chaque dimension
+        totals: CoMoments des scores totaux
+        sketches: Esquisses {colonne: ValueSketch} des totaux et des moyennes
+                  d'items par ligne de chaque dimension
+        groups: Moments par groupe {colonne codée: {code: Moments}}
+    """
+
+    def __init__(self, n_rows, columns, moments, row_means, totals, sketches, groups):
+        self.n_rows = n_rows
+        self.columns = columns
+        self.moments = moments
+        self.row_means = row_means
+        self.totals = totals
+        self.sketches = sketches
+        self.groups = groups
+
+    @classmethod
+    def from_frame(cls, df):
+        """Résume un bloc de données brutes (colonnes du fichier)"""
+        values = df.reindex(columns=MOMENT_COLUMNS).to_numpy(dtype=np.float64, na_value=np.nan)
+
+        sketches = {total: ValueSketch.from_array(df[total]) for total in TOTALS if total in df.columns}
+        row_means = np.full((len(df), len(DIMENSIONS)), np.nan)
+        for i, (name, config) in enumerate(DIMENSIONS.items()):
+            if all(item in df.columns for item in config['items']):
+                row_means[:, i] = df[config['items']].mean(axis=1).to_numpy(dtype=np.float64)
+                sketches[name] = ValueSketch.from_array(row_means[:, i])
+
+        groups = {}
+        for col in GROUP_COLUMNS:
+            if col not in df.columns:
+                continue
+            codes = df[col].to_numpy()
+            groups[col] = {
+                code.item() if hasattr(code, 'item') else code: Moments.from_array(values[codes == code])
+                for code in pd.unique(codes) if not pd.isna(code)
+            }
+
+        return cls(len(df), set(df.columns), Moments.from_array(values), Moments.from_array(row_means),
+                   CoMoments.from_array(df.reindex(columns=TOTALS).to_numpy(dtype=np.float64, na_value=np.nan)),
+                   sketches, groups)
+
+    def merge(self, other):
+        sketches = dict(self.sketches)
+        for name, sketch in other.sketches.items():
+            sketches[name] = sketches[name].merge(sketch) if name in sketches else sketch
+
+        groups = {col: dict(codes) for col, codes in self.groups.items()}
+        for col, codes in other.groups.items():
+            merged = groups.setdefault(col, {})
+            for code, moments in codes.items():
+                merged[code] = merged[code].merge(moments) if code in merged else moments
+
+        return ChunkStatistics(self.n_rows + other.n_rows, self.columns | other.columns,
+                               self.moments.merge(other.moments), self.row_means.merge(other.row_means),
+                               self.totals.merge(other.totals),
+                               sketches, groups)
+
+
+# ============================================================================
+# RÉSULTATS
+# ============================================================================
+
+class OutOfCoreStatistics:
+    """
+    Statistiques d'un jeu de données complet, au format des fonctions en mémoire
+
+    Args:
+        summary: ChunkStatistics fusionné de tous les blocs
+    """
+
+    def __init__(self, summary):
+        self.summary = summary
+
+    @property
+    def n_rows(self):
+        return self.summary.n_rows
+
+    def column_moments(self, col):
+        """(effectif, moyenne, écart-type, min, max) d'une colonne de MOMENT_COLUMNS"""
+        moments = self.summary.moments
+        i = MOMENT_COLUMNS.index(col)
+        return moments.n[i], moments.mean[i], moments.std[i], moments.min[i], moments.max[i]
+
+    def averages_by_filters(self):
+        """Équivalent de calculate_averages_by_filters"""
+        means_dict = {}
+        for col in MOMENT_COLUMNS:
+            if col in self.summary.columns:
+                n, mean, std, _, _ = self.column_moments(col)
+                name = 'Item5 (Durée relation)' if col == 'Item5' else col
+                means_dict[name] = {'Moyenne': mean, 'Écart-type': std, 'N': n}
+
+        results_df = pd.DataFrame(means_dict).T
+        results_df = results_df.round(2)
+        results_df.index.name = 'Variable'
+
+        return results_df
+
+    def dimension_stats(self):
+        """Équivalent de calculate_dimension_stats"""
+        results = []
+
+        row_means = self.summary.row_means
+        for i, (dim_name, dim_config) in enumerate(DIMENSIONS.items()):
+            total_col = dim_config['total']
+            n, mean, std, minimum, maximum = self.column_moments(total_col)
+            results.append({
+                'Dimension': dim_name,
+                'Type': 'Score Total',
+                'Moyenne': mean,
+                'Médiane': self.summary.sketches[total_col].median(),
+                'Écart-type': std,
+                'Min': minimum,
+                'Max': maximum,
+                'N': n
+            })
+
+            results.append({
+                'Dimension': dim_name,
+                'Type': 'Moyenne des Items',
+                'Moyenne': row_means.mean[i],
+                'Médiane': self.summary.sketches[dim_name].median(),
+                'Écart-type': row_means.std[i],
+                'Min': row_means.min[i],
+                'Max': row_means.max[i],
+                'N': min(self.column_moments(item)[0] for item in dim_config['items'])
+            })
+
+        return pd.DataFrame(results)
+
+    def correlation_matrix(self):
+        """Équivalent de get_correlation_matrix"""
+        labels = ['Estime de Soi', 'Valorisation', 'Manque Reconnaissance', 'Gestion Conflits']
+        return pd.DataFrame(self.summary.totals.correlation(), index=labels, columns=labels)
+
+    def grouped_statistics(self, group_by_col, value_cols):
+        """Équivalent de get_grouped_statistics (colonnes codées ou de labels)"""
+        if group_by_col in LABEL_COLUMNS:
+            source_col, labels = LABEL_COLUMNS[group_by_col]
+            groups = {}
+            for code, moments in self.summary.groups[source_col].items():
+                label = labels.get(code)
+                if label is not None:
+                    groups[label] = groups[label].merge(moments) if label in groups else moments
+        else:
+            groups = self.summary.groups[group_by_col]
+
+        keys = sorted(groups)
+        positions = [MOMENT_COLUMNS.index(col) for col in value_cols]
+        data = {}
+        for col, i in zip(value_cols, positions):
+            data[(col, 'mean')] = [groups[key].mean[i] for key in keys]
+            data[(col, 'std')] = [groups[key].std[i] for key in keys]
+            data[(col, 'count')] = np.array([groups[key].n[i] for key in keys], dtype=np.int64)
+
+        grouped = pd.DataFrame(data, index=pd.Index(keys, name=group_by_col))
+        return grouped.round(2)
+
+
+# ============================================================================
+# LECTURE PAR BLOCS ET PARALLÉLISME
+# ============================================================================
+
+def summarize_frame(df, filters=None, duree_range=None):
+    """Résume un bloc après application des filtres de la barre latérale"""
+    df.columns = df.columns.str.strip()
+    mask = get_filter_mask(df, filters or {}, duree_range)
+    if mask is not None:
+        df = df.iloc[np.flatnonzero(mask)]
+    return ChunkStatistics.from_frame(df)
+
+
+def summarize_parquet_row_groups(path, row_groups, filters, duree_range):
+    """Tâche de travail : lit et résume des groupes de lignes d'un fichier Parquet"""
+    import pyarrow.parquet as pq
+
+    table = pq.ParquetFile(path).read_row_groups(row_groups)
+    return summarize_frame(table.to_pandas(), filters, duree_range)
+
+
+def summarize_csv_range(path, start, end, names, filters, duree_range):
+    """Tâche de travail : lit et résume une plage d'octets (lignes entières) d'un CSV"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return summarize_frame(pd.read_csv(io.BytesIO(data), header=None, names=names), filters, duree_range)
+
+
+def parquet_tasks(path, chunk_rows):
+    """Groupes de lignes Parquet regroupés en tâches d'environ chunk_rows lignes"""
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(path).metadata
+    tasks, current, rows = [], [], 0
+    for i in range(metadata.num_row_groups):
+        current.append(i)
+        rows += metadata.row_group(i).num_rows
+        if rows >= chunk_rows:
+            tasks.append((summarize_parquet_row_groups, path, current))
+            current, rows = [], 0
+    if current or not tasks:
+        tasks.append((summarize_parquet_row_groups, path, current))
+    return tasks
+
+
+def csv_tasks(path, chunk_bytes):
+    """
+    Plages d'octets d'un CSV (deux lignes d'en-tête) alignées sur les fins de ligne
+
+    Les champs ne doivent pas contenir de retour à la ligne (cas des exports
+    numériques du questionnaire).
+    """
+    with open(path, 'rb') as f:
+        f.readline()
+        names = [name.strip() for name in
+                 pd.read_csv(io.BytesIO(f.readline()), header=None).iloc[0].astype(str)]
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        tasks = []
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            tasks.append((summarize_csv_range, path, start, end, names))
+            start = end
+    return tasks
+
+
+def scan_statistics(source, filters=None, duree_range=None, workers=None,
+                    chunk_rows=CHUNK_ROWS, chunk_bytes=CHUNK_BYTES):
+    """
+    Calcule les statistiques d'un fichier sans le charger entièrement en mémoire
+
+    Les blocs sont lus et résumés dans un pool de processus (un bloc par tâche,
+    au plus deux tâches en attente par processus), puis fusionnés au fil de
+    l'eau. Les fichiers Excel, lus en entier par openpyxl, sont résumés par
+    blocs dans le processus courant.
+
+    Args:
+        source: Chemin d'un fichier Parquet, CSV ou Excel
+        filters: Dictionnaire de filtres {colonne: [valeurs]}
+        duree_range: Bornes incluses (min, max) de la durée de relation (Item5)
+        workers: Nombre de processus (défaut : nombre de cœurs ; 1 = sans pool)
+        chunk_rows: Lignes par bloc (Parquet, Excel)
+        chunk_bytes: Octets par bloc (CSV)
+
+    Returns:
+        OutOfCoreStatistics
+    """
+    file_format = detect_file_format(source)
+
+    if file_format == 'excel':
+        df = load_data.uncached(source)
+        summary = None
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = summarize_frame(df.iloc[start:start + chunk_rows], filters, duree_range)
+            summary = chunk if summary is None else summary.merge(chunk)
+        return OutOfCoreStatistics(summary)
+
+    tasks = parquet_tasks(source, chunk_rows) if file_format == 'parquet' else csv_tasks(source, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+
+    summary = None
+    if workers == 1 or len(tasks) == 1:
+        for func, *args in tasks:
+            chunk = func(*args, filters, duree_range)
+            summary = chunk if summary is None else summary.merge(chunk)
+        return OutOfCoreStatistics(summary)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        pending = set()
+        tasks = iter(tasks)
+        while True:
+            # Nombre de tâches en vol borné : la mémoire reste proportionnelle aux processus
+            for func, *args in tasks:
+                pending.add(executor.submit(func, *args, filters, duree_range))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = future.result()
+                summary = chunk if summary is None else summary.merge(chunk)
+
+    return OutOfCoreStatistics(summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiques hors mémoire d'un fichier Parquet/CSV")
+    parser.add_argument("data", help="Fichier Parquet, CSV ou Excel")
+    parser.add_argument("--workers", type=int, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--group-by", default='Genre_label', help="Colonne des statistiques groupées")
+    args = parser.parse_args()
+
+    stats = scan_statistics(args.data, workers=args.workers)
+    print(f"{stats.n_rows} participants\n")
+    print(stats.dimension_stats().to_string(), end="\n\n")
+    print(stats.correlation_matrix().round(3).to_string(), end="\n\n")
+    print(stats.grouped_statistics(args.group_by, TOTALS).to_string(), end="\n\n")
+    print(stats.averages_by_filters().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Suivi longitudinal des répondants présents dans plusieurs vagues (panel)
+
+Les vagues empilées (analytics.waves) sont appariées sur PARTICIPANT_ID_COLUMN
+par une jointure sur table de hachage (pd.Index.get_indexer) : une ligne de la
+vague de départ et une ligne de la vague d'arrivée par répondant lié. Les
+scores de changement (arrivée - départ) de tous les items et totaux sont
+calculés en une seule soustraction de tableaux ; tests appariés et
+corrélations des changements portent sur ce panel.
+
+Les fonctions prennent les vagues empilées filtrées : avec @cached, leurs
+résultats sont mis en cache par état de filtres. Un répondant n'est lié que
+s'il satisfait les filtres dans les deux vagues.
+
+Exemple :
+    changes = change_scores(df_waves, '2024-S1', '2024-S2')
+    paired_tests(df_waves, '2024-S1', '2024-S2')       # Δ moyen, t, p, dz
+    change_correlations(df_waves, '2024-S1', '2024-S2') # ΔValorisation vs ΔES...
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import *
+from analytics.cache import cached
+from analytics.processing import correlation_p_values, get_all_items
+from analytics.profiling import traced
+from analytics.waves import DIMENSION_NAMES, wave_codes
+
+TOTAL_COLUMNS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+
+# ============================================================================
+# APPARIEMENT
+# ============================================================================
+
+@traced('processing')
+def link_panel(df, before, after):
+    """
+    Apparie les répondants présents dans deux vagues
+
+    Les identifiants manquants sont ignorés ; un identifiant répété dans une
+    vague n'est lié que par sa première ligne.
+
+    Args:
+        df: Vagues empilées (résultat de stack_waves, éventuellement filtré)
+        before: Vague de départ
+        after: Vague d'arrivée
+
+    Returns:
+        Tuple (positions des lignes de départ, positions des lignes d'arrivée,
+        identifiants), tableaux alignés d'un élément par répondant lié
+    """
+    codes, waves = wave_codes(df)
+    ids = df[PARTICIPANT_ID_COLUMN].to_numpy()
+
+    def wave_rows(wave):
+        rows = np.flatnonzero(codes == waves.index(wave))
+        wave_ids = pd.Index(ids[rows])
+        keep = ~wave_ids.duplicated() & wave_ids.notna()
+        return rows[keep], wave_ids[keep]
+
+    rows_before, ids_before = wave_rows(before)
+    rows_after, ids_after = wave_rows(after)
+
+    # Table de hachage sur les identifiants d'arrivée, sondée par ceux de départ
+    positions = ids_after.get_indexer(ids_before)
+    linked = positions >= 0
+
+    return rows_before[linked], rows_after[positions[linked]], ids_before[linked].to_numpy()
+
+
+def panel_columns(df):
+    """Items et totaux présents dans les vagues"""
+    return [col for col in get_all_items(include_totals=True) if col in df.columns]
+
+
+# ============================================================================
+# SCORES DE CHANGEMENT
+# ============================================================================
+
+@traced('processing')
+@cached
+def change_scores(df, before, after):
+    """
+    Scores de changement intra-individuels (arrivée - départ) de chaque item et total
+
+    Args:
+        df: Vagues empilées
+        before: Vague de départ
+        after: Vague d'arrivée
+
+    Returns:
+        DataFrame indexé par identifiant, une colonne par item et total
+        (NaN si la valeur manque dans l'une des vagues)
+    """
+    rows_before, rows_after, ids = link_panel(df, before, after)
+    columns = panel_columns(df)
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return pd.DataFrame(values[rows_after] - values[rows_before], columns=columns,
+                        index=pd.Index(ids, name=PARTICIPANT_ID_COLUMN))
+
+
+@traced('processing')
+@cached
+def paired_tests(df, before, after):
+    """
+    Tests t appariés de chaque item et total entre deux vagues
+
+    Calcul vectorisé sur la matrice des scores de changement ; taille d'effet
+    dz = Δ moyen / écart-type des Δ. Les paires incomplètes sont exclues
+    variable par variable.
+
+    Args:
+        df: Vagues empilées
+        before: Vague de départ
+        after: Vague d'arrivée
+
+    Returns:
+        DataFrame indexé par variable : 'N paires', 'Moyenne départ',
+        'Moyenne arrivée', 'Δ moyen', 'Écart-type Δ', 't', 'p', 'dz'
+    """
+    from scipy import stats as scipy_stats
+
+    rows_before, rows_after, _ = link_panel(df, before, after)
+    columns = panel_columns(df)
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    start, end = values[rows_before], values[rows_after]
+
+    complete = ~np.isnan(start) & ~np.isnan(end)
+    start, end = np.where(complete, start, np.nan), np.where(complete, end, np.nan)
+    delta = end - start
+    n = complete.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_delta = np.nansum(delta, axis=0) / n
+        sd_delta = np.sqrt(np.nansum((delta - mean_delta) ** 2, axis=0) / (n - 1))
+        t_stat = mean_delta / (sd_delta / np.sqrt(n))
+        p_values = 2 * scipy_stats.t.sf(np.abs(t_stat), n - 1)
+        results = pd.DataFrame({
+            'N paires': n,
+            'Moyenne départ': np.nansum(start, axis=0) / n,
+            'Moyenne arrivée': np.nansum(end, axis=0) / n,
+            'Δ moyen': mean_delta,
+            'Écart-type Δ': sd_delta,
+            't': t_stat,
+            'p': p_values,
+            'dz': mean_delta / sd_delta
+        }, index=pd.Index(columns, name='Variable'))
+
+    return results.round(3)
+
+
+@traced('processing')
+@cached
+def change_correlations(df, before, after):
+    """
+    Corrélations de Pearson entre les changements des scores totaux et leurs p-values
+
+    Par exemple, ΔValorisation vs ΔES : les répondants dont la valorisation
+    augmente voient-ils aussi leur estime de soi augmenter ?
+
+    Args:
+        df: Vagues empilées
+        before: Vague de départ
+        after: Vague d'arrivée
+
+    Returns:
+        Tuple (matrice de corrélation, matrice des p-values), indexées par
+        dimension ('Δ Estime de Soi'...)
+    """
+    changes = change_scores.uncached(df, before, after)[TOTAL_COLUMNS]
+    labels = [f"Δ {name}" for name in DIMENSION_NAMES]
+    corr = changes.corr()
+    corr.index, corr.columns = labels, labels
+
+    return corr, correlation_p_values(corr, changes.notna())
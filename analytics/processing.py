@@ -0,0 +1,657 @@
+"""
+Chargement et traitement des données (NumPy / pandas, sans Streamlit)
+"""
+
+import numpy as np
+import pandas as pd
+from config import *
+from analytics.cache import cached
+from analytics.profiling import traced
+from analytics.weighting import (
+    column_moments,
+    get_weights,
+    weighted_corr,
+    weighted_group_moments,
+    weighted_median,
+    weighted_moments
+)
+
+def detect_file_format(file_source):
+    """
+    Détecte le format d'un fichier de données d'après ses premiers octets
+    
+    Args:
+        file_source: Chemin (str) ou fichier en mémoire (BytesIO, UploadedFile)
+        
+    Returns:
+        'excel', 'parquet' ou 'csv'
+    """
+    if hasattr(file_source, 'getvalue'):
+        head = file_source.getvalue()[:4]
+    else:
+        with open(file_source, 'rb') as f:
+            head = f.read(4)
+    
+    # Classeur .xlsx (archive zip) ou .xls (OLE2)
+    if head.startswith(b'PK') or head.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'excel'
+    if head == b'PAR1':
+        return 'parquet'
+    return 'csv'
+
+
+@traced('processing')
+@cached
+def load_data(file_source):
+    """
+    Charge les données depuis un fichier Excel avec mise en cache
+    
+    Les exports CSV (mêmes deux lignes d'en-tête) et Parquet (une ligne
+    d'en-tête) sont aussi acceptés, pour les volumes au-delà de la limite de
+    lignes d'Excel.
+    
+    Args:
+        file_source: Chemin vers le fichier Excel (str) ou fichier uploadé (UploadedFile)
+        
+    Returns:
+        DataFrame pandas avec les données nettoyées
+    """
+    file_format = detect_file_format(file_source)
+    
+    if file_format == 'parquet':
+        df = pd.read_parquet(file_source)
+    elif file_format == 'csv':
+        df = pd.read_csv(file_source, header=1)
+    else:
+        # Charger avec la deuxième ligne comme header
+        df = pd.read_excel(file_source, header=1)
+    
+    # Nettoyer les noms de colonnes (enlever les espaces superflus)
+    df.columns = df.columns.str.strip()
+    
+    return df
+
+
+@traced('processing')
+@cached
+def apply_labels(df):
+    """
+    Applique les labels textuels aux variables catégorielles
+    
+    Les colonnes dérivées (labels, groupes de satisfaction) sont calculées une
+    seule fois ici et stockées avec les données : les jeux filtrés en héritent
+    sans recalcul ni copie supplémentaire.
+    
+    Args:
+        df: DataFrame original
+        
+    Returns:
+        DataFrame avec colonnes labellisées ajoutées
+    """
+    # Copie superficielle (Copy-on-Write) : seules les colonnes ajoutées sont allouées
+    df_labeled = df.copy(deep=False)
+    
+    # Appliquer les mappings
+    df_labeled['Age_label'] = df_labeled['Age'].map(AGE_LABELS)
+    df_labeled['Genre_label'] = df_labeled['Genre'].map(GENRE_LABELS)
+    df_labeled['Etude_label'] = df_labeled['Etude'].map(ETUDE_LABELS)
+    df_labeled['Item4_label'] = df_labeled['Item4'].map(SITUATION_LABELS)
+    df_labeled['Item6_label'] = df_labeled['Item6'].map(COHABITATION_LABELS)
+    df_labeled['Item7_label'] = df_labeled['Item7'].map(SATISFACTION_LABELS)
+    df_labeled['Satisfaction_group'] = df_labeled['Item7'].map(SATISFACTION_GROUP_LABELS)
+    
+    return df_labeled
+
+
+@traced('processing')
+def get_filter_mask(df, filters, duree_range=None, filter_index=None):
+    """
+    Calcule le masque de lignes correspondant aux filtres, sans copier les données
+    
+    Args:
+        df: DataFrame à filtrer
+        filters: Dictionnaire de filtres {colonne: [valeurs]}
+        duree_range: Bornes incluses (min, max) de la durée de relation (Item5)
+        filter_index: Index bitmap des lignes de df (FilterIndex), optionnel
+        
+    Returns:
+        Tableau NumPy booléen (une valeur par ligne), ou None si aucun filtre
+        n'écarte de ligne
+    """
+    mask = None
+    
+    # Colonnes indexées : union/intersection de bitmaps, sans relire les colonnes
+    if filter_index is not None and filter_index.n_rows == len(df):
+        indexed = {col: values for col, values in filters.items()
+                   if values and filter_index.covers(col)}
+        mask = filter_index.combine(indexed)
+        filters = {col: values for col, values in filters.items() if col not in indexed}
+    
+    for col, values in filters.items():
+        if values and len(values) > 0:
+            condition = df[col].isin(values).to_numpy()
+            mask = condition if mask is None else mask & condition
+    
+    # Filtre sur la durée si spécifié
+    if duree_range is not None and 'Item5' in df.columns:
+        duree = df['Item5'].to_numpy()
+        condition = (duree >= duree_range[0]) & (duree <= duree_range[1])
+        mask = condition if mask is None else mask & condition
+    
+    if mask is None or mask.all():
+        return None
+    
+    return mask
+
+
+@traced('processing')
+def filter_data(df, filters, duree_range=None, filter_index=None):
+    """
+    Applique les filtres sélectionnés par l'utilisateur
+    
+    Tous les filtres sont combinés en un seul masque : au plus un nouveau
+    DataFrame est matérialisé par état de filtres. Si aucune ligne n'est écartée,
+    le résultat est une copie superficielle (Copy-on-Write) qui partage les
+    données de df.
+    
+    Args:
+        df: DataFrame à filtrer
+        filters: Dictionnaire de filtres {colonne: [valeurs]}
+        duree_range: Bornes incluses (min, max) de la durée de relation (Item5)
+        filter_index: Index bitmap des lignes de df (FilterIndex), optionnel
+        
+    Returns:
+        DataFrame filtré
+    """
+    mask = get_filter_mask(df, filters, duree_range, filter_index)
+    
+    if mask is None:
+        return df.copy(deep=False)
+    
+    return df.iloc[np.flatnonzero(mask)]
+
+
+@traced('processing')
+@cached
+def calculate_kpis(df, weighted=False):
+    """
+    Indicateurs clés de l'échantillon (effectif et scores moyens)
+    
+    Args:
+        df: DataFrame
+        weighted: Moyennes pondérées par WEIGHT_COLUMN (si la colonne existe)
+        
+    Returns:
+        Dict {indicateur: valeur} (l'effectif reste non pondéré)
+    """
+    weights = get_weights(df, weighted)
+    if weights is None:
+        mean = lambda col: df[col].mean()
+    else:
+        mean = lambda col: column_moments(df, [col], weights)['Moyenne'].iloc[0]
+    
+    kpis = {
+        'N Participants': len(df),
+        'Estime de Soi (moy)': mean('Total ES'),
+        'Valorisation (moy)': mean('Total valo'),
+        'Manque Reconnaissance (moy)': mean('Total MR'),
+        'Gestion Conflits (moy)': mean('Total GC'),
+        'Durée relation (moy)': mean('Item5') if 'Item5' in df.columns else None
+    }
+    
+    return kpis
+
+
+@traced('processing')
+@cached
+def get_item_statistics(df, items_list):
+    """
+    Calcule les statistiques descriptives pour une liste d'items
+    
+    Args:
+        df: DataFrame
+        items_list: Liste des noms de colonnes (items)
+        
+    Returns:
+        DataFrame avec statistiques
+    """
+    stats = df[items_list].describe().T
+    stats['median'] = df[items_list].median()
+    stats = stats[['mean', 'median', 'std', 'min', 'max', 'count']]
+    stats.columns = ['Moyenne', 'Médiane', 'Écart-type', 'Min', 'Max', 'N']
+    
+    return stats
+
+
+@traced('processing')
+@cached
+def calculate_dimension_stats(df, weighted=False):
+    """
+    Calcule les statistiques pour toutes les dimensions (ES, Valorisation, MR, GC)
+    
+    Args:
+        df: DataFrame
+        weighted: Moyenne, médiane et écart-type pondérés par WEIGHT_COLUMN
+            (si la colonne existe) ; Min, Max et N restent non pondérés
+        
+    Returns:
+        DataFrame avec statistiques par dimension
+    """
+    weights = get_weights(df, weighted)
+    if weights is not None:
+        return weighted_dimension_stats(df, weights)
+    
+    dimensions = {
+        'Estime de Soi': ITEMS_ESTIME_SOI,
+        'Valorisation': ITEMS_VALORISATION,
+        'Manque de Reconnaissance': ITEMS_MANQUE_RECONNAISSANCE,
+        'Gestion des Conflits': ITEMS_GESTION_CONFLITS
+    }
+    
+    results = []
+    
+    for dim_name, dim_config in dimensions.items():
+        total_col = dim_config['total']
+        items_cols = dim_config['items']
+        
+        # Stats du total
+        total_stats = {
+            'Dimension': dim_name,
+            'Type': 'Score Total',
+            'Moyenne': df[total_col].mean(),
+            'Médiane': df[total_col].median(),
+            'Écart-type': df[total_col].std(),
+            'Min': df[total_col].min(),
+            'Max': df[total_col].max(),
+            'N': df[total_col].count()
+        }
+        results.append(total_stats)
+        
+        # Stats moyennes des items
+        item_means = df[items_cols].mean(axis=1).mean()
+        item_std = df[items_cols].mean(axis=1).std()
+        
+        item_stats = {
+            'Dimension': dim_name,
+            'Type': 'Moyenne des Items',
+            'Moyenne': item_means,
+            'Médiane': df[items_cols].mean(axis=1).median(),
+            'Écart-type': item_std,
+            'Min': df[items_cols].mean(axis=1).min(),
+            'Max': df[items_cols].mean(axis=1).max(),
+            'N': df[items_cols].count().min()
+        }
+        results.append(item_stats)
+    
+    return pd.DataFrame(results)
+
+
+def weighted_dimension_stats(df, weights):
+    """
+    Version pondérée de calculate_dimension_stats
+    
+    Args:
+        df: DataFrame
+        weights: Poids des lignes
+        
+    Returns:
+        DataFrame avec statistiques par dimension (mêmes colonnes)
+    """
+    dimensions = {
+        'Estime de Soi': ITEMS_ESTIME_SOI,
+        'Valorisation': ITEMS_VALORISATION,
+        'Manque de Reconnaissance': ITEMS_MANQUE_RECONNAISSANCE,
+        'Gestion des Conflits': ITEMS_GESTION_CONFLITS
+    }
+    
+    results = []
+    
+    for dim_name, dim_config in dimensions.items():
+        # Score total et moyenne des items de chaque participant
+        series = {
+            'Score Total': (df[dim_config['total']], df[dim_config['total']].count()),
+            'Moyenne des Items': (df[dim_config['items']].mean(axis=1),
+                                  df[dim_config['items']].count().min())
+        }
+        
+        for stat_type, (values, count) in series.items():
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            mean, std, _ = weighted_moments(values, weights)
+            results.append({
+                'Dimension': dim_name,
+                'Type': stat_type,
+                'Moyenne': mean[0],
+                'Médiane': weighted_median(values, weights)[0],
+                'Écart-type': std[0],
+                'Min': np.nanmin(values) if count else np.nan,
+                'Max': np.nanmax(values) if count else np.nan,
+                'N': count
+            })
+    
+    return pd.DataFrame(results)
+
+
+@traced('processing')
+@cached
+def get_correlation_matrix(df, weighted=False):
+    """
+    Calcule la matrice de corrélation entre les scores totaux
+    
+    Args:
+        df: DataFrame
+        weighted: Corrélations pondérées par WEIGHT_COLUMN (si la colonne existe)
+        
+    Returns:
+        Matrice de corrélation
+    """
+    total_cols = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+    weights = get_weights(df, weighted)
+    if weights is None:
+        corr_matrix = df[total_cols].corr()
+    else:
+        values = df[total_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        corr_matrix = pd.DataFrame(weighted_corr(values, weights))
+    
+    # Renommer pour plus de clarté
+    corr_matrix.columns = ['Estime de Soi', 'Valorisation', 'Manque Reconnaissance', 'Gestion Conflits']
+    corr_matrix.index = ['Estime de Soi', 'Valorisation', 'Manque Reconnaissance', 'Gestion Conflits']
+    
+    return corr_matrix
+
+
+def get_all_items(include_totals=False):
+    """
+    Liste ordonnée des items psychométriques (ES, Valorisation, MR, GC)
+    
+    Args:
+        include_totals: Ajouter les 4 scores totaux à la fin
+        
+    Returns:
+        Liste des noms de colonnes
+    """
+    dimensions = [ITEMS_ESTIME_SOI, ITEMS_VALORISATION,
+                  ITEMS_MANQUE_RECONNAISSANCE, ITEMS_GESTION_CONFLITS]
+    
+    items = [item for dim in dimensions for item in dim['items']]
+    if include_totals:
+        items += [dim['total'] for dim in dimensions]
+    
+    return items
+
+
+def correlation_p_values(corr, present):
+    """
+    P-values des corrélations de Pearson d'une matrice
+    
+    Obtenues en une seule opération vectorisée à partir de la statistique
+    t = r * sqrt((n - 2) / (1 - r²)), avec n le nombre d'observations
+    complètes de chaque paire.
+    
+    Args:
+        corr: Matrice de corrélation (DataFrame)
+        present: DataFrame booléen des valeurs présentes (mêmes colonnes, dans
+            le même ordre)
+        
+    Returns:
+        DataFrame des p-values (mêmes index et colonnes que corr, 0 sur la
+        diagonale, NaN si une paire a moins de 3 observations complètes)
+    """
+    # Import différé : SciPy pèse plus lourd au démarrage que pandas lui-même
+    from scipy import stats as scipy_stats
+    
+    # Nombre d'observations complètes par paire
+    present = present.to_numpy(dtype=np.float64)
+    dof = present.T @ present - 2
+    
+    r = corr.to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = r * np.sqrt(dof / (1.0 - r ** 2))
+        p_values = 2 * scipy_stats.t.sf(np.abs(t_stat), dof)
+    p_values[dof <= 0] = np.nan
+    np.fill_diagonal(p_values, 0.0)
+    
+    return pd.DataFrame(p_values, index=corr.index, columns=corr.columns)
+
+
+@traced('processing')
+@cached
+def get_item_correlations(df, include_totals=False):
+    """
+    Calcule les corrélations de Pearson entre tous les items et leurs p-values
+    
+    Args:
+        df: DataFrame
+        include_totals: Inclure les scores totaux (31 x 31 au lieu de 27 x 27)
+        
+    Returns:
+        Tuple (matrice de corrélation, matrice des p-values)
+    """
+    items = [item for item in get_all_items(include_totals) if item in df.columns]
+    corr = df[items].corr()
+    
+    return corr, correlation_p_values(corr, df[items].notna())
+
+
+@traced('processing')
+@cached
+def get_item_cluster_order(df, include_totals=False):
+    """
+    Ordonne les items par classification hiérarchique de leurs corrélations
+    
+    Distance 1 - r, liaison moyenne, ordre optimal des feuilles : les items
+    fortement corrélés se retrouvent côte à côte et forment des blocs.
+    
+    Args:
+        df: DataFrame
+        include_totals: Inclure les scores totaux
+        
+    Returns:
+        Liste des items dans l'ordre des feuilles du dendrogramme
+    """
+    from scipy.cluster import hierarchy
+    from scipy.spatial.distance import squareform
+    
+    corr, _ = get_item_correlations(df, include_totals)
+    items = list(corr.columns)
+    
+    if len(items) < 3:
+        return items
+    
+    # Corrélation indéfinie (item constant) : traitée comme absence de lien
+    distance = 1.0 - np.nan_to_num(corr.to_numpy(), nan=0.0)
+    np.fill_diagonal(distance, 0.0)
+    distance = np.clip((distance + distance.T) / 2, 0.0, 2.0)
+    
+    linkage = hierarchy.linkage(squareform(distance, checks=False), method='average',
+                                optimal_ordering=True)
+    
+    return [items[i] for i in hierarchy.leaves_list(linkage)]
+
+
+@traced('processing')
+@cached
+def get_grouped_statistics(df, group_by_col, value_cols, weighted=False):
+    """
+    Calcule les statistiques groupées par une variable catégorielle
+    
+    Args:
+        df: DataFrame
+        group_by_col: Colonne de regroupement
+        value_cols: Colonnes de valeurs à analyser
+        weighted: Moyennes et écarts-types pondérés par WEIGHT_COLUMN (si la
+            colonne existe) ; les effectifs restent non pondérés
+        
+    Returns:
+        DataFrame avec statistiques groupées
+    """
+    weights = get_weights(df, weighted)
+    if weights is None:
+        # Grouper et calculer les moyennes
+        return df.groupby(group_by_col)[value_cols].agg(['mean', 'std', 'count']).round(2)
+    
+    # Mêmes groupes que groupby (triés, manquants exclus), moments par bincount
+    codes, groups = pd.factorize(df[group_by_col], sort=True)
+    values = df[list(value_cols)].to_numpy(dtype=np.float64, na_value=np.nan)
+    mean, std, n = weighted_group_moments(codes, len(groups), values, weights)
+    
+    grouped = pd.DataFrame(
+        {(col, stat): array[:, j]
+         for j, col in enumerate(value_cols)
+         for stat, array in (('mean', mean), ('std', std), ('count', n))},
+        index=pd.Index(groups, name=group_by_col)
+    )
+    
+    return grouped.round(2)
+
+
+@traced('processing')
+@cached
+def calculate_item_means(df, items_config, weighted=False):
+    """
+    Calcule la moyenne de chaque item d'une dimension
+    
+    Args:
+        df: DataFrame
+        items_config: Configuration de la dimension (dict avec 'items' et 'total')
+        weighted: Moyennes pondérées par WEIGHT_COLUMN (si la colonne existe)
+        
+    Returns:
+        Series avec les moyennes
+    """
+    items = items_config['items']
+    weights = get_weights(df, weighted)
+    if weights is None:
+        means = df[items].mean()
+    else:
+        means = column_moments(df, items, weights)['Moyenne']
+    means = means.sort_values(ascending=False)
+    
+    return means
+
+
+@traced('processing')
+@cached
+def get_value_counts(df, column):
+    """
+    Effectifs de chaque modalité d'une variable catégorielle
+    
+    Args:
+        df: DataFrame
+        column: Colonne catégorielle (labels)
+        
+    Returns:
+        Series {modalité: effectif}, par effectif décroissant
+    """
+    return df[column].value_counts()
+
+
+@traced('processing')
+def get_demographic_summary(df):
+    """
+    Résumé des caractéristiques démographiques
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        Dict avec les résumés
+    """
+    summary = {
+        'total_participants': len(df),
+        'age_distribution': df['Age_label'].value_counts().to_dict(),
+        'genre_distribution': df['Genre_label'].value_counts().to_dict(),
+        'etude_distribution': df['Etude_label'].value_counts().to_dict(),
+        'situation_distribution': df['Item4_label'].value_counts().to_dict(),
+        'cohabitation_distribution': df['Item6_label'].value_counts().to_dict(),
+        'duree_moyenne': df['Item5'].mean() if 'Item5' in df.columns else None
+    }
+    
+    return summary
+
+
+@traced('processing')
+def get_satisfaction_groups(df):
+    """
+    Groupe les participants selon leur niveau de satisfaction relationnelle
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        DataFrame avec groupes de satisfaction (colonne Satisfaction_group)
+    """
+    # Colonne dérivée déjà présente sur les données labellisées
+    if 'Satisfaction_group' in df.columns:
+        return df
+    
+    # Copie superficielle : seule la nouvelle colonne est allouée
+    return df.assign(Satisfaction_group=df['Item7'].map(SATISFACTION_GROUP_LABELS))
+
+
+@traced('processing')
+@cached
+def calculate_averages_by_filters(df, weighted=False):
+    """
+    Calcule les moyennes de tous les items et totaux pour l'ensemble filtré
+    
+    Args:
+        df: DataFrame (potentiellement filtré)
+        weighted: Moyennes et écarts-types pondérés par WEIGHT_COLUMN (si la
+            colonne existe) ; N reste l'effectif non pondéré
+        
+    Returns:
+        DataFrame avec toutes les moyennes
+    """
+    # Colonnes à calculer
+    all_items = (
+        ITEMS_ESTIME_SOI['items'] + 
+        ITEMS_VALORISATION['items'] + 
+        ITEMS_MANQUE_RECONNAISSANCE['items'] + 
+        ITEMS_GESTION_CONFLITS['items']
+    )
+    
+    totals = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+    
+    weights = get_weights(df, weighted)
+    if weights is not None:
+        columns = [col for col in all_items + totals + ['Item5'] if col in df.columns]
+        results_df = column_moments(df, columns, weights)
+        results_df = results_df.rename(index={'Item5': 'Item5 (Durée relation)'}).round(2)
+        results_df.index.name = 'Variable'
+        return results_df
+    
+    # Calculer les moyennes
+    means_dict = {}
+    
+    # Items individuels
+    for item in all_items:
+        if item in df.columns:
+            means_dict[item] = {
+                'Moyenne': df[item].mean(),
+                'Écart-type': df[item].std(),
+                'N': df[item].count()
+            }
+    
+    # Totaux
+    for total in totals:
+        if total in df.columns:
+            means_dict[total] = {
+                'Moyenne': df[total].mean(),
+                'Écart-type': df[total].std(),
+                'N': df[total].count()
+            }
+    
+    # Variables relationnelles numériques
+    if 'Item5' in df.columns:  # Durée de relation
+        means_dict['Item5 (Durée relation)'] = {
+            'Moyenne': df['Item5'].mean(),
+            'Écart-type': df['Item5'].std(),
+            'N': df['Item5'].count()
+        }
+    
+    # Convertir en DataFrame
+    results_df = pd.DataFrame(means_dict).T
+    results_df = results_df.round(2)
+    results_df.index.name = 'Variable'
+    
+    return results_df
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Instrumentation du chemin critique : spans de temps par calcul, graphique et section
+
+Une trace est démarrée dans le thread qui exécute un rerun (start_trace) ; les
+fonctions décorées par @traced y enregistrent un span (durée, lignes traitées,
+succès ou échec du cache, taille du graphique produit). Hors trace, le
+décorateur se contente d'appeler la fonction.
+
+Exemple :
+    trace = start_trace("rerun")
+    df_filtered = filter_data(df, filters)
+    fig = create_bar_chart(...)
+    stop_trace()
+    json.dumps(trace.to_chrome_trace())   # chrome://tracing ou ui.perfetto.dev
+"""
+
+import functools
+import os
+import threading
+import time
+
+_local = threading.local()
+
+
+class Span:
+    """
+    Mesure d'un bloc de code
+
+    Attributes:
+        name: Nom du bloc (nom qualifié de la fonction)
+        category: 'data', 'processing', 'figure' ou 'section'
+        start: Début, en secondes depuis le début de la trace
+        duration: Durée en secondes (None tant que le bloc est ouvert)
+        depth: Profondeur d'imbrication
+        rows: Nombre de lignes du premier argument (DataFrame, Series, tableau)
+        cache: 'hit', 'miss' ou None (fonction sans cache)
+        payload_bytes: Taille JSON du graphique produit (catégorie 'figure')
+    """
+
+    def __init__(self, name, category, start, depth, rows=None):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = None
+        self.depth = depth
+        self.rows = rows
+        self.cache = None
+        self.payload_bytes = None
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'category': self.category,
+            'start_ms': round(self.start * 1000, 3),
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'depth': self.depth,
+            'rows': self.rows,
+            'cache': self.cache,
+            'payload_bytes': self.payload_bytes
+        }
+
+
+class Trace:
+    """
+    Ensemble des spans d'un rerun
+
+    Args:
+        name: Nom de la trace
+    """
+
+    def __init__(self, name="rerun"):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.open_spans = []
+        self.thread_id = threading.get_ident()
+
+    def begin(self, name, category, rows=None):
+        span = Span(name, category, time.perf_counter() - self.origin, len(self.open_spans), rows)
+        self.spans.append(span)
+        self.open_spans.append(span)
+        return span
+
+    def end(self, span):
+        span.duration = time.perf_counter() - self.origin - span.start
+        self.open_spans.remove(span)
+
+    @property
+    def duration(self):
+        """Durée couverte par la trace (secondes)"""
+        return max((span.start + (span.duration or 0) for span in self.spans), default=0.0)
+
+    def to_json(self):
+        """Trace au format JSON (liste de spans)"""
+        return {
+            'name': self.name,
+            'duration_ms': round(self.duration * 1000, 3),
+            'spans': [span.to_dict() for span in self.spans]
+        }
+
+    def to_chrome_trace(self):
+        """Trace au format Chrome Trace Event (chrome://tracing, Perfetto)"""
+        events = []
+        for span in self.spans:
+            args = {key: value for key, value in
+                    (('rows', span.rows), ('cache', span.cache), ('payload_bytes', span.payload_bytes))
+                    if value is not None}
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round(span.start * 1e6, 1),
+                'dur': round((span.duration or 0) * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': self.thread_id,
+                'args': args
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'name': self.name}}
+
+
+# ============================================================================
+# TRACE DU THREAD COURANT
+# ============================================================================
+
+def start_trace(name="rerun"):
+    """
+    Démarre une trace dans le thread courant (remplace la précédente)
+
+    Returns:
+        Trace
+    """
+    _local.trace = Trace(name)
+    return _local.trace
+
+
+def stop_trace():
+    """
+    Arrête la trace du thread courant
+
+    Returns:
+        La trace arrêtée, ou None
+    """
+    trace = getattr(_local, 'trace', None)
+    _local.trace = None
+    return trace
+
+
+def current_trace():
+    """Trace active du thread courant, ou None"""
+    return getattr(_local, 'trace', None)
+
+
+class span:
+    """
+    Mesure un bloc de code dans la trace active (sans effet hors trace)
+
+    Exemple :
+        with span("chargement", "data"):
+            ...
+    """
+
+    def __init__(self, name, category, rows=None):
+        self.name = name
+        self.category = category
+        self.rows = rows
+        self.record = None
+
+    def __enter__(self):
+        trace = current_trace()
+        if trace is not None:
+            self.trace = trace
+            self.record = trace.begin(self.name, self.category, self.rows)
+        return self.record
+
+    def __exit__(self, *exc_info):
+        if self.record is not None:
+            self.trace.end(self.record)
+        return False
+
+
+def annotate(**fields):
+    """Renseigne des champs (cache, rows...) du span ouvert le plus interne"""
+    trace = current_trace()
+    if trace is None or not trace.open_spans:
+        return
+    for key, value in fields.items():
+        setattr(trace.open_spans[-1], key, value)
+
+
+def count_rows(value):
+    """Nombre de lignes d'un DataFrame, d'une Series ou d'un tableau (None sinon)"""
+    shape = getattr(value, 'shape', None)
+    return int(shape[0]) if shape else None
+
+
+# ============================================================================
+# DÉCORATEUR
+# ============================================================================
+
+def traced(category):
+    """
+    Enregistre chaque appel de la fonction comme un span de la trace active
+
+    Pour la catégorie 'figure', la taille JSON du graphique renvoyé est mesurée
+    après la fermeture du span (hors durée de construction).
+
+    Args:
+        category: Catégorie du span ('processing', 'figure', 'section'...)
+    """
+    def decorator(func):
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_trace() is None:
+                return func(*args, **kwargs)
+
+            with span(name, category, count_rows(args[0]) if args else None) as record:
+                result = func(*args, **kwargs)
+
+            if category == 'figure' and hasattr(result, 'to_json'):
+                record.payload_bytes = len(result.to_json())
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,224 @@
+"""
+Estimations sur échantillon stratifié (résultats progressifs)
+
+Un échantillon stratifié sur Genre x Âge x Études (allocation proportionnelle)
+est tiré une fois par jeu de données. Pour un état de filtres, les lignes de
+l'échantillon qui satisfont les filtres forment un domaine : les moyennes y
+sont estimées par l'estimateur pondéré (poids N_h / n_h) et leur erreur-type
+par linéarisation, avec correction de population finie. L'application affiche
+ces estimations, avec leurs intervalles de confiance, le temps que les valeurs
+exactes soient calculées.
+
+Exemple :
+    sample = StratifiedSample.build(df)
+    mask = sample.filter_mask({'Genre': [1]}, (6, 60))
+    sample.averages_by_filters(mask)     # Moyenne, IC 95 %, Écart-type, N
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import *
+from analytics.cache import estimate_nbytes
+from analytics.processing import get_filter_mask
+from analytics.weighting import get_weights
+
+STRATA = ['Genre', 'Age', 'Etude']
+
+# Quantile de la loi normale pour les intervalles de confiance à 95 %
+Z_95 = 1.959964
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+AVERAGE_COLUMNS = (
+    ITEMS_ESTIME_SOI['items'] + ITEMS_VALORISATION['items'] +
+    ITEMS_MANQUE_RECONNAISSANCE['items'] + ITEMS_GESTION_CONFLITS['items'] +
+    TOTALS
+)
+
+
+class StratifiedSample:
+    """
+    Échantillon stratifié d'un jeu de données
+
+    Attributes:
+        df: Lignes échantillonnées (colonnes du jeu de données)
+        strata: Numéro de strate de chaque ligne échantillonnée
+        weights: Poids de sondage N_h / n_h de chaque ligne échantillonnée
+        population_sizes: Effectif N_h de chaque strate dans le jeu complet
+        sample_sizes: Effectif n_h de chaque strate dans l'échantillon
+    """
+
+    def __init__(self, df, strata, population_sizes, sample_sizes):
+        self.df = df
+        self.strata = strata
+        self.population_sizes = population_sizes
+        self.sample_sizes = sample_sizes
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.weights = (population_sizes / sample_sizes)[strata]
+
+    @classmethod
+    def build(cls, df, size=PROGRESSIVE_SAMPLE_SIZE, strata=STRATA, seed=0):
+        """
+        Tire un échantillon stratifié à allocation proportionnelle
+
+        Chaque strate non vide reçoit au moins deux lignes (si elle en compte
+        autant), pour que la variance y soit estimable.
+
+        Args:
+            df: Jeu de données complet
+            size: Taille visée de l'échantillon
+            strata: Colonnes de stratification (les valeurs manquantes forment un niveau)
+            seed: Graine du tirage
+
+        Returns:
+            StratifiedSample
+        """
+        codes = np.zeros(len(df), dtype=np.int64)
+        for col in strata:
+            if col in df.columns:
+                col_codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+                codes = codes * len(uniques) + col_codes
+
+        # Numérotation compacte des strates présentes
+        _, codes = np.unique(codes, return_inverse=True)
+        population_sizes = np.bincount(codes).astype(np.float64)
+
+        if len(df) <= size:
+            allocation = population_sizes.astype(np.int64)
+        else:
+            allocation = np.round(size * population_sizes / len(df)).astype(np.int64)
+            allocation = np.minimum(np.maximum(allocation, 2), population_sizes.astype(np.int64))
+
+        rng = np.random.default_rng(seed)
+        order = np.argsort(codes, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(population_sizes.astype(np.int64))[:-1]])
+        rows = np.sort(np.concatenate([
+            order[start + rng.choice(int(n_h), int(k_h), replace=False)]
+            for start, n_h, k_h in zip(starts, population_sizes, allocation)
+        ]))
+
+        return cls(df.iloc[rows].reset_index(drop=True), codes[rows],
+                   population_sizes, allocation.astype(np.float64))
+
+    @property
+    def nbytes(self):
+        """Taille des lignes échantillonnées et des tableaux de strates (octets)"""
+        return (estimate_nbytes(self.df) + self.strata.nbytes + self.weights.nbytes
+                + self.population_sizes.nbytes + self.sample_sizes.nbytes)
+
+    def __len__(self):
+        return len(self.df)
+
+    def filter_mask(self, filters, duree_range=None):
+        """
+        Lignes de l'échantillon qui satisfont les filtres (mêmes règles que filter_data)
+
+        Returns:
+            Tableau booléen (une valeur par ligne de l'échantillon)
+        """
+        mask = get_filter_mask(self.df, filters, duree_range)
+        return np.ones(len(self.df), dtype=bool) if mask is None else mask
+
+    # ========================================================================
+    # ESTIMATEURS
+    # ========================================================================
+
+    def estimate(self, columns, mask, weighted=False):
+        """
+        Estime moyenne, erreur-type, écart-type et effectif de colonnes sur un domaine
+
+        Estimateur par ratio pondéré ; variance par linéarisation, sommée sur
+        les strates avec correction de population finie. Les valeurs
+        manquantes sont exclues du domaine de la colonne concernée.
+
+        Args:
+            columns: Colonnes numériques estimées
+            mask: Domaine (tableau booléen sur les lignes de l'échantillon)
+            weighted: Estimer les moyennes pondérées par WEIGHT_COLUMN (poids de
+                sondage multipliés par les poids de redressement)
+
+        Returns:
+            DataFrame indexé par colonne : 'Moyenne', 'Erreur-type',
+            'Écart-type', 'N' (effectif estimé, non pondéré par WEIGHT_COLUMN),
+            'n' (lignes de l'échantillon)
+        """
+        values = self.df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        in_domain = mask[:, None] & ~np.isnan(values)
+        values = np.where(in_domain, values, 0.0)
+        adjustment = get_weights(self.df, weighted)
+        if adjustment is None:
+            adjustment = np.ones(len(self.df))
+        weights = np.where(in_domain, (self.weights * adjustment)[:, None], 0.0)
+
+        population = weights.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (weights * values).sum(axis=0) / population
+            residuals = np.where(in_domain, values - mean, 0.0)
+            spread = np.sqrt((weights * residuals ** 2).sum(axis=0) / (population - 1))
+            linearized = adjustment[:, None] * residuals / population
+
+        # Variance de l'estimateur : somme sur les strates de N_h² (1 - f_h) s²_h / n_h
+        n_h = self.sample_sizes
+        variance = np.zeros(len(columns))
+        for j in range(len(columns)):
+            sums = np.bincount(self.strata, linearized[:, j], minlength=len(n_h))
+            squares = np.bincount(self.strata, linearized[:, j] ** 2, minlength=len(n_h))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                s2 = np.where(n_h > 1, (squares - sums ** 2 / n_h) / (n_h - 1), 0.0)
+                fpc = 1 - n_h / self.population_sizes
+            variance[j] = np.nansum(self.population_sizes ** 2 * fpc * s2 / n_h)
+
+        return pd.DataFrame({
+            'Moyenne': mean,
+            'Erreur-type': np.sqrt(variance),
+            'Écart-type': spread,
+            'N': np.round(np.where(in_domain, self.weights[:, None], 0.0).sum(axis=0)),
+            'n': in_domain.sum(axis=0)
+        }, index=pd.Index(columns))
+
+    def averages_by_filters(self, mask, weighted=False):
+        """
+        Estimation de calculate_averages_by_filters
+
+        Returns:
+            DataFrame indexé par variable : 'Moyenne', 'IC 95 %' (demi-largeur),
+            'Écart-type', 'N' (effectif estimé)
+        """
+        columns = [col for col in AVERAGE_COLUMNS if col in self.df.columns]
+        if 'Item5' in self.df.columns:
+            columns.append('Item5')
+
+        estimates = self.estimate(columns, mask, weighted)
+        results_df = pd.DataFrame({
+            'Moyenne': estimates['Moyenne'],
+            'IC 95 %': Z_95 * estimates['Erreur-type'],
+            'Écart-type': estimates['Écart-type'],
+            'N': estimates['N']
+        }).rename(index={'Item5': 'Item5 (Durée relation)'})
+        results_df = results_df.round(2)
+        results_df.index.name = 'Variable'
+
+        return results_df
+
+    def grouped_means(self, mask, group_by_col, value_cols, weighted=False):
+        """
+        Estimation des moyennes par groupe
+
+        Returns:
+            DataFrame : une ligne par groupe présent dans le domaine, colonne
+            group_by_col, une colonne par variable et sa demi-largeur d'IC 95 %
+            ('<variable> IC 95 %')
+        """
+        groups = self.df[group_by_col]
+        rows = []
+        for group in sorted(groups[mask].dropna().unique()):
+            estimates = self.estimate(value_cols, mask & (groups == group).to_numpy(), weighted)
+            row = {group_by_col: group}
+            for col in value_cols:
+                row[col] = estimates.loc[col, 'Moyenne']
+                row[f'{col} IC 95 %'] = Z_95 * estimates.loc[col, 'Erreur-type']
+            rows.append(row)
+
+        return pd.DataFrame(rows, columns=[group_by_col] + [
+            name for col in value_cols for name in (col, f'{col} IC 95 %')])
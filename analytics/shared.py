@@ -0,0 +1,369 @@
+"""
+Jeux de données partagés entre processus par fichiers mappés en mémoire
+
+Quand plusieurs serveurs Streamlit tournent sur la même machine, le premier
+processus qui charge un fichier écrit dans un répertoire partagé :
+
+    <répertoire>/<empreinte SHA-256>/
+        meta.json           Colonnes, types et valeurs indexées
+        block_<i>.npy       Colonnes numériques, un tableau 2D par type (colonnes x lignes)
+        other_<i>.npy       Colonnes non numériques éventuelles : codes des valeurs
+        other_<i>_values.npy    et valeurs distinctes (chaînes de largeur fixe, dates...)
+        index_<i>.npy       Index de filtrage : un bitmap compressé par valeur d'une colonne
+        aggregates.json     Agrégats précalculés de la vue par défaut (sans filtre)
+
+Les autres processus mappent ces fichiers en lecture seule (np.load, mmap_mode='r') :
+les données brutes ne sont pas dupliquées en mémoire, seules les colonnes de
+labels sont recalculées, et le démarrage ne relit pas le fichier Excel.
+
+Aucun fichier n'est désérialisé avec pickle (np.load avec allow_pickle=False,
+JSON pour le reste) : un fichier déposé dans le répertoire partagé ne peut
+pas exécuter de code dans les processus qui le lisent.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from config import WEIGHT_COLUMN
+from analytics.cache import get_cache_backend, make_key
+from analytics.processing import (
+    apply_labels,
+    calculate_averages_by_filters,
+    calculate_dimension_stats,
+    get_correlation_matrix
+)
+
+FORMAT_VERSION = 3
+
+# Colonnes filtrables depuis la barre latérale, indexées par bitmaps
+FILTER_INDEX_COLUMNS = ['Age', 'Genre', 'Etude', 'Item6', 'Item7']
+
+# Agrégats de la vue par défaut, calculés une fois par le processus qui écrit
+SHARED_AGGREGATES = [calculate_averages_by_filters, calculate_dimension_stats, get_correlation_matrix]
+
+
+# ============================================================================
+# INDEX DE FILTRAGE
+# ============================================================================
+
+class FilterIndex:
+    """
+    Index bitmap des colonnes filtrables
+
+    Pour chaque colonne, un bitmap compressé (np.packbits) par valeur distincte :
+    le masque d'un filtre est l'union des bitmaps des valeurs sélectionnées, et
+    les filtres se combinent par intersection, sans relire les colonnes.
+
+    Args:
+        n_rows: Nombre de lignes indexées
+        bitmaps: Dict {colonne: (valeurs, tableau uint8 de forme (n_valeurs, n_octets))}
+    """
+
+    def __init__(self, n_rows, bitmaps):
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def build(cls, df, columns=FILTER_INDEX_COLUMNS):
+        """Construit l'index des colonnes présentes dans df"""
+        bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            distinct = [value for value in pd.unique(values) if not pd.isna(value)]
+            distinct.sort()
+            bitmaps[col] = (
+                distinct,
+                np.array([np.packbits(values == value) for value in distinct], dtype=np.uint8)
+                .reshape(len(distinct), -1)
+            )
+        return cls(len(df), bitmaps)
+
+    @property
+    def nbytes(self):
+        """Taille des bitmaps (octets)"""
+        return sum(bitmaps.nbytes for _, bitmaps in self.bitmaps.values())
+
+    def covers(self, col):
+        return col in self.bitmaps
+
+    def mask(self, col, values):
+        """
+        Masque des lignes dont la colonne prend l'une des valeurs
+
+        Returns:
+            Bitmap compressé (tableau uint8)
+        """
+        distinct, bitmaps = self.bitmaps[col]
+        rows = [distinct.index(value) for value in values if value in distinct]
+        if not rows:
+            return np.zeros(bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(bitmaps[rows], axis=0)
+
+    def combine(self, filters):
+        """
+        Combine les filtres portant sur des colonnes indexées
+
+        Args:
+            filters: Dict {colonne: [valeurs]}, colonnes indexées uniquement
+
+        Returns:
+            Tableau booléen (une valeur par ligne), ou None si aucun filtre
+        """
+        packed = None
+        for col, values in filters.items():
+            bits = self.mask(col, values)
+            packed = bits if packed is None else packed & bits
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+
+# ============================================================================
+# SÉRIALISATION SANS PICKLE
+# ============================================================================
+
+def save_codes(directory, prefix, series):
+    """
+    Écrit une colonne non numérique en deux tableaux .npy : les codes de ses
+    valeurs (-1 pour une valeur manquante) et ses valeurs distinctes
+
+    Les valeurs distinctes de type objet sont converties en chaînes de largeur
+    fixe, pour que np.load n'ait jamais besoin de pickle.
+
+    Args:
+        directory: Répertoire d'écriture
+        prefix: Préfixe des fichiers (<prefix>.npy et <prefix>_values.npy)
+        series: Colonne à écrire
+
+    Returns:
+        Dict décrivant la colonne (fichiers et type d'origine) pour meta.json
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    values = np.asarray(uniques)
+    if values.dtype == object:
+        values = values.astype(str)
+
+    spec = {'codes': f'{prefix}.npy', 'values': f'{prefix}_values.npy', 'dtype': str(series.dtype)}
+    np.save(os.path.join(directory, spec['codes']), codes)
+    np.save(os.path.join(directory, spec['values']), values)
+    return spec
+
+
+def load_codes(directory, spec):
+    """Relit une colonne écrite par save_codes, avec son type d'origine"""
+    codes = np.load(os.path.join(directory, spec['codes']), allow_pickle=False)
+    values = np.load(os.path.join(directory, spec['values']), allow_pickle=False)
+    return pd.Series(pd.Categorical.from_codes(codes, values)).astype(spec['dtype'])
+
+
+def frame_to_json(df):
+    """
+    Représentation JSON exacte d'un DataFrame d'agrégats
+
+    Les flottants passent par repr (json) : la relecture redonne les mêmes
+    valeurs au bit près, ce que DataFrame.to_json ne garantit pas.
+    """
+    return {
+        'index': df.index.tolist(),
+        'index_name': df.index.name,
+        'columns': df.columns.tolist(),
+        'columns_name': df.columns.name,
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'data': [df.iloc[:, i].tolist() for i in range(df.shape[1])]
+    }
+
+
+def frame_from_json(spec):
+    """DataFrame d'agrégats relu depuis frame_to_json"""
+    columns = pd.Index(spec['columns'], name=spec['columns_name'])
+    index = pd.Index(spec['index'], name=spec['index_name'])
+    return pd.DataFrame({i: pd.Series(values, index=index, dtype=dtype)
+                         for i, (values, dtype) in enumerate(zip(spec['data'], spec['dtypes']))},
+                        index=index).set_axis(columns, axis=1)
+
+
+# ============================================================================
+# ÉCRITURE ET MAPPING
+# ============================================================================
+
+def write_shared_dataset(directory, df_raw, df_labeled, filter_index):
+    """
+    Écrit un jeu de données dans le répertoire partagé (écriture atomique)
+
+    Le jeu est écrit dans un répertoire temporaire puis renommé : un processus
+    concurrent qui a écrit le même jeu en premier est conservé.
+
+    Args:
+        directory: Répertoire final (<répertoire partagé>/<empreinte>)
+        df_raw: DataFrame brut (résultat de load_data)
+        df_labeled: DataFrame labellisé (pour les agrégats précalculés)
+        filter_index: FilterIndex du jeu de données
+
+    Returns:
+        Dict {clé de cache: valeur} des agrégats précalculés
+    """
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(directory) + '.tmp')
+
+    try:
+        meta = {
+            'version': FORMAT_VERSION,
+            'n_rows': len(df_raw),
+            'columns': list(df_raw.columns),
+            'blocks': [],
+            'other_columns': [],
+            'filter_index': {}
+        }
+
+        # Colonnes numériques regroupées par type : un bloc 2D mappé par type
+        by_dtype = {}
+        for col in df_raw.columns:
+            if df_raw[col].dtype.kind in 'biuf':
+                by_dtype.setdefault(str(df_raw[col].dtype), []).append(col)
+            else:
+                meta['other_columns'].append(col)
+
+        for i, (dtype, columns) in enumerate(by_dtype.items()):
+            file_name = f'block_{i}.npy'
+            np.save(os.path.join(tmp_dir, file_name),
+                    np.ascontiguousarray(df_raw[columns].to_numpy(dtype=dtype).T))
+            meta['blocks'].append({'file': file_name, 'dtype': dtype, 'columns': columns})
+
+        meta['other_columns'] = [
+            dict(save_codes(tmp_dir, f'other_{i}', df_raw[col]), column=col)
+            for i, col in enumerate(meta['other_columns'])
+        ]
+
+        for i, (col, (values, bitmaps)) in enumerate(filter_index.bitmaps.items()):
+            file_name = f'index_{i}.npy'
+            np.save(os.path.join(tmp_dir, file_name), bitmaps)
+            meta['filter_index'][col] = {'file': file_name,
+                                         'values': [np.asarray(v).item() for v in values]}
+
+        # Agrégats de la vue par défaut (pondérée si le jeu a des poids),
+        # indexés comme le cache (@cached)
+        kwargs = {'weighted': WEIGHT_COLUMN in df_labeled.columns}
+        aggregates = {make_key(func.uncached, (df_labeled,), kwargs): func.uncached(df_labeled, **kwargs)
+                      for func in SHARED_AGGREGATES}
+        with open(os.path.join(tmp_dir, 'aggregates.json'), 'w', encoding='utf-8') as f:
+            json.dump([{'key': key, 'frame': frame_to_json(value)} for key, value in aggregates.items()],
+                      f, ensure_ascii=False)
+
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            # Un autre processus a écrit ce jeu entre-temps : on garde le sien
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return aggregates
+
+
+def map_shared_dataset(directory):
+    """
+    Mappe en lecture seule un jeu de données du répertoire partagé
+
+    Args:
+        directory: Répertoire du jeu (<répertoire partagé>/<empreinte>)
+
+    Returns:
+        Tuple (df_raw, filter_index, aggregates, mapped_bytes), où mapped_bytes
+        est la taille des colonnes mappées, ou None si le jeu n'a pas encore été écrit
+    """
+    meta_path = os.path.join(directory, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        return None
+
+    blocks = [(np.load(os.path.join(directory, block['file']), mmap_mode='r', allow_pickle=False),
+               block['columns'])
+              for block in meta['blocks']]
+    mapped_bytes = sum(array.nbytes for array, _ in blocks)
+
+    # Le bloc le plus large porte le DataFrame (sans copie), les autres colonnes
+    # y sont insérées à leur position d'origine, elles aussi sans copie
+    columns = {}
+    main_array, main_columns = max(blocks, key=lambda block: len(block[1]), default=(None, []))
+    for array, block_columns in blocks:
+        if array is not main_array:
+            for i, col in enumerate(block_columns):
+                columns[col] = pd.Series(array[i], name=col, copy=False)
+    for spec in meta['other_columns']:
+        columns[spec['column']] = load_codes(directory, spec)
+
+    if main_array is not None:
+        df_raw = pd.DataFrame(main_array.T, columns=main_columns, copy=False)
+    else:
+        df_raw = pd.DataFrame(index=pd.RangeIndex(meta['n_rows']))
+    for loc, col in enumerate(meta['columns']):
+        if col in columns:
+            df_raw.insert(loc, col, columns[col])
+
+    bitmaps = {
+        col: (spec['values'], np.load(os.path.join(directory, spec['file']), mmap_mode='r',
+                                      allow_pickle=False))
+        for col, spec in meta['filter_index'].items()
+    }
+
+    with open(os.path.join(directory, 'aggregates.json'), encoding='utf-8') as f:
+        aggregates = {entry['key']: frame_from_json(entry['frame']) for entry in json.load(f)}
+
+    return df_raw, FilterIndex(meta['n_rows'], bitmaps), aggregates, mapped_bytes
+
+
+def seed_aggregates(aggregates):
+    """Installe les agrégats précalculés dans le backend de cache actif"""
+    backend = get_cache_backend()
+    for key, value in aggregates.items():
+        backend.set(key, value)
+
+
+def load_shared_dataset(shared_dir, key, data, parse):
+    """
+    Renvoie un jeu de données labellisé depuis le répertoire partagé
+
+    Le jeu est mappé s'il existe, sinon lu avec parse(data) puis écrit pour les
+    autres processus.
+
+    Args:
+        shared_dir: Répertoire partagé
+        key: Empreinte SHA-256 du fichier source
+        data: Contenu du fichier source (bytes)
+        parse: Fonction bytes -> DataFrame brut (load_data)
+
+    Returns:
+        Tuple (df labellisé, filter_index, mapped_bytes)
+    """
+    directory = os.path.join(shared_dir, key)
+
+    mapped = map_shared_dataset(directory)
+    if mapped is None:
+        df_raw = parse(data)
+        df_labeled = apply_labels.uncached(df_raw)
+        filter_index = FilterIndex.build(df_raw)
+        seed_aggregates(write_shared_dataset(directory, df_raw, df_labeled, filter_index))
+        mapped = map_shared_dataset(directory)
+        if mapped is None:
+            return df_labeled, filter_index, 0
+
+    df_raw, filter_index, aggregates, mapped_bytes = mapped
+    seed_aggregates(aggregates)
+
+    return apply_labels.uncached(df_raw), filter_index, mapped_bytes
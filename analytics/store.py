@@ -0,0 +1,388 @@
+"""
+Magasin de jeux de données partagé par toutes les sessions du processus
+
+Chaque jeu de données est identifié par l'empreinte SHA-256 du fichier source :
+dix sessions qui chargent le même fichier partagent une seule copie, lue et
+labellisée une seule fois. Les sessions reçoivent un bail (DatasetLease) qui
+leur donne des références sans copie (Copy-on-Write : une écriture côté session
+ne touche jamais la copie partagée). Le jeu est libéré quand le dernier bail
+disparaît, explicitement (release) ou par le ramasse-miettes (fin de session).
+
+La mémoire est budgétée : chaque jeu de données compte sa mémoire privée,
+échantillon stratifié et cube de Likert compris. La place d'un nouveau jeu est
+réservée sous le verrou du magasin, de sorte que deux chargements concurrents
+ne peuvent pas dépasser ensemble le budget global (MEMORY_BUDGET_MB). Avec un
+budget global, un jeu libéré par sa dernière session reste en mémoire (une
+session qui recharge le fichier le retrouve sans relecture) jusqu'à ce que sa
+place soit demandée : les jeux libérés sont alors évincés, du moins récemment
+utilisé au plus récent, avant que le chargement ne soit refusé. Un jeu qui
+dépasse le budget de la session qui le charge est refusé. Le cache de
+résultats reçoit la part du budget global que les jeux de données laissent
+libre (il évince alors ses entrées les plus anciennes).
+
+Avec un répertoire partagé (SHARED_DATA_DIR), les jeux de données sont en outre
+partagés entre processus : voir analytics.shared. Seule la mémoire privée du
+processus (colonnes de labels, index) est alors comptée dans les budgets.
+
+Avec des marges cibles (WEIGHTING_MARGINS), les poids de redressement sont
+calculés au chargement et stockés avec les données (colonne WEIGHT_COLUMN).
+"""
+
+import hashlib
+import io
+import json
+import threading
+import weakref
+
+from config import MEMORY_BUDGET_MB, SHARED_DATA_DIR, WEIGHTING_MARGINS
+from analytics.catalog import DatasetCatalog
+from analytics.cache import MemoryCache, estimate_nbytes, get_cache_backend
+from analytics.likert import LikertCube
+from analytics.processing import apply_labels, load_data
+from analytics.sampling import StratifiedSample
+from analytics.shared import FilterIndex, load_shared_dataset
+from analytics.weighting import add_weights
+
+
+class MemoryBudgetError(MemoryError):
+    """Chargement refusé : le budget mémoire serait dépassé"""
+
+
+def read_source_bytes(source):
+    """
+    Lit le contenu brut d'une source de données
+
+    Args:
+        source: Chemin (str), fichier en mémoire (BytesIO, UploadedFile) ou bytes
+
+    Returns:
+        Contenu du fichier (bytes)
+    """
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+class StoreEntry:
+    """
+    Jeu de données du magasin et son compteur de références
+
+    nbytes compte la mémoire privée du jeu et de ses objets dérivés (sample,
+    likert_cube) ; pendant un chargement, c'est la place réservée.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.df = None
+        self.filter_index = None
+        self.catalog = None
+        self.nbytes = 0
+        self.mapped_bytes = 0
+        self.sample = None
+        self.likert_cube = None
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class DatasetLease:
+    """
+    Bail d'une session sur un jeu de données du magasin
+
+    Attributes:
+        key: Empreinte de contenu du jeu de données
+        source_id: Identifiant de la source fourni à l'acquisition (pour
+            détecter un changement de fichier sans relire son contenu)
+    """
+
+    def __init__(self, store, entry, source_id=None):
+        self.key = entry.key
+        self.source_id = source_id
+        self._store = store
+        self._entry = entry
+        self._finalizer = weakref.finalize(self, store.release_key, entry.key)
+
+    @property
+    def df(self):
+        """DataFrame labellisé (copie superficielle : aucune donnée dupliquée)"""
+        if not self._finalizer.alive:
+            raise RuntimeError("Ce bail sur le jeu de données a déjà été libéré")
+        return self._entry.df.copy(deep=False)
+
+    @property
+    def filter_index(self):
+        """Index bitmap des colonnes filtrables (pour filter_data)"""
+        return self._entry.filter_index
+
+    @property
+    def catalog(self):
+        """Catalogue de métadonnées (valeurs distinctes, effectifs, bornes, manquants)"""
+        return self._entry.catalog
+
+    def _derived(self, name, build):
+        """
+        Objet dérivé du jeu de données, construit au premier accès et partagé
+
+        Sa taille est ajoutée à celle du jeu dans le budget global ; s'il n'y a
+        pas la place, l'objet sert à cet appel sans être conservé.
+        """
+        entry = self._entry
+        with entry.lock:
+            value = getattr(entry, name)
+            if value is None:
+                value = build(entry.df)
+                try:
+                    self._store.reserve(entry, entry.nbytes + value.nbytes)
+                except MemoryBudgetError:
+                    return value
+                setattr(entry, name, value)
+                self._store.rebalance()
+        return value
+
+    @property
+    def sample(self):
+        """Échantillon stratifié du jeu de données (tiré au premier accès, partagé)"""
+        return self._derived('sample', StratifiedSample.build)
+
+    @property
+    def likert_cube(self):
+        """Cube des réponses aux items par cellule de filtres (construit au premier accès, partagé)"""
+        return self._derived('likert_cube', LikertCube.build)
+
+    @property
+    def nbytes(self):
+        """Mémoire privée occupée par le jeu de données partagé et ses objets dérivés (octets)"""
+        return self._entry.nbytes
+
+    def release(self):
+        """Libère le bail (idempotent)"""
+        self._finalizer()
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+
+class DatasetStore:
+    """
+    Magasin process-wide de jeux de données, indexé par contenu
+
+    Les entrées sont rangées de la moins récemment utilisée à la plus récente :
+    avec un budget global, les jeux libérés (refs == 0) y restent jusqu'à leur
+    éviction par reserve.
+
+    Args:
+        max_bytes: Budget mémoire global en octets, jeux de données et cache de
+            résultats confondus (None = illimité)
+        shared_dir: Répertoire des jeux de données mappés partagés entre
+            processus (None = jeux de données privés au processus)
+        weighting_margins: Marges cibles des poids de redressement (voir
+            analytics.weighting.rake), None = pas de redressement
+    """
+
+    def __init__(self, max_bytes=None, shared_dir=None, weighting_margins=None):
+        self.max_bytes = max_bytes
+        self.shared_dir = shared_dir
+        self.weighting_margins = weighting_margins
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, source, source_id=None, max_bytes=None):
+        """
+        Renvoie un bail sur le jeu de données correspondant au contenu de source
+
+        Le fichier n'est lu et labellisé que s'il n'est pas déjà dans le magasin ;
+        les acquisitions concurrentes d'un même contenu attendent un seul chargement.
+
+        Args:
+            source: Chemin, fichier en mémoire ou bytes
+            source_id: Identifiant libre de la source (conservé sur le bail)
+            max_bytes: Budget de l'appelant (session) en octets, None = illimité
+
+        Returns:
+            DatasetLease
+
+        Raises:
+            MemoryBudgetError: Si le jeu de données dépasse le budget de
+                l'appelant ou ne tient pas dans le budget global, même après
+                éviction des jeux libérés
+        """
+        data = read_source_bytes(source)
+        hasher = hashlib.sha256(data)
+        if self.weighting_margins:
+            # Les poids font partie du jeu de données : d'autres marges, un autre jeu
+            hasher.update(json.dumps(self.weighting_margins, sort_keys=True).encode())
+        key = hasher.hexdigest()
+
+        with self._lock:
+            entry = self._entries.pop(key, None) or StoreEntry(key)
+            self._entries[key] = entry
+            entry.refs += 1
+
+        try:
+            with entry.lock:
+                if entry.df is None:
+                    # Réservation provisoire (taille du fichier) avant la lecture,
+                    # visible des chargements concurrents, puis ajustée
+                    self.reserve(entry, len(data))
+                    df, filter_index, mapped_bytes = self.load(key, data)
+                    # Les colonnes mappées sont partagées entre processus : seule
+                    # la mémoire privée est comptée
+                    self.reserve(entry, estimate_nbytes(df) + filter_index.nbytes - mapped_bytes)
+                    entry.df, entry.filter_index = df, filter_index
+                    entry.catalog = DatasetCatalog.build(df)
+                    entry.mapped_bytes = mapped_bytes
+                    self.rebalance()
+
+            if max_bytes is not None and entry.nbytes > max_bytes:
+                raise MemoryBudgetError(
+                    f"Ce fichier occupe {entry.nbytes / 2**20:.1f} Mo en mémoire, "
+                    f"au-delà du budget par session ({max_bytes / 2**20:.0f} Mo)"
+                )
+        except Exception:
+            if entry.df is None:
+                # Chargement échoué : la place réservée est rendue
+                with self._lock:
+                    entry.nbytes = 0
+            self.release_key(key)
+            raise
+
+        return DatasetLease(self, entry, source_id)
+
+    def reserve(self, entry, nbytes):
+        """
+        Fixe la mémoire comptée pour un jeu de données, dans la limite du budget global
+
+        La vérification et la réservation se font sous le verrou du magasin. Si
+        la place manque, les jeux libérés sont évincés, du moins récemment
+        utilisé au plus récent.
+
+        Args:
+            entry: StoreEntry du jeu de données
+            nbytes: Nouvelle taille du jeu de données (octets)
+
+        Raises:
+            MemoryBudgetError: Si le jeu ne tient pas dans le budget global, même
+                après éviction de tous les jeux libérés
+        """
+        with self._lock:
+            if self.max_bytes is not None:
+                others = [other for other in self._entries.values() if other is not entry]
+                used = sum(other.nbytes for other in others)
+                idle = [other for other in others if other.refs == 0]
+                while used + nbytes > self.max_bytes and idle:
+                    evicted = idle.pop(0)
+                    del self._entries[evicted.key]
+                    used -= evicted.nbytes
+                if used + nbytes > self.max_bytes:
+                    raise MemoryBudgetError(
+                        f"Mémoire du serveur insuffisante pour ce fichier "
+                        f"({nbytes / 2**20:.1f} Mo) : réessayez plus tard"
+                    )
+            entry.nbytes = nbytes
+
+    def load(self, key, data):
+        """
+        Lit, pondère et labellise un jeu de données (ou le mappe depuis le
+        répertoire partagé)
+
+        Returns:
+            Tuple (df labellisé, filter_index, taille des colonnes mappées)
+        """
+        # Fonctions non mises en cache : le magasin est la seule copie
+        parse = lambda content: add_weights(load_data.uncached(io.BytesIO(content)),
+                                            self.weighting_margins)
+
+        if self.shared_dir is not None:
+            return load_shared_dataset(self.shared_dir, key, data, parse)
+
+        df = apply_labels.uncached(parse(data))
+        return df, FilterIndex.build(df), 0
+
+    def release_key(self, key):
+        """
+        Décrémente le compteur d'un jeu de données
+
+        À zéro, le jeu reste en mémoire comme jeu libéré s'il y a un budget
+        global (il sera évincé quand sa place sera demandée) ; sinon, ou si son
+        chargement a échoué, il est libéré.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+            if self.max_bytes is not None and entry.df is not None:
+                # Le plus récemment utilisé : évincé en dernier
+                self._entries[key] = entry
+
+        self.rebalance()
+
+    def nbytes(self):
+        """Mémoire occupée par les jeux de données chargés (octets)"""
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def rebalance(self):
+        """Attribue au cache de résultats la part du budget global laissée libre"""
+        backend = get_cache_backend()
+        if self.max_bytes is not None and isinstance(backend, MemoryCache):
+            backend.resize(max(0, self.max_bytes - self.nbytes()))
+
+    def stats(self):
+        """
+        État du magasin
+
+        Returns:
+            Liste de dicts {'key', 'refs', 'n_rows', 'nbytes', 'mapped_bytes'}
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+
+        return [
+            {
+                'key': entry.key,
+                'refs': entry.refs,
+                'n_rows': len(entry.df) if entry.df is not None else 0,
+                'nbytes': entry.nbytes,
+                'mapped_bytes': entry.mapped_bytes
+            }
+            for entry in entries
+        ]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_store = DatasetStore(max_bytes=MEMORY_BUDGET_MB * 2**20, shared_dir=SHARED_DATA_DIR,
+                      weighting_margins=WEIGHTING_MARGINS)
+_store.rebalance()
+
+
+def get_dataset_store():
+    """Renvoie le magasin de jeux de données du processus"""
+    return _store
+
+
+def get_memory_usage():
+    """
+    Mémoire occupée par le processus au titre des analyses
+
+    Returns:
+        Dict {'datasets', 'cache', 'total', 'budget'} en octets
+        (budget None si illimité)
+    """
+    datasets = _store.nbytes()
+    cache = getattr(get_cache_backend(), 'nbytes', 0)
+
+    return {
+        'datasets': datasets,
+        'cache': cache,
+        'total': datasets + cache,
+        'budget': _store.max_bytes
+    }
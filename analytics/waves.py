@@ -0,0 +1,327 @@
+"""
+Comparaison de vagues de collecte (un fichier par semestre)
+
+Les vagues sont chargées en parallèle par le magasin de jeux de données puis
+empilées dans un seul DataFrame, avec une colonne catégorielle WAVE_COLUMN
+(dans l'ordre des vagues). Moyennes, écarts-types, corrélations et statistiques
+groupées sont calculés pour toutes les vagues en une seule passe groupée
+(np.bincount sur le code de vague) ; les écarts d'une vague à l'autre sont
+accompagnés d'une taille d'effet standardisée (g de Hedges).
+
+Exemple :
+    leases = load_waves(['S1.xlsx', 'S2.xlsx'])
+    df = stack_waves([lease.df for lease in leases], ['S1', 'S2'])
+    stats = wave_statistics(df)          # colonnes (statistique, vague)
+    wave_differences(stats)              # S1 → S2 : différence, g, IC, p
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import *
+from analytics.cache import cached
+from analytics.processing import get_all_items
+from analytics.profiling import traced
+from analytics.store import get_dataset_store
+from analytics.weighting import get_weights, weighted_group_moments
+
+# Quantile de la loi normale pour les intervalles de confiance à 95 %
+Z_95 = 1.959964
+
+DIMENSION_NAMES = ['Estime de Soi', 'Valorisation', 'Manque Reconnaissance', 'Gestion Conflits']
+
+
+# ============================================================================
+# CHARGEMENT ET EMPILEMENT
+# ============================================================================
+
+def load_waves(sources, source_ids=None, max_bytes=None, store=None,
+               max_workers=WAVE_LOAD_WORKERS):
+    """
+    Charge plusieurs vagues en parallèle dans le magasin de jeux de données
+
+    Si une vague ne peut pas être chargée, les baux déjà obtenus sont libérés
+    et l'erreur est propagée.
+
+    Args:
+        sources: Chemins ou fichiers en mémoire, un par vague
+        source_ids: Identifiants des sources (conservés sur les baux)
+        max_bytes: Budget de l'appelant par vague en octets, None = illimité
+        store: DatasetStore (par défaut, celui du processus)
+        max_workers: Nombre de vagues lues simultanément
+
+    Returns:
+        Liste de DatasetLease, dans l'ordre des sources
+    """
+    store = store or get_dataset_store()
+    source_ids = source_ids or [None] * len(sources)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources))),
+                            thread_name_prefix="wave-load") as executor:
+        futures = [executor.submit(store.acquire, source, source_id=source_id, max_bytes=max_bytes)
+                   for source, source_id in zip(sources, source_ids)]
+
+    leases, error = [], None
+    for future in futures:
+        try:
+            leases.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        for lease in leases:
+            lease.release()
+        raise error
+
+    return leases
+
+
+@traced('processing')
+def stack_waves(frames, names):
+    """
+    Empile des vagues dans un seul DataFrame avec une colonne de vague
+
+    Les poids de redressement ne sont conservés que si toutes les vagues en ont.
+
+    Args:
+        frames: DataFrames labellisés, un par vague
+        names: Noms des vagues (ordre d'affichage et de comparaison)
+
+    Returns:
+        DataFrame empilé, colonne WAVE_COLUMN catégorielle ordonnée
+    """
+    if not all(WEIGHT_COLUMN in frame.columns for frame in frames):
+        frames = [frame.drop(columns=WEIGHT_COLUMN, errors='ignore') for frame in frames]
+
+    df = pd.concat(frames, ignore_index=True)
+    df[WAVE_COLUMN] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(frames)), [len(frame) for frame in frames]),
+        categories=list(names), ordered=True
+    )
+
+    return df
+
+
+def wave_codes(df):
+    """
+    Code de vague de chaque ligne et noms des vagues
+
+    Returns:
+        Tuple (tableau des codes, -1 si manquant ; liste des vagues)
+    """
+    waves = df[WAVE_COLUMN]
+    if isinstance(waves.dtype, pd.CategoricalDtype):
+        return waves.cat.codes.to_numpy(dtype=np.int64), list(waves.cat.categories)
+
+    codes, uniques = pd.factorize(waves, sort=True)
+    return codes, list(uniques)
+
+
+def row_weights(df, weighted):
+    """Poids des lignes (1 sans pondération)"""
+    weights = get_weights(df, weighted)
+    return np.ones(len(df)) if weights is None else weights
+
+
+# ============================================================================
+# STATISTIQUES PAR VAGUE
+# ============================================================================
+
+@traced('processing')
+@cached
+def wave_statistics(df, weighted=False):
+    """
+    Moyenne, écart-type et effectif de chaque item et total, pour toutes les vagues
+
+    Args:
+        df: Vagues empilées (résultat de stack_waves, éventuellement filtré)
+        weighted: Moyennes et écarts-types pondérés par WEIGHT_COLUMN (si la
+            colonne existe) ; N reste l'effectif non pondéré
+
+    Returns:
+        DataFrame indexé par variable, colonnes (statistique, vague) :
+        'Moyenne', 'Écart-type', 'N', 'IC 95 %' (demi-largeur de l'IC de la moyenne)
+    """
+    codes, waves = wave_codes(df)
+    columns = [col for col in get_all_items(include_totals=True) + ['Item5'] if col in df.columns]
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    mean, std, n = weighted_group_moments(codes, len(waves), values, row_weights(df, weighted))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        margin = Z_95 * std / np.sqrt(n)
+
+    stats = pd.concat(
+        {
+            'Moyenne': pd.DataFrame(mean.T, index=columns, columns=waves),
+            'Écart-type': pd.DataFrame(std.T, index=columns, columns=waves),
+            'N': pd.DataFrame(n.T, index=columns, columns=waves),
+            'IC 95 %': pd.DataFrame(margin.T, index=columns, columns=waves)
+        },
+        axis=1,
+        names=['Statistique', WAVE_COLUMN]
+    )
+    stats.index.name = 'Variable'
+
+    return stats
+
+
+def effect_size_label(g):
+    """Qualificatif conventionnel (Cohen) d'une taille d'effet"""
+    if np.isnan(g):
+        return ""
+    for threshold, label in EFFECT_SIZE_THRESHOLDS:
+        if abs(g) < threshold:
+            return label
+    return EFFECT_SIZE_THRESHOLDS[-1][1]
+
+
+@traced('processing')
+def wave_differences(stats, reference=None):
+    """
+    Écarts de moyenne entre vagues et tailles d'effet standardisées
+
+    Chaque vague est comparée à la précédente, ou à la vague de référence.
+    Taille d'effet : g de Hedges (écart-type combiné, correction de petit
+    échantillon) avec son IC 95 % ; p : test t de Welch. Avec des
+    statistiques pondérées, les effectifs non pondérés sont utilisés
+    (approximation).
+
+    Args:
+        stats: Résultat de wave_statistics
+        reference: Nom de la vague de référence (None = vague précédente)
+
+    Returns:
+        DataFrame indexé par (comparaison "A → B", variable) : 'Référence',
+        'Comparée', 'Différence', 'g de Hedges', 'IC 95 % bas', 'IC 95 % haut',
+        'p (Welch)', 'Ampleur'
+    """
+    from scipy import stats as scipy_stats
+
+    waves = list(stats['Moyenne'].columns)
+    if reference is None:
+        pairs = list(zip(waves[:-1], waves[1:]))
+    else:
+        pairs = [(reference, wave) for wave in waves if wave != reference]
+
+    columns = ['Référence', 'Comparée', 'Différence', 'g de Hedges', 'IC 95 % bas',
+               'IC 95 % haut', 'p (Welch)', 'Ampleur']
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+
+    # Tableaux (comparaisons x variables)
+    before, after = [w for w, _ in pairs], [w for _, w in pairs]
+    m1, m2 = stats['Moyenne'][before].to_numpy().T, stats['Moyenne'][after].to_numpy().T
+    s1, s2 = stats['Écart-type'][before].to_numpy().T, stats['Écart-type'][after].to_numpy().T
+    n1 = stats['N'][before].to_numpy(dtype=np.float64).T
+    n2 = stats['N'][after].to_numpy(dtype=np.float64).T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = m2 - m1
+        pooled = np.sqrt(((n1 - 1) * s1 ** 2 + (n2 - 1) * s2 ** 2) / (n1 + n2 - 2))
+        g = (1 - 3 / (4 * (n1 + n2) - 9)) * diff / pooled
+        se_g = np.sqrt((n1 + n2) / (n1 * n2) + g ** 2 / (2 * (n1 + n2)))
+
+        v1, v2 = s1 ** 2 / n1, s2 ** 2 / n2
+        t_stat = diff / np.sqrt(v1 + v2)
+        dof = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+        p_values = 2 * scipy_stats.t.sf(np.abs(t_stat), dof)
+
+    variables = list(stats.index)
+    index = pd.MultiIndex.from_tuples(
+        [(f"{a} → {b}", variable) for a, b in pairs for variable in variables],
+        names=['Comparaison', 'Variable']
+    )
+    results = pd.DataFrame({
+        'Référence': m1.ravel(),
+        'Comparée': m2.ravel(),
+        'Différence': diff.ravel(),
+        'g de Hedges': g.ravel(),
+        'IC 95 % bas': (g - Z_95 * se_g).ravel(),
+        'IC 95 % haut': (g + Z_95 * se_g).ravel(),
+        'p (Welch)': p_values.ravel()
+    }, index=index).round(3)
+    results['Ampleur'] = [effect_size_label(value) for value in results['g de Hedges']]
+
+    return results
+
+
+@traced('processing')
+@cached
+def wave_correlations(df, weighted=False):
+    """
+    Matrices de corrélation des scores totaux, pour toutes les vagues
+
+    Sommes pondérées par vague (np.bincount) de chaque paire de scores, sur
+    ses observations complètes : les scores sont centrés sur la moyenne de
+    leur vague avant les produits (pas de formule E[xy] - E[x]E[y], qui perd
+    sa précision quand les moyennes sont grandes devant les écarts-types).
+
+    Args:
+        df: Vagues empilées
+        weighted: Corrélations pondérées par WEIGHT_COLUMN (si la colonne existe)
+
+    Returns:
+        DataFrame indexé par (vague, dimension), une colonne par dimension :
+        corr.loc[vague] est la matrice de la vague
+    """
+    codes, waves = wave_codes(df)
+    total_cols = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+    values = df[total_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    weights = row_weights(df, weighted)
+    n_waves, k = len(waves), len(total_cols)
+
+    corr = np.zeros((n_waves, k, k))
+    corr[:, np.arange(k), np.arange(k)] = 1.0
+    for i in range(k):
+        for j in range(i + 1, k):
+            both = (codes >= 0) & ~np.isnan(values[:, i]) & ~np.isnan(values[:, j])
+            g, w, x, y = codes[both], weights[both], values[both, i], values[both, j]
+            sums = lambda v: np.bincount(g, w * v, minlength=n_waves)
+            total = np.bincount(g, w, minlength=n_waves)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dx = x - (sums(x) / total)[g]
+                dy = y - (sums(y) / total)[g]
+                corr[:, i, j] = corr[:, j, i] = sums(dx * dy) / np.sqrt(sums(dx * dx) * sums(dy * dy))
+
+    index = pd.MultiIndex.from_product([waves, DIMENSION_NAMES], names=[WAVE_COLUMN, 'Dimension'])
+    return pd.DataFrame(corr.reshape(n_waves * k, k), index=index, columns=DIMENSION_NAMES)
+
+
+@traced('processing')
+@cached
+def wave_group_statistics(df, group_by_col, value_cols, weighted=False):
+    """
+    Statistiques groupées par une variable catégorielle, pour toutes les vagues
+
+    Args:
+        df: Vagues empilées
+        group_by_col: Colonne de regroupement
+        value_cols: Colonnes de valeurs à analyser
+        weighted: Moyennes et écarts-types pondérés par WEIGHT_COLUMN (si la
+            colonne existe) ; les effectifs restent non pondérés
+
+    Returns:
+        DataFrame indexé par (vague, groupe), colonnes (variable, 'mean' /
+        'std' / 'count') comme get_grouped_statistics ; les groupes absents
+        d'une vague sont omis
+    """
+    codes, waves = wave_codes(df)
+    group_codes, groups = pd.factorize(df[group_by_col], sort=True)
+
+    # Code combiné vague x groupe : une seule passe pour toutes les cellules
+    combined = np.where((codes >= 0) & (group_codes >= 0), codes * len(groups) + group_codes, -1)
+    values = df[list(value_cols)].to_numpy(dtype=np.float64, na_value=np.nan)
+    mean, std, n = weighted_group_moments(combined, len(waves) * len(groups), values,
+                                          row_weights(df, weighted))
+
+    index = pd.MultiIndex.from_product([waves, groups], names=[WAVE_COLUMN, group_by_col])
+    grouped = pd.DataFrame(
+        {(col, stat): array[:, j]
+         for j, col in enumerate(value_cols)
+         for stat, array in (('mean', mean), ('std', std), ('count', n))},
+        index=index
+    )
+    present = np.bincount(combined[combined >= 0], minlength=len(index)) > 0
+
+    return grouped[present].round(2)
@@ -0,0 +1,276 @@
+"""
+Pondération des observations (poids de redressement)
+
+Les échantillons de production sont construits par quotas : les poids de
+redressement (colonne WEIGHT_COLUMN) ramènent leurs marges Genre, Âge et
+Études sur celles de la population. Ils sont calculés une fois au chargement
+par raking (ajustement proportionnel itératif) à partir des marges cibles
+(WEIGHTING_MARGINS), ou lus dans le fichier s'il les fournit.
+
+Les moments pondérés sont vectorisés et ignorent les valeurs manquantes
+colonne par colonne, comme leurs équivalents pandas.
+
+Exemple :
+    df = add_weights(df, {'Genre': {1: 0.52, 2: 0.46, 3: 0.02}})
+    weights = get_weights(df)
+    mean, std, n = weighted_moments(df[['Total ES']].to_numpy(float), weights)
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import *
+
+
+# ============================================================================
+# RAKING
+# ============================================================================
+
+def rake(df, margins, max_iter=RAKING_MAX_ITER, tol=RAKING_TOLERANCE):
+    """
+    Calcule des poids par raking (ajustement proportionnel itératif)
+
+    Les poids sont ajustés tour à tour sur les marges de chaque variable
+    jusqu'à ce que toutes soient atteintes à tol près. Les modalités cibles
+    absentes des données sont ignorées (les proportions restantes sont
+    renormalisées) ; les lignes dont la modalité n'a pas de cible, ou est
+    manquante, ne sont pas ajustées sur cette variable.
+
+    Args:
+        df: DataFrame (colonnes codées des variables de margins)
+        margins: Dict {colonne: {modalité: proportion cible}}
+        max_iter: Nombre maximal de cycles d'ajustement
+        tol: Écart relatif maximal toléré entre marges pondérées et cibles
+
+    Returns:
+        Tableau NumPy des poids (moyenne 1)
+    """
+    weights = np.ones(len(df))
+
+    variables = []
+    for col, targets in margins.items():
+        if col not in df.columns or not targets:
+            continue
+        categories = np.array(list(targets), dtype=np.float64)
+        shares = np.array(list(targets.values()), dtype=np.float64)
+        codes = pd.Index(categories).get_indexer(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+        present = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+        shares = np.where(present, shares, 0.0)
+        if shares.sum() > 0:
+            covered = codes >= 0
+            variables.append((codes[covered], covered, shares / shares.sum()))
+
+    for _ in range(max_iter):
+        gap = 0.0
+        for codes, covered, shares in variables:
+            covered_weights = weights[covered]
+            current = np.bincount(codes, covered_weights, minlength=len(shares))
+            target = shares * covered_weights.sum()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                factor = np.where(current > 0, target / current, 1.0)
+            gap = max(gap, np.max(np.abs(factor - 1.0), initial=0.0))
+            weights[covered] = covered_weights * factor[codes]
+        if gap < tol:
+            break
+
+    return weights / weights.mean() if len(weights) else weights
+
+
+def add_weights(df, margins):
+    """
+    Ajoute la colonne des poids de redressement
+
+    Un fichier qui fournit déjà la colonne WEIGHT_COLUMN garde ses poids.
+
+    Args:
+        df: DataFrame brut
+        margins: Marges cibles (voir rake), ou None
+
+    Returns:
+        DataFrame avec la colonne WEIGHT_COLUMN (df inchangé sans marges)
+    """
+    if not margins or WEIGHT_COLUMN in df.columns:
+        return df
+
+    return df.assign(**{WEIGHT_COLUMN: rake(df, margins)})
+
+
+def get_weights(df, weighted=True):
+    """
+    Poids des lignes d'un DataFrame
+
+    Args:
+        df: DataFrame
+        weighted: False pour ignorer les poids
+
+    Returns:
+        Tableau NumPy des poids, ou None (pas de pondération ou pas de colonne de poids)
+    """
+    if not weighted or WEIGHT_COLUMN not in df.columns:
+        return None
+
+    return df[WEIGHT_COLUMN].to_numpy(dtype=np.float64, na_value=0.0)
+
+
+def effective_sample_size(weights):
+    """
+    Taille d'échantillon effective de Kish : (Σw)² / Σw²
+
+    Returns:
+        Effectif équivalent d'un échantillon non pondéré
+    """
+    total = weights.sum()
+    squares = (weights ** 2).sum()
+
+    return total ** 2 / squares if squares > 0 else 0.0
+
+
+# ============================================================================
+# MOMENTS PONDÉRÉS
+# ============================================================================
+
+def as_columns(values):
+    """Tableau 2D float (lignes x colonnes) d'un tableau 1D ou 2D"""
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def weighted_moments(values, weights):
+    """
+    Moyenne, écart-type et effectif pondérés de chaque colonne
+
+    Variance s² = n / (n - 1) · Σw(x - m)² / Σw (n observations non
+    manquantes) : sans poids, on retrouve l'écart-type de pandas (ddof=1).
+
+    Args:
+        values: Tableau 1D ou 2D (lignes x colonnes), NaN = manquant
+        weights: Poids des lignes
+
+    Returns:
+        Tuple de tableaux (moyenne, écart-type, n) par colonne
+    """
+    values = as_columns(values)
+    present = ~np.isnan(values)
+    w = np.where(present, weights[:, None], 0.0)
+    x = np.where(present, values, 0.0)
+
+    n = present.sum(axis=0)
+    total = w.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (w * x).sum(axis=0) / total
+        residuals = np.where(present, x - mean, 0.0)
+        variance = (w * residuals ** 2).sum(axis=0) / total * n / (n - 1)
+
+    return mean, np.sqrt(variance), n
+
+
+def weighted_median(values, weights):
+    """
+    Médiane pondérée de chaque colonne
+
+    Première valeur dont le poids cumulé atteint la moitié du poids total ;
+    milieu des deux valeurs encadrantes si la moitié est atteinte exactement
+    (sans poids, on retrouve la médiane usuelle).
+
+    Returns:
+        Tableau des médianes par colonne (NaN si colonne vide)
+    """
+    values = as_columns(values)
+    medians = np.full(values.shape[1], np.nan)
+
+    for j in range(values.shape[1]):
+        present = ~np.isnan(values[:, j]) & (weights > 0)
+        if not present.any():
+            continue
+        order = np.argsort(values[present, j], kind='stable')
+        sorted_values = values[present, j][order]
+        cumulative = np.cumsum(weights[present][order])
+        half = cumulative[-1] / 2
+        # Tolérance relative : une moitié atteinte aux arrondis près compte comme exacte
+        tolerance = 1e-9 * cumulative[-1]
+        i = np.searchsorted(cumulative, half - tolerance)
+        if abs(cumulative[i] - half) <= tolerance and i + 1 < len(sorted_values):
+            medians[j] = (sorted_values[i] + sorted_values[i + 1]) / 2
+        else:
+            medians[j] = sorted_values[i]
+
+    return medians
+
+
+def weighted_corr(values, weights):
+    """
+    Matrice de corrélation de Pearson pondérée (observations complètes par paire)
+
+    Returns:
+        Tableau (colonnes x colonnes)
+    """
+    values = as_columns(values)
+    k = values.shape[1]
+    present = ~np.isnan(values)
+    corr = np.eye(k)
+
+    for i in range(k):
+        for j in range(i + 1, k):
+            both = present[:, i] & present[:, j]
+            w = weights[both]
+            x, y = values[both, i], values[both, j]
+            total = w.sum()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dx = x - (w * x).sum() / total
+                dy = y - (w * y).sum() / total
+                r = (w * dx * dy).sum() / np.sqrt((w * dx ** 2).sum() * (w * dy ** 2).sum())
+            corr[i, j] = corr[j, i] = r
+
+    return corr
+
+
+def weighted_group_moments(codes, n_groups, values, weights):
+    """
+    Moyenne, écart-type et effectif pondérés par groupe (np.bincount, deux passes)
+
+    Args:
+        codes: Numéro de groupe de chaque ligne (-1 = hors groupe)
+        n_groups: Nombre de groupes
+        values: Tableau 1D ou 2D (lignes x colonnes), NaN = manquant
+        weights: Poids des lignes
+
+    Returns:
+        Tuple de tableaux (moyenne, écart-type, n) de forme (groupes x colonnes)
+    """
+    values = as_columns(values)
+    in_group = codes >= 0
+    if not in_group.all():
+        codes, values, weights = codes[in_group], values[in_group], weights[in_group]
+    # Colonnes contiguës (sans copie pour un tableau issu d'un DataFrame) : chaque
+    # passe lit une colonne d'un bloc
+    values = np.asfortranarray(values)
+
+    shape = (n_groups, values.shape[1])
+    mean, std, n = np.full(shape, np.nan), np.full(shape, np.nan), np.zeros(shape, dtype=np.int64)
+    for j in range(values.shape[1]):
+        g, x, w = codes, values[:, j], weights
+        present = ~np.isnan(x)
+        if not present.all():
+            g, x, w = g[present], x[present], w[present]
+        n[:, j] = np.bincount(g, minlength=n_groups)
+        total = np.bincount(g, w, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean[:, j] = np.bincount(g, w * x, minlength=n_groups) / total
+            squares = np.bincount(g, w * (x - mean[:, j][g]) ** 2, minlength=n_groups)
+            std[:, j] = np.sqrt(squares / total * n[:, j] / (n[:, j] - 1))
+
+    return mean, std, n
+
+
+def column_moments(df, columns, weights):
+    """
+    Moyenne, écart-type pondérés et effectif (non pondéré) de colonnes d'un DataFrame
+
+    Returns:
+        DataFrame indexé par colonne : 'Moyenne', 'Écart-type', 'N'
+    """
+    values = df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+    mean, std, n = weighted_moments(values, weights)
+
+    return pd.DataFrame({'Moyenne': mean, 'Écart-type': std, 'N': n.astype(np.float64)},
+                        index=pd.Index(list(columns)))
@@ -2,12 +2,15 @@
 Application Streamlit pour l'analyse des relations amoureuses et estime de soi
 """
 
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from config import *
-from data_processing import *
+from analytics import *
 from visualizations import *
 
 # ============================================================================
@@ -21,21 +24,153 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Mode développeur : chaque rerun est tracé (calculs, graphiques, sections) et
+# le détail s'affiche dans la barre latérale
+dev_mode = DEV_MODE or st.query_params.get('dev') == '1'
+if dev_mode:
+    start_trace("rerun")
+
 # ============================================================================
 # CHARGEMENT DES DONNÉES
 # ============================================================================
 
-@st.cache_data
+# Les jeux de données sont partagés par toutes les sessions du processus
+# (magasin indexé sur le contenu du fichier) : chaque session ne détient qu'un
+# bail, libéré automatiquement à la fin de la session ou au changement de fichier.
+# Un fichier qui dépasse le budget mémoire de la session ou du serveur est refusé.
+
+# Résultats de la première vue (jeu complet, section Accueil) et du tableau des
+# moyennes : calculés en parallèle dès le chargement, ils sont ensuite servis
+# par le cache au premier affichage (les répartitions du jeu complet viennent
+# du catalogue du jeu de données). Les appels reprennent exactement ceux des
+# sections (mêmes arguments, donc mêmes clés de cache), pondérés si le jeu de
+# données a des poids (pondération active par défaut).
+DEFAULT_VIEW_RESULTS = [
+    (calculate_kpis,),
+    (calculate_dimension_stats,),
+    (get_correlation_matrix,),
+    (calculate_averages_by_filters,),
+    (calculate_item_means, ITEMS_ESTIME_SOI),
+    (calculate_item_means, ITEMS_VALORISATION),
+    (calculate_item_means, ITEMS_MANQUE_RECONNAISSANCE),
+    (calculate_item_means, ITEMS_GESTION_CONFLITS)
+]
+
+
+@st.cache_resource
+def get_warmup_executor():
+    """Pool de threads partagé pour le calcul des résultats de la vue par défaut"""
+    return ThreadPoolExecutor(max_workers=min(len(DEFAULT_VIEW_RESULTS), os.cpu_count() or 1),
+                              thread_name_prefix="warmup")
+
+
+def warm_up_default_view(df):
+    """
+    Calcule en parallèle les résultats de la vue par défaut d'un jeu de données
+
+    Args:
+        df: Jeu de données complet (la vue par défaut n'applique aucun filtre)
+    """
+    executor = get_warmup_executor()
+    weighted = WEIGHT_COLUMN in df.columns
+    futures = [executor.submit(func, df, *args, weighted=weighted)
+               for func, *args in DEFAULT_VIEW_RESULTS]
+    for future in futures:
+        future.result()
+
+
+def acquire_dataset(source, source_id):
+    """Attache à la session le jeu de données partagé correspondant à source"""
+    lease = st.session_state.get('dataset_lease')
+    if lease is None or lease.source_id != source_id:
+        old_lease = lease
+        with span("acquire_dataset", "data"):
+            lease = get_dataset_store().acquire(source, source_id=source_id,
+                                                max_bytes=SESSION_MEMORY_BUDGET_MB * 2**20)
+        # Nouveau bail acquis : l'ancien est libéré tout de suite, sans attendre
+        # le ramasse-miettes
+        if old_lease is not None:
+            old_lease.release()
+        st.session_state['dataset_lease'] = lease
+        with span("warm_up_default_view", "data"):
+            warm_up_default_view(lease.df)
+    return lease.df
+
+
+def acquire_waves(wave_files):
+    """
+    Attache à la session les vagues à comparer, chargées en parallèle et empilées
+
+    Les vagues sont ordonnées par nom de fichier et nommées d'après lui ; elles
+    ne sont rechargées que si la liste des fichiers change. Le jeu principal,
+    les vagues et leur empilement sont comptés ensemble dans le budget mémoire
+    de la session : des vagues qui le dépasseraient sont refusées.
+
+    Returns:
+        DataFrame des vagues empilées, ou None (moins de deux vagues)
+    """
+    wave_files = sorted(wave_files, key=lambda f: f.name)
+    source_ids = tuple(('upload', f.file_id) for f in wave_files)
+    if st.session_state.get('wave_source_ids') != source_ids:
+        st.session_state['wave_source_ids'] = source_ids
+        st.session_state['wave_leases'] = None
+        st.session_state['df_waves'] = None
+        st.session_state['df_waves_nbytes'] = 0
+        st.session_state['wave_error'] = None
+        if len(wave_files) >= 2:
+            session_budget = SESSION_MEMORY_BUDGET_MB * 2**20
+            main_lease = st.session_state.get('dataset_lease')
+            main_bytes = main_lease.nbytes if main_lease is not None else 0
+            try:
+                with span("load_waves", "data"):
+                    leases = load_waves(wave_files, source_ids,
+                                        max_bytes=max(0, session_budget - main_bytes))
+            except Exception as e:
+                # Conservée pour les reruns suivants : les mêmes fichiers ne sont pas rechargés
+                st.session_state['wave_error'] = e
+                raise
+            names = []
+            for f in wave_files:
+                name = os.path.splitext(f.name)[0]
+                names.append(name if name not in names else f"{name} ({len(names) + 1})")
+            df_waves = stack_waves([lease.df for lease in leases], names)
+
+            df_waves_nbytes = estimate_nbytes(df_waves)
+            total = main_bytes + sum(lease.nbytes for lease in leases) + df_waves_nbytes
+            if total > session_budget:
+                for lease in leases:
+                    lease.release()
+                st.session_state['wave_error'] = MemoryBudgetError(
+                    f"Le jeu de données et les vagues occupent {total / 2**20:.1f} Mo en mémoire, "
+                    f"au-delà du budget par session ({SESSION_MEMORY_BUDGET_MB} Mo)"
+                )
+            else:
+                st.session_state['wave_leases'] = leases
+                st.session_state['df_waves'] = df_waves
+                st.session_state['df_waves_nbytes'] = df_waves_nbytes
+    if st.session_state.get('wave_error') is not None:
+        raise st.session_state['wave_error']
+    return st.session_state['df_waves']
+
+
+def get_session_nbytes():
+    """
+    Mémoire de la session (octets) : jeu principal et jeu filtré, baux des
+    vagues et vagues empilées
+    """
+    wave_leases = st.session_state.get('wave_leases') or []
+    return (st.session_state['dataset_lease'].nbytes + st.session_state['df_filtered_nbytes']
+            + sum(lease.nbytes for lease in wave_leases)
+            + st.session_state.get('df_waves_nbytes', 0))
+
+
 def load_and_prepare_data_from_file(uploaded_file):
     """Charge et prépare les données depuis un fichier uploadé"""
-    df = load_data(uploaded_file)
-    df = apply_labels(df)
-    return df
+    return acquire_dataset(uploaded_file, ('upload', uploaded_file.file_id))
+
 
-@st.cache_data
 def load_and_prepare_data_from_path():
     """Charge et prépare les données depuis un chemin local (fallback)"""
-    import os
     possible_paths = [
         './Etudes_relations_amoureuses.xlsx',
         'Etudes_relations_amoureuses.xlsx',
@@ -50,9 +185,8 @@ def load_and_prepare_data_from_path():
             break
     
     if file_path:
-        df = load_data(file_path)
-        df = apply_labels(df)
-        return df
+        return acquire_dataset(file_path, ('path', os.path.abspath(file_path),
+                                           os.path.getmtime(file_path)))
     return None
 
 # Interface d'upload de fichier
@@ -60,8 +194,9 @@ st.markdown("## 📂 Chargement des données")
 
 uploaded_file = st.file_uploader(
     "Téléchargez votre fichier Excel (format attendu : Etudes_relations_amoureuses.xlsx)",
-    type=['xlsx', 'xls'],
-    help="Le fichier doit contenir 2 lignes d'en-tête et 39 colonnes de données"
+    type=['xlsx', 'xls', 'csv', 'parquet'],
+    help="Le fichier doit contenir 2 lignes d'en-tête et 39 colonnes de données "
+         "(export CSV ou Parquet accepté pour les très gros volumes)"
 )
 
 # Charger les données
@@ -72,6 +207,9 @@ if uploaded_file is not None:
         with st.spinner('📊 Chargement des données en cours...'):
             df_original = load_and_prepare_data_from_file(uploaded_file)
         st.success(f"✅ Fichier chargé avec succès ! ({len(df_original)} participants)")
+    except MemoryBudgetError as e:
+        st.error(f"❌ {e}")
+        st.stop()
     except Exception as e:
         st.error(f"❌ Erreur lors du chargement du fichier : {e}")
         st.info("""
@@ -127,108 +265,235 @@ else:
     else:
         st.info("ℹ️ Fichier local détecté et chargé. Pour utiliser vos propres données, uploadez un fichier ci-dessus.")
 
+# Vagues de collecte (un fichier par semestre), comparées dans la section Vagues
+with st.expander("📅 Comparer plusieurs vagues de collecte"):
+    wave_files = st.file_uploader(
+        "Téléchargez un fichier par vague (même format que ci-dessus)",
+        type=['xlsx', 'xls', 'csv', 'parquet'],
+        accept_multiple_files=True,
+        help="Les vagues sont ordonnées par nom de fichier (par exemple 2024-S1, 2024-S2...)",
+        key='wave_files'
+    )
+    try:
+        with st.spinner('📊 Chargement des vagues en cours...'):
+            df_waves = acquire_waves(wave_files or [])
+    except Exception as e:
+        st.error(f"❌ Erreur lors du chargement des vagues : {e}")
+        df_waves = None
+    if df_waves is not None:
+        st.success(f"✅ {df_waves[WAVE_COLUMN].cat.categories.size} vagues chargées "
+                   f"({len(df_waves)} réponses) : voir la section 📅 Vagues")
+    elif wave_files:
+        st.caption("Ajoutez au moins deux vagues pour les comparer.")
+
 st.markdown("---")
 
 # ============================================================================
 # SIDEBAR - FILTRES
 # ============================================================================
 
+# Les filtres sont regroupés dans un formulaire : les changements de sélection
+# ne déclenchent aucun rerun, les analyses ne sont recalculées qu'au clic sur
+# "Appliquer les filtres".
+
+FILTER_WIDGET_KEYS = ['filtre_age', 'filtre_genre', 'filtre_etude', 'filtre_cohab',
+                      'filtre_satisf', 'filtre_duree', 'filtre_poids']
+
+
+def reset_filters():
+    """Remet les widgets de filtres à leurs valeurs par défaut"""
+    for key in FILTER_WIDGET_KEYS:
+        st.session_state.pop(key, None)
+
+
 st.sidebar.title("🎛️ Filtres")
 st.sidebar.markdown("---")
 
+# Options et bornes des filtres lues dans le catalogue du jeu de données
+# (construit une fois au chargement), sans reparcourir les colonnes
+catalog = st.session_state['dataset_lease'].catalog
+
 # Initialiser les filtres
 filters = {}
+duree_range = None
 
-# Filtre Âge
-st.sidebar.subheader("👤 Âge")
-age_options = df_original['Age'].unique()
-age_selected = st.sidebar.multiselect(
-    "Sélectionner les tranches d'âge",
-    options=sorted(age_options),
-    default=sorted(age_options),
-    format_func=lambda x: AGE_LABELS[x]
-)
-if age_selected:
-    filters['Age'] = age_selected
-
-# Filtre Genre
-st.sidebar.subheader("⚧️ Genre")
-genre_options = df_original['Genre'].unique()
-genre_selected = st.sidebar.multiselect(
-    "Sélectionner les genres",
-    options=sorted(genre_options),
-    default=sorted(genre_options),
-    format_func=lambda x: GENRE_LABELS[x]
-)
-if genre_selected:
-    filters['Genre'] = genre_selected
-
-# Filtre Niveau d'études
-st.sidebar.subheader("🎓 Niveau d'études")
-etude_options = df_original['Etude'].unique()
-etude_selected = st.sidebar.multiselect(
-    "Sélectionner les niveaux",
-    options=sorted(etude_options),
-    default=sorted(etude_options),
-    format_func=lambda x: ETUDE_LABELS[x]
-)
-if etude_selected:
-    filters['Etude'] = etude_selected
-
-# Filtre Cohabitation
-st.sidebar.subheader("🏠 Cohabitation")
-cohab_options = df_original['Item6'].unique()
-cohab_selected = st.sidebar.multiselect(
-    "Vit avec le/la partenaire",
-    options=sorted(cohab_options),
-    default=sorted(cohab_options),
-    format_func=lambda x: COHABITATION_LABELS[x]
-)
-if cohab_selected:
-    filters['Item6'] = cohab_selected
-
-# Filtre Satisfaction
-st.sidebar.subheader("😊 Satisfaction relationnelle")
-satisf_options = df_original['Item7'].unique()
-satisf_selected = st.sidebar.multiselect(
-    "Niveau de satisfaction",
-    options=sorted(satisf_options),
-    default=sorted(satisf_options),
-    format_func=lambda x: SATISFACTION_LABELS[x]
-)
-if satisf_selected:
-    filters['Item7'] = satisf_selected
+with st.sidebar.form("filtres_form", border=False):
+    # Filtre Âge
+    st.subheader("👤 Âge")
+    age_options = catalog.distinct['Age']
+    age_selected = st.multiselect(
+        "Sélectionner les tranches d'âge",
+        options=age_options,
+        default=age_options,
+        format_func=lambda x: catalog.labels['Age'][x],
+        key='filtre_age'
+    )
+    if age_selected:
+        filters['Age'] = age_selected
+
+    # Filtre Genre
+    st.subheader("⚧️ Genre")
+    genre_options = catalog.distinct['Genre']
+    genre_selected = st.multiselect(
+        "Sélectionner les genres",
+        options=genre_options,
+        default=genre_options,
+        format_func=lambda x: catalog.labels['Genre'][x],
+        key='filtre_genre'
+    )
+    if genre_selected:
+        filters['Genre'] = genre_selected
+
+    # Filtre Niveau d'études
+    st.subheader("🎓 Niveau d'études")
+    etude_options = catalog.distinct['Etude']
+    etude_selected = st.multiselect(
+        "Sélectionner les niveaux",
+        options=etude_options,
+        default=etude_options,
+        format_func=lambda x: catalog.labels['Etude'][x],
+        key='filtre_etude'
+    )
+    if etude_selected:
+        filters['Etude'] = etude_selected
 
-# Filtre Durée de relation
-st.sidebar.subheader("⏱️ Durée de la relation")
-if 'Item5' in df_original.columns:
-    duree_min = int(df_original['Item5'].min())
-    duree_max = int(df_original['Item5'].max())
-    duree_range = st.sidebar.slider(
-        "Durée en mois",
-        min_value=duree_min,
-        max_value=duree_max,
-        value=(duree_min, duree_max)
+    # Filtre Cohabitation
+    st.subheader("🏠 Cohabitation")
+    cohab_options = catalog.distinct['Item6']
+    cohab_selected = st.multiselect(
+        "Vit avec le/la partenaire",
+        options=cohab_options,
+        default=cohab_options,
+        format_func=lambda x: catalog.labels['Item6'][x],
+        key='filtre_cohab'
     )
+    if cohab_selected:
+        filters['Item6'] = cohab_selected
+
+    # Filtre Satisfaction
+    st.subheader("😊 Satisfaction relationnelle")
+    satisf_options = catalog.distinct['Item7']
+    satisf_selected = st.multiselect(
+        "Niveau de satisfaction",
+        options=satisf_options,
+        default=satisf_options,
+        format_func=lambda x: catalog.labels['Item7'][x],
+        key='filtre_satisf'
+    )
+    if satisf_selected:
+        filters['Item7'] = satisf_selected
+
+    # Filtre Durée de relation : pas de curseur si la durée est absente,
+    # toujours manquante (bornes None) ou constante
+    duree_bounds = catalog.ranges.get('Item5', (None, None))
+    if None not in duree_bounds and duree_bounds[0] < duree_bounds[1]:
+        st.subheader("⏱️ Durée de la relation")
+        duree_min, duree_max = (int(bound) for bound in duree_bounds)
+        duree_range = st.slider(
+            "Durée en mois",
+            min_value=duree_min,
+            max_value=duree_max,
+            value=(duree_min, duree_max),
+            key='filtre_duree'
+        )
+
+    # Pondération (jeux de données avec poids de redressement)
+    weighted = False
+    if WEIGHT_COLUMN in catalog.schema:
+        st.subheader("⚖️ Pondération")
+        weighted = st.toggle(
+            "Pondérer par les poids de redressement",
+            value=True,
+            help="Moyennes, écarts-types et corrélations pondérés (Genre x Âge x Études) ; "
+                 "les effectifs restent non pondérés",
+            key='filtre_poids'
+        )
+
+    st.form_submit_button("✅ Appliquer les filtres", type="primary", use_container_width=True)
 
 st.sidebar.markdown("---")
 
 # Bouton de réinitialisation
-if st.sidebar.button("🔄 Réinitialiser les filtres", use_container_width=True):
-    st.rerun()
+st.sidebar.button("🔄 Réinitialiser les filtres", on_click=reset_filters, use_container_width=True)
 
 # ============================================================================
 # APPLIQUER LES FILTRES
 # ============================================================================
 
-df_filtered = filter_data(df_original, filters)
+# État de filtres validé : le filtrage n'est refait que lorsqu'il change
+dataset_lease = st.session_state['dataset_lease']
+dataset_key = dataset_lease.key
+filter_state = (
+    dataset_key,
+    tuple((col, tuple(values)) for col, values in filters.items()),
+    tuple(duree_range) if duree_range is not None else None,
+    weighted
+)
+
+if st.session_state.get('filter_state') != filter_state:
+    df_filtered = filter_data(df_original, filters, duree_range,
+                              filter_index=dataset_lease.filter_index)
+
+    # Jeu filtré partagé : les fragments (reruns partiels) le relisent sans refiltrer
+    st.session_state['filter_state'] = filter_state
+    st.session_state['df_filtered'] = df_filtered
+    st.session_state['df_filtered_nbytes'] = estimate_nbytes(df_filtered)
+else:
+    df_filtered = st.session_state['df_filtered']
+
+
+def get_filtered_data():
+    """Retourne le jeu de données filtré pour l'état de filtres validé"""
+    return st.session_state['df_filtered']
+
+
+def get_filtered_waves():
+    """
+    Vagues empilées filtrées par l'état de filtres validé (mêmes filtres que le
+    jeu principal), ou None si moins de deux vagues sont chargées
+    """
+    df_waves = st.session_state.get('df_waves')
+    if df_waves is None:
+        return None
+
+    state = (st.session_state['wave_source_ids'], filter_state)
+    if st.session_state.get('waves_filter_state') != state:
+        st.session_state['df_waves_filtered'] = filter_data(df_waves, filters, duree_range)
+        st.session_state['waves_filter_state'] = state
+    return st.session_state['df_waves_filtered']
+
+
+def get_distribution(column):
+    """
+    Effectifs d'une variable catégorielle pour l'état de filtres validé
+
+    Tant qu'aucun filtre n'écarte de ligne, les effectifs viennent du catalogue
+    du jeu de données, sans parcourir la colonne.
+    """
+    df_filtered = get_filtered_data()
+    catalog = st.session_state['dataset_lease'].catalog
+    if len(df_filtered) == catalog.n_rows:
+        return catalog.value_counts[column]
+    return get_value_counts(df_filtered, column)
+
+
+def get_response_frequencies(items_config, df_filtered):
+    """
+    Effectifs des réponses aux items d'une dimension pour l'état de filtres validé
+
+    Les filtres de la barre latérale sont servis par le cube du jeu de données
+    (somme des cellules sélectionnées) ; une plage de durée partielle repasse
+    par un comptage sur le jeu filtré. Les effectifs suivent l'échelle de la
+    dimension (4 modalités pour l'estime de soi, 5 pour les autres).
+    """
+    items = [item for item in items_config['items'] if item in df_filtered.columns]
+    categories = dimension_categories(items_config)
+    cube = dataset_lease.likert_cube
+    if cube.covers(filters, duree_range):
+        return cube.frequencies(filters, duree_range, weighted=weighted,
+                                items=items, categories=categories)
+    return count_responses(df_filtered, items, categories, weighted=weighted)
 
-# Filtre sur la durée si spécifié
-if 'Item5' in df_filtered.columns:
-    df_filtered = df_filtered[
-        (df_filtered['Item5'] >= duree_range[0]) & 
-        (df_filtered['Item5'] <= duree_range[1])
-    ]
 
 # Afficher le nombre de participants après filtrage
 n_filtered = len(df_filtered)
@@ -236,63 +501,258 @@ n_total = len(df_original)
 st.sidebar.markdown(f"### 📊 Échantillon")
 st.sidebar.metric("Participants sélectionnés", f"{n_filtered} / {n_total}")
 
+# Consommation mémoire de la session et du serveur
+with st.sidebar.expander("💾 Mémoire"):
+    session_bytes = get_session_nbytes()
+    session_budget = SESSION_MEMORY_BUDGET_MB * 2**20
+    st.progress(
+        min(1.0, session_bytes / session_budget),
+        text=f"Session : {session_bytes / 2**20:.1f} / {SESSION_MEMORY_BUDGET_MB} Mo"
+    )
+
+    memory_usage = get_memory_usage()
+    st.progress(
+        min(1.0, memory_usage['total'] / memory_usage['budget']),
+        text=f"Serveur : {memory_usage['total'] / 2**20:.1f} / {MEMORY_BUDGET_MB} Mo"
+    )
+    st.caption(
+        f"Jeux de données : {memory_usage['datasets'] / 2**20:.1f} Mo · "
+        f"Résultats en cache : {memory_usage['cache'] / 2**20:.1f} Mo"
+    )
+
 if n_filtered == 0:
     st.warning("⚠️ Aucun participant ne correspond aux filtres sélectionnés.")
     st.stop()
 
 # ============================================================================
-# EN-TÊTE DE L'APPLICATION
+# RÉSULTATS PROGRESSIFS
 # ============================================================================
 
-st.title(APP_TITLE)
-st.markdown(f"**{APP_SUBTITLE}**")
-st.markdown("---")
+# Sur les grands jeux de données, les indicateurs de l'accueil, le tableau des
+# moyennes et les comparaisons de groupes s'affichent d'abord à partir d'un
+# échantillon stratifié (Genre x Âge x Études), avec leurs intervalles de
+# confiance, puis sont remplacés par les valeurs exactes dès que leur calcul,
+# lancé en arrière-plan, se termine. Un calcul exact qui aboutit dans le délai
+# de grâce est affiché directement.
+progressive_mode = n_total >= PROGRESSIVE_MIN_ROWS
+
+TOTAL_COLUMNS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+
+@st.cache_resource
+def get_progressive_executor():
+    """Pool de threads partagé pour les calculs exacts des résultats progressifs"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="progressive")
+
+
+def get_sample_mask():
+    """Échantillon stratifié du jeu de données et son masque pour l'état de filtres validé"""
+    sample = st.session_state['dataset_lease'].sample
+    if st.session_state.get('sample_filter_state') != filter_state:
+        st.session_state['sample_mask'] = sample.filter_mask(filters, duree_range)
+        st.session_state['sample_filter_state'] = filter_state
+    return sample, st.session_state['sample_mask']
+
+
+def submit_exact(name, compute):
+    """
+    Lance (une seule fois par état de filtres) le calcul exact d'un résultat
+
+    Args:
+        name: Identifiant hashable du résultat (partagé par les sections qui l'affichent)
+        compute: Fonction sans argument, exécutée hors du thread du script
+            (aucun appel Streamlit)
+
+    Returns:
+        Future du résultat exact
+    """
+    if st.session_state.get('progressive_filter_state') != filter_state:
+        st.session_state['progressive_filter_state'] = filter_state
+        st.session_state['progressive_futures'] = {}
+
+    futures = st.session_state['progressive_futures']
+    if name not in futures:
+        futures[name] = get_progressive_executor().submit(compute)
+    return futures[name]
+
+
+def render_progressive(pending, name, exact, approximate, draw):
+    """
+    Affiche un résultat exact, précédé d'une estimation si son calcul tarde
+
+    Args:
+        pending: Liste des estimations affichées, à affiner par refine_progressive
+        name: Identifiant du résultat (voir submit_exact)
+        exact: Fonction sans argument qui calcule le résultat exact
+        approximate: Fonction sans argument qui estime le résultat sur l'échantillon
+        draw: Fonction draw(result, approximate) qui affiche un résultat
+    """
+    if not progressive_mode:
+        draw(exact(), approximate=False)
+        return
+
+    placeholder = st.empty()
+    future = submit_exact(name, exact)
+    if future in wait([future], timeout=PROGRESSIVE_GRACE_SECONDS).done:
+        with placeholder.container():
+            draw(future.result(), approximate=False)
+        return
+
+    with placeholder.container():
+        draw(approximate(), approximate=True)
+    pending.append((placeholder, future, draw))
+
+
+def refine_progressive(pending):
+    """Remplace les estimations affichées par les résultats exacts, dans l'ordre d'affichage"""
+    for placeholder, future, draw in pending:
+        result = future.result()
+        with placeholder.container():
+            draw(result, approximate=False)
+    pending.clear()
+
+
+def render_progressive_status(approximate):
+    """Indique si les valeurs affichées au-dessus sont estimées ou exactes"""
+    if approximate:
+        _, mask = get_sample_mask()
+        st.caption(
+            f"⏳ Estimation sur un échantillon stratifié de {int(mask.sum())} participants "
+            f"(± = demi-largeur de l'IC 95 %) — calcul exact en cours…"
+        )
+    elif progressive_mode:
+        st.caption("✅ Valeurs exactes")
+
+
+def format_estimate(value, ci=None, fmt='.2f'):
+    """Valeur d'un indicateur, précédée de ≈ et suivie de ± IC 95 % si elle est estimée"""
+    if ci is None:
+        return f"{value:{fmt}}"
+    return f"≈ {value:{fmt}} ± {ci:.2g}"
+
+
+def estimate_averages():
+    """Estimation de calculate_averages_by_filters pour l'état de filtres validé"""
+    sample, mask = get_sample_mask()
+    return sample.averages_by_filters(mask, weighted)
 
 # ============================================================================
-# NAVIGATION PAR ONGLETS
+# TÂCHES EN ARRIÈRE-PLAN
 # ============================================================================
 
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-    "🏠 Accueil",
-    "📊 Analyses Moyennes",
-    "💙 Estime de Soi",
-    "💎 Valorisation",
-    "⚠️ Manque Reconnaissance",
-    "🤝 Gestion Conflits",
-    "🔗 Analyses Croisées",
-    "📈 Statistiques"
-])
+# Les analyses longues (bootstrap...) tournent dans un pool de processus
+# partagé par les sessions : le script ne fait que soumettre la tâche et en
+# afficher l'avancement. Une tâche identique (même jeu, mêmes filtres, mêmes
+# paramètres) n'est calculée qu'une fois ; quand l'état de filtres change, la
+# session se détache de ses tâches, qui sont annulées si personne d'autre ne
+# les attend.
+
+@st.cache_resource
+def get_job_manager():
+    """File de tâches d'analyse partagée par toutes les sessions"""
+    return JobManager(workers=JOB_WORKERS, result_dir=JOB_RESULTS_DIR)
+
+
+job_owner = st.session_state.setdefault('job_owner', uuid.uuid4().hex)
+
+if st.session_state.get('jobs_filter_state') != filter_state:
+    for job in st.session_state.get('jobs', {}).values():
+        get_job_manager().release(job, job_owner)
+    st.session_state['jobs'] = {}
+    st.session_state['jobs_filter_state'] = filter_state
+
+
+def find_job(analysis, params):
+    """Tâche de la session ou tâche déjà lancée (terminée) pour l'état de filtres validé"""
+    job_key = (analysis, tuple(sorted(params.items())))
+    job = st.session_state['jobs'].get(job_key)
+    if job is None or job.status == JOB_CANCELLED:
+        job = get_job_manager().get(analysis, params, filter_state)
+    return job
+
+
+def submit_job(analysis, params):
+    """Lance une analyse en arrière-plan sur le jeu filtré (ou rejoint la même analyse en cours)"""
+    job = get_job_manager().submit(analysis, params, get_filtered_data(),
+                                   key=filter_state, owner=job_owner)
+    st.session_state['jobs'][(analysis, tuple(sorted(params.items())))] = job
+    return job
+
+
+def cancel_job(job):
+    """Détache la session d'une tâche (annulée si personne d'autre ne l'attend)"""
+    get_job_manager().release(job, job_owner)
+    st.session_state['jobs'] = {key: other for key, other in st.session_state['jobs'].items()
+                                if other is not job}
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def render_job_progress(job):
+    """Avancement d'une tâche en cours, rafraîchi jusqu'à sa fin (rerun partiel)"""
+    if job.status != JOB_RUNNING:
+        # Tâche terminée : la section est réaffichée avec son résultat
+        st.rerun()
+
+    col1, col2 = st.columns([4, 1])
+    col1.progress(job.progress, text=f"⏳ {job.label} : {job.n_done} / {job.n_tasks} lots calculés")
+    col2.button("✖️ Annuler", key=f"cancel_job_{id(job)}", on_click=cancel_job, args=(job,),
+                use_container_width=True)
 
 # ============================================================================
-# TAB 1 : ACCUEIL / DASHBOARD
+# EN-TÊTE DE L'APPLICATION
 # ============================================================================
 
-with tab1:
+st.title(APP_TITLE)
+st.markdown(f"**{APP_SUBTITLE}**")
+st.markdown("---")
+
+# ============================================================================
+# SECTION 1 : ACCUEIL / DASHBOARD
+# ============================================================================
+
+@traced('section')
+def render_accueil():
+    """Section 1 : dashboard global"""
+    df_filtered = get_filtered_data()
+    n_filtered = len(df_filtered)
     st.header("🏠 Dashboard - Vue d'ensemble")
     
-    # KPIs
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        st.metric("👥 Participants", n_filtered)
+    # KPIs (estimés sur l'échantillon stratifié le temps du calcul exact) :
+    # (titre de la carte, indicateur de calculate_kpis, score total)
+    kpi_cards = [
+        ("💙 Estime de Soi", 'Estime de Soi (moy)', 'Total ES'),
+        ("💎 Valorisation", 'Valorisation (moy)', 'Total valo'),
+        ("⚠️ Manque Recon.", 'Manque Reconnaissance (moy)', 'Total MR'),
+        ("🤝 Gestion Conflits", 'Gestion Conflits (moy)', 'Total GC')
+    ]
     
-    with col2:
-        st.metric("💙 Estime de Soi", f"{df_filtered['Total ES'].mean():.1f}")
+    def estimate_kpis():
+        moyennes_df = estimate_averages()
+        return {kpi: (moyennes_df.loc[total, 'Moyenne'], moyennes_df.loc[total, 'IC 95 %'])
+                for _, kpi, total in kpi_cards}
     
-    with col3:
-        st.metric("💎 Valorisation", f"{df_filtered['Total valo'].mean():.1f}")
+    def draw_kpis(kpis, approximate):
+        columns = st.columns(5)
+        columns[0].metric("👥 Participants", n_filtered)
+        for column, (label, kpi, _) in zip(columns[1:], kpi_cards):
+            value, ci = kpis[kpi] if approximate else (kpis[kpi], None)
+            column.metric(label, format_estimate(value, ci, '.1f'))
+        render_progressive_status(approximate)
     
-    with col4:
-        st.metric("⚠️ Manque Recon.", f"{df_filtered['Total MR'].mean():.1f}")
+    pending = []
+    render_progressive(pending, 'kpis', lambda: calculate_kpis(df_filtered, weighted=weighted),
+                       estimate_kpis, draw_kpis)
     
-    with col5:
-        st.metric("🤝 Gestion Conflits", f"{df_filtered['Total GC'].mean():.1f}")
+    weights = get_weights(df_filtered, weighted)
+    if weights is not None:
+        st.caption(f"⚖️ Résultats pondérés : effectif équivalent (Kish) de "
+                   f"{effective_sample_size(weights):,.0f} participants sur {n_filtered:,}")
     
     st.markdown("---")
     
     # Vue d'ensemble des dimensions
     st.subheader("📊 Scores moyens par dimension")
-    fig_overview = create_dimension_overview(df_filtered)
+    fig_overview = create_dimension_overview(df_filtered, weighted=weighted)
     st.plotly_chart(fig_overview, use_container_width=True, config=PLOTLY_CONFIG)
     
     # Deux colonnes pour les graphiques
@@ -300,21 +760,21 @@ with tab1:
     
     with col1:
         st.subheader("👥 Répartition par âge")
-        age_dist = df_filtered['Age_label'].value_counts().reset_index()
+        age_dist = get_distribution('Age_label').reset_index()
         age_dist.columns = ['Âge', 'Nombre']
         fig_age = create_pie_chart(age_dist, 'Âge', 'Nombre', 'Distribution par tranche d\'âge')
         st.plotly_chart(fig_age, use_container_width=True, config=PLOTLY_CONFIG)
     
     with col2:
         st.subheader("⚧️ Répartition par genre")
-        genre_dist = df_filtered['Genre_label'].value_counts().reset_index()
+        genre_dist = get_distribution('Genre_label').reset_index()
         genre_dist.columns = ['Genre', 'Nombre']
         fig_genre = create_pie_chart(genre_dist, 'Genre', 'Nombre', 'Distribution par genre')
         st.plotly_chart(fig_genre, use_container_width=True, config=PLOTLY_CONFIG)
     
     # Graphique du niveau d'études
     st.subheader("🎓 Répartition par niveau d'études")
-    etude_dist = df_filtered['Etude_label'].value_counts().reset_index()
+    etude_dist = get_distribution('Etude_label').reset_index()
     etude_dist.columns = ['Niveau', 'Nombre']
     # Trier selon l'ordre logique
     etude_order = ["Lycée", "Licence 1", "Licence 2", "Licence 3", "Master ou plus"]
@@ -327,167 +787,107 @@ with tab1:
     
     # Matrice de corrélation
     st.subheader("🔗 Corrélations entre les dimensions")
-    corr_matrix = get_correlation_matrix(df_filtered)
+    corr_matrix = get_correlation_matrix(df_filtered, weighted=weighted)
     fig_corr = create_correlation_heatmap(corr_matrix, 
                                           "Matrice de corrélation entre les scores totaux")
     st.plotly_chart(fig_corr, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    refine_progressive(pending)
 
 # ============================================================================
-# TAB 2 : ANALYSES MOYENNES
+# SECTION 2 : ANALYSES MOYENNES
 # ============================================================================
 
-with tab2:
-    st.header("📊 Analyses des Moyennes par Variable")
-    
-    st.markdown("""
-    Cette page présente les moyennes de chaque variable (items et totaux) pour l'échantillon sélectionné.
-    Utilisez les filtres dans la barre latérale pour analyser des sous-groupes spécifiques.
-    """)
-    
-    st.markdown("---")
-    
-    # Calculer toutes les moyennes
-    moyennes_df = calculate_averages_by_filters(df_filtered)
-    
-    # Afficher les statistiques globales
-    st.subheader("📈 Statistiques globales")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Estime de Soi (Total ES)",
-            f"{moyennes_df.loc['Total ES', 'Moyenne']:.2f}",
-            delta=f"σ = {moyennes_df.loc['Total ES', 'Écart-type']:.2f}"
-        )
-    
-    with col2:
-        st.metric(
-            "Valorisation (Total valo)",
-            f"{moyennes_df.loc['Total valo', 'Moyenne']:.2f}",
-            delta=f"σ = {moyennes_df.loc['Total valo', 'Écart-type']:.2f}"
-        )
-    
-    with col3:
-        st.metric(
-            "Manque Recon. (Total MR)",
-            f"{moyennes_df.loc['Total MR', 'Moyenne']:.2f}",
-            delta=f"σ = {moyennes_df.loc['Total MR', 'Écart-type']:.2f}"
-        )
-    
-    with col4:
-        st.metric(
-            "Gestion Conflits (Total GC)",
-            f"{moyennes_df.loc['Total GC', 'Moyenne']:.2f}",
-            delta=f"σ = {moyennes_df.loc['Total GC', 'Écart-type']:.2f}"
-        )
-    
-    st.markdown("---")
-    
-    # Tableau complet des moyennes par dimension
-    st.subheader("📋 Tableau détaillé des moyennes")
+# Tableaux du détail des moyennes : (dimension, titre du tableau, labels des
+# items, libellé du total, titre du graphique)
+MOYENNES_DIMENSIONS = {
+    "Estime de Soi": (ITEMS_ESTIME_SOI, "Items d'Estime de Soi (Échelle de Rosenberg)",
+                      ITEMS_ESTIME_SOI_LABELS, "Total Estime de Soi",
+                      "Moyennes des items d'Estime de Soi"),
+    "Valorisation": (ITEMS_VALORISATION, "Items de Valorisation dans la relation",
+                     ITEMS_VALORISATION_LABELS, "Total Valorisation",
+                     "Moyennes des items de Valorisation"),
+    "Manque Reconnaissance": (ITEMS_MANQUE_RECONNAISSANCE, "Items de Manque de Reconnaissance",
+                              ITEMS_MANQUE_RECONNAISSANCE_LABELS, "Total Manque Reconnaissance",
+                              "Moyennes des items de Manque de Reconnaissance"),
+    "Gestion Conflits": (ITEMS_GESTION_CONFLITS, "Items de Gestion des Conflits",
+                         ITEMS_GESTION_CONFLITS_LABELS, "Total Gestion Conflits",
+                         "Moyennes des items de Gestion des Conflits")
+}
+
+
+@st.fragment
+@traced('section')
+def render_moyennes_detail():
+    """Tableau détaillé des moyennes par dimension (rerun partiel)"""
+    df_filtered = get_filtered_data()
     
     # Organiser par dimension
-    dimensions_tabs = st.tabs(["Estime de Soi", "Valorisation", "Manque Reconnaissance", "Gestion Conflits", "Variables relationnelles"])
-    
-    with dimensions_tabs[0]:
-        st.markdown("**Items d'Estime de Soi (Échelle de Rosenberg)**")
-        es_items = ITEMS_ESTIME_SOI['items'] + [ITEMS_ESTIME_SOI['total']]
-        es_data = moyennes_df.loc[moyennes_df.index.isin(es_items)]
-        
-        # Ajouter les labels
-        es_data_display = es_data.copy()
-        es_data_display['Label'] = es_data_display.index.map(
-            lambda x: ITEMS_ESTIME_SOI_LABELS.get(x, x) if x in ITEMS_ESTIME_SOI_LABELS else "Total Estime de Soi"
-        )
-        es_data_display = es_data_display[['Label', 'Moyenne', 'Écart-type', 'N']]
-        
-        st.dataframe(es_data_display, use_container_width=True)
-        
-        # Graphique des moyennes
-        means_es = df_filtered[ITEMS_ESTIME_SOI['items']].mean().sort_values(ascending=True)
-        fig_es_means = create_item_means_chart(
-            means_es,
-            "Moyennes des items d'Estime de Soi",
-            ITEMS_ESTIME_SOI_LABELS
-        )
-        st.plotly_chart(fig_es_means, use_container_width=True, config=PLOTLY_CONFIG)
-    
-    with dimensions_tabs[1]:
-        st.markdown("**Items de Valorisation dans la relation**")
-        valo_items = ITEMS_VALORISATION['items'] + [ITEMS_VALORISATION['total']]
-        valo_data = moyennes_df.loc[moyennes_df.index.isin(valo_items)]
-        
-        valo_data_display = valo_data.copy()
-        valo_data_display['Label'] = valo_data_display.index.map(
-            lambda x: ITEMS_VALORISATION_LABELS.get(x, x) if x in ITEMS_VALORISATION_LABELS else "Total Valorisation"
-        )
-        valo_data_display = valo_data_display[['Label', 'Moyenne', 'Écart-type', 'N']]
-        
-        st.dataframe(valo_data_display, use_container_width=True)
-        
-        means_valo = df_filtered[ITEMS_VALORISATION['items']].mean().sort_values(ascending=True)
-        fig_valo_means = create_item_means_chart(
-            means_valo,
-            "Moyennes des items de Valorisation",
-            ITEMS_VALORISATION_LABELS
-        )
-        st.plotly_chart(fig_valo_means, use_container_width=True, config=PLOTLY_CONFIG)
+    dimension_choice = st.radio(
+        "Dimension",
+        options=list(MOYENNES_DIMENSIONS) + ["Variables relationnelles"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="moyennes_dimension"
+    )
     
-    with dimensions_tabs[2]:
-        st.markdown("**Items de Manque de Reconnaissance**")
-        mr_items = ITEMS_MANQUE_RECONNAISSANCE['items'] + [ITEMS_MANQUE_RECONNAISSANCE['total']]
-        mr_data = moyennes_df.loc[moyennes_df.index.isin(mr_items)]
-        
-        mr_data_display = mr_data.copy()
-        mr_data_display['Label'] = mr_data_display.index.map(
-            lambda x: ITEMS_MANQUE_RECONNAISSANCE_LABELS.get(x, x) if x in ITEMS_MANQUE_RECONNAISSANCE_LABELS else "Total Manque Reconnaissance"
-        )
-        mr_data_display = mr_data_display[['Label', 'Moyenne', 'Écart-type', 'N']]
-        
-        st.dataframe(mr_data_display, use_container_width=True)
-        
-        means_mr = df_filtered[ITEMS_MANQUE_RECONNAISSANCE['items']].mean().sort_values(ascending=True)
-        fig_mr_means = create_item_means_chart(
-            means_mr,
-            "Moyennes des items de Manque de Reconnaissance",
-            ITEMS_MANQUE_RECONNAISSANCE_LABELS
-        )
-        st.plotly_chart(fig_mr_means, use_container_width=True, config=PLOTLY_CONFIG)
+    pending = []
     
-    with dimensions_tabs[3]:
-        st.markdown("**Items de Gestion des Conflits**")
-        gc_items = ITEMS_GESTION_CONFLITS['items'] + [ITEMS_GESTION_CONFLITS['total']]
-        gc_data = moyennes_df.loc[moyennes_df.index.isin(gc_items)]
-        
-        gc_data_display = gc_data.copy()
-        gc_data_display['Label'] = gc_data_display.index.map(
-            lambda x: ITEMS_GESTION_CONFLITS_LABELS.get(x, x) if x in ITEMS_GESTION_CONFLITS_LABELS else "Total Gestion Conflits"
-        )
-        gc_data_display = gc_data_display[['Label', 'Moyenne', 'Écart-type', 'N']]
+    if dimension_choice in MOYENNES_DIMENSIONS:
+        items_config, title, item_labels, total_label, chart_title = MOYENNES_DIMENSIONS[dimension_choice]
         
-        st.dataframe(gc_data_display, use_container_width=True)
+        def draw_dimension(moyennes_df, approximate):
+            st.markdown(f"**{title}**")
+            dimension_items = items_config['items'] + [items_config['total']]
+            dimension_data = moyennes_df.loc[moyennes_df.index.isin(dimension_items)]
+            
+            # Ajouter les labels
+            data_display = dimension_data.copy()
+            data_display['Label'] = data_display.index.map(
+                lambda x: item_labels.get(x, x) if x in item_labels else total_label
+            )
+            columns = ['Label', 'Moyenne', 'IC 95 %'] if approximate else ['Label', 'Moyenne']
+            data_display = data_display[columns + ['Écart-type', 'N']]
+            
+            st.dataframe(data_display, use_container_width=True)
+            render_progressive_status(approximate)
+            
+            # Graphique des moyennes
+            if approximate:
+                item_means = dimension_data.loc[items_config['items'], 'Moyenne']
+            else:
+                item_means = calculate_item_means(df_filtered, items_config, weighted=weighted)
+            fig_means = create_item_means_chart(
+                item_means.sort_values(ascending=True),
+                chart_title,
+                item_labels
+            )
+            st.plotly_chart(fig_means, use_container_width=True, config=PLOTLY_CONFIG)
         
-        means_gc = df_filtered[ITEMS_GESTION_CONFLITS['items']].mean().sort_values(ascending=True)
-        fig_gc_means = create_item_means_chart(
-            means_gc,
-            "Moyennes des items de Gestion des Conflits",
-            ITEMS_GESTION_CONFLITS_LABELS
-        )
-        st.plotly_chart(fig_gc_means, use_container_width=True, config=PLOTLY_CONFIG)
+        render_progressive(pending, 'averages',
+                           lambda: calculate_averages_by_filters(df_filtered, weighted=weighted),
+                           estimate_averages, draw_dimension)
     
-    with dimensions_tabs[4]:
+    elif dimension_choice == "Variables relationnelles":
         st.markdown("**Variables relationnelles**")
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if 'Item5 (Durée relation)' in moyennes_df.index:
-                st.metric(
-                    "Durée moyenne de relation",
-                    f"{moyennes_df.loc['Item5 (Durée relation)', 'Moyenne']:.1f} mois",
-                    delta=f"σ = {moyennes_df.loc['Item5 (Durée relation)', 'Écart-type']:.1f}"
-                )
+            def draw_duree(moyennes_df, approximate):
+                if 'Item5 (Durée relation)' in moyennes_df.index:
+                    duree = moyennes_df.loc['Item5 (Durée relation)']
+                    st.metric(
+                        "Durée moyenne de relation",
+                        format_estimate(duree['Moyenne'], duree['IC 95 %'] if approximate else None,
+                                        '.1f') + " mois",
+                        delta=f"σ = {duree['Écart-type']:.1f}"
+                    )
+                    render_progressive_status(approximate)
+            
+            render_progressive(pending, 'averages',
+                               lambda: calculate_averages_by_filters(df_filtered, weighted=weighted),
+                               estimate_averages, draw_duree)
         
         with col2:
             satisf_mean = df_filtered['Item7'].mean()
@@ -504,11 +904,63 @@ with tab2:
                 f"{cohab_pct:.1f}%"
             )
     
+    refine_progressive(pending)
+
+
+@traced('section')
+def render_moyennes():
+    """Section 2 : moyennes de toutes les variables"""
+    df_filtered = get_filtered_data()
+    n_filtered = len(df_filtered)
+    st.header("📊 Analyses des Moyennes par Variable")
+    
+    st.markdown("""
+    Cette page présente les moyennes de chaque variable (items et totaux) pour l'échantillon sélectionné.
+    Utilisez les filtres dans la barre latérale pour analyser des sous-groupes spécifiques.
+    """)
+    
+    st.markdown("---")
+    
+    # Afficher les statistiques globales
+    st.subheader("📈 Statistiques globales")
+    
+    def draw_global(moyennes_df, approximate):
+        columns = st.columns(4)
+        for column, label, total in zip(
+            columns,
+            ["Estime de Soi (Total ES)", "Valorisation (Total valo)",
+             "Manque Recon. (Total MR)", "Gestion Conflits (Total GC)"],
+            TOTAL_COLUMNS
+        ):
+            column.metric(
+                label,
+                format_estimate(moyennes_df.loc[total, 'Moyenne'],
+                                moyennes_df.loc[total, 'IC 95 %'] if approximate else None),
+                delta=f"σ = {moyennes_df.loc[total, 'Écart-type']:.2f}"
+            )
+        render_progressive_status(approximate)
+    
+    # Calculer toutes les moyennes (estimées d'abord sur les grands jeux de données)
+    pending = []
+    render_progressive(pending, 'averages',
+                       lambda: calculate_averages_by_filters(df_filtered, weighted=weighted),
+                       estimate_averages, draw_global)
+    
+    st.markdown("---")
+    
+    # Tableau complet des moyennes par dimension
+    st.subheader("📋 Tableau détaillé des moyennes")
+    
+    render_moyennes_detail()
+    
+    refine_progressive(pending)
+    
     st.markdown("---")
     
-    # Export des données
+    # Export des données (toujours exactes)
     st.subheader("💾 Exporter les résultats")
     
+    moyennes_df = calculate_averages_by_filters(df_filtered, weighted=weighted)
     csv = moyennes_df.to_csv(index=True).encode('utf-8')
     st.download_button(
         label="📥 Télécharger le tableau complet (CSV)",
@@ -518,10 +970,13 @@ with tab2:
     )
 
 # ============================================================================
-# TAB 3 : ESTIME DE SOI
+# SECTION 3 : ESTIME DE SOI
 # ============================================================================
 
-with tab3:
+@traced('section')
+def render_estime_soi():
+    """Section 3 : Estime de Soi"""
+    df_filtered = get_filtered_data()
     st.header("💙 Analyse de l'Estime de Soi")
     
     st.markdown(DESCRIPTION_DIMENSIONS['ES'])
@@ -589,7 +1044,7 @@ with tab3:
     # Analyse item par item
     st.subheader("🔍 Analyse item par item")
     
-    means_es = calculate_item_means(df_filtered, ITEMS_ESTIME_SOI)
+    means_es = calculate_item_means(df_filtered, ITEMS_ESTIME_SOI, weighted=weighted)
     fig_items_es = create_item_means_chart(
         means_es,
         "Moyennes des items d'Estime de Soi",
@@ -597,11 +1052,24 @@ with tab3:
     )
     st.plotly_chart(fig_items_es, use_container_width=True, config=PLOTLY_CONFIG)
 
+    counts_es = get_response_frequencies(ITEMS_ESTIME_SOI, df_filtered)
+    fig_likert_es = create_likert_chart(
+        counts_es,
+        "Répartition des réponses aux items d'Estime de Soi",
+        ITEMS_ESTIME_SOI_LABELS,
+        category_labels=ITEMS_ESTIME_SOI['scale'],
+        colors=COLORS_LIKERT_4
+    )
+    st.plotly_chart(fig_likert_es, use_container_width=True, config=PLOTLY_CONFIG)
+
 # ============================================================================
-# TAB 4 : VALORISATION
+# SECTION 4 : VALORISATION
 # ============================================================================
 
-with tab4:
+@traced('section')
+def render_valorisation():
+    """Section 4 : Valorisation dans la relation"""
+    df_filtered = get_filtered_data()
     st.header("💎 Analyse de la Valorisation dans la relation")
     
     st.markdown(DESCRIPTION_DIMENSIONS['Valorisation'])
@@ -658,7 +1126,7 @@ with tab4:
     # Analyse item par item
     st.subheader("🔍 Analyse item par item")
     
-    means_valo = calculate_item_means(df_filtered, ITEMS_VALORISATION)
+    means_valo = calculate_item_means(df_filtered, ITEMS_VALORISATION, weighted=weighted)
     fig_items_valo = create_item_means_chart(
         means_valo,
         "Moyennes des items de Valorisation",
@@ -666,11 +1134,22 @@ with tab4:
     )
     st.plotly_chart(fig_items_valo, use_container_width=True, config=PLOTLY_CONFIG)
 
+    counts_valo = get_response_frequencies(ITEMS_VALORISATION, df_filtered)
+    fig_likert_valo = create_likert_chart(
+        counts_valo,
+        "Répartition des réponses aux items de Valorisation",
+        ITEMS_VALORISATION_LABELS
+    )
+    st.plotly_chart(fig_likert_valo, use_container_width=True, config=PLOTLY_CONFIG)
+
 # ============================================================================
-# TAB 5 : MANQUE DE RECONNAISSANCE
+# SECTION 5 : MANQUE DE RECONNAISSANCE
 # ============================================================================
 
-with tab5:
+@traced('section')
+def render_manque_reconnaissance():
+    """Section 5 : Manque de Reconnaissance"""
+    df_filtered = get_filtered_data()
     st.header("⚠️ Analyse du Manque de Reconnaissance")
     
     st.markdown(DESCRIPTION_DIMENSIONS['MR'])
@@ -727,7 +1206,7 @@ with tab5:
     # Analyse item par item
     st.subheader("🔍 Analyse item par item")
     
-    means_mr = calculate_item_means(df_filtered, ITEMS_MANQUE_RECONNAISSANCE)
+    means_mr = calculate_item_means(df_filtered, ITEMS_MANQUE_RECONNAISSANCE, weighted=weighted)
     fig_items_mr = create_item_means_chart(
         means_mr,
         "Moyennes des items de Manque de Reconnaissance",
@@ -735,11 +1214,22 @@ with tab5:
     )
     st.plotly_chart(fig_items_mr, use_container_width=True, config=PLOTLY_CONFIG)
 
+    counts_mr = get_response_frequencies(ITEMS_MANQUE_RECONNAISSANCE, df_filtered)
+    fig_likert_mr = create_likert_chart(
+        counts_mr,
+        "Répartition des réponses aux items de Manque de Reconnaissance",
+        ITEMS_MANQUE_RECONNAISSANCE_LABELS
+    )
+    st.plotly_chart(fig_likert_mr, use_container_width=True, config=PLOTLY_CONFIG)
+
 # ============================================================================
-# TAB 6 : GESTION DES CONFLITS
+# SECTION 6 : GESTION DES CONFLITS
 # ============================================================================
 
-with tab6:
+@traced('section')
+def render_gestion_conflits():
+    """Section 6 : Gestion des Conflits"""
+    df_filtered = get_filtered_data()
     st.header("🤝 Analyse de la Gestion des Conflits")
     
     st.markdown(DESCRIPTION_DIMENSIONS['GC'])
@@ -796,7 +1286,7 @@ with tab6:
     # Analyse item par item
     st.subheader("🔍 Analyse item par item")
     
-    means_gc = calculate_item_means(df_filtered, ITEMS_GESTION_CONFLITS)
+    means_gc = calculate_item_means(df_filtered, ITEMS_GESTION_CONFLITS, weighted=weighted)
     fig_items_gc = create_item_means_chart(
         means_gc,
         "Moyennes des items de Gestion des Conflits",
@@ -804,20 +1294,121 @@ with tab6:
     )
     st.plotly_chart(fig_items_gc, use_container_width=True, config=PLOTLY_CONFIG)
 
+    counts_gc = get_response_frequencies(ITEMS_GESTION_CONFLITS, df_filtered)
+    fig_likert_gc = create_likert_chart(
+        counts_gc,
+        "Répartition des réponses aux items de Gestion des Conflits",
+        ITEMS_GESTION_CONFLITS_LABELS
+    )
+    st.plotly_chart(fig_likert_gc, use_container_width=True, config=PLOTLY_CONFIG)
+
 # ============================================================================
-# TAB 7 : ANALYSES CROISÉES
+# SECTION 7 : ANALYSES CROISÉES
 # ============================================================================
 
-with tab7:
+@st.fragment
+@traced('section')
+def render_grouped_comparison():
+    """Scores moyens par groupe (rerun partiel au changement de variable)"""
+    df_filtered = get_filtered_data()
+    
+    # Choisir la variable de groupement
+    group_var = st.selectbox(
+        "Sélectionner la variable de groupement",
+        options=['Genre_label', 'Age_label', 'Etude_label', 'Item6_label', 'Item7_label'],
+        format_func=lambda x: {
+            'Genre_label': 'Genre',
+            'Age_label': 'Âge',
+            'Etude_label': 'Niveau d\'études',
+            'Item6_label': 'Cohabitation',
+            'Item7_label': 'Satisfaction'
+        }[x]
+    )
+    
+    # Graphique en barres groupées (barres d'erreur = IC 95 % tant qu'il est estimé)
+    def draw_grouped(grouped_means, approximate):
+        fig_grouped = create_grouped_bar_chart(
+            grouped_means,
+            group_var,
+            TOTAL_COLUMNS,
+            f"Scores moyens par {group_var.replace('_label', '')}",
+            labels={group_var: ""},
+            names=['Estime de Soi', 'Valorisation', 'Manque Recon.', 'Gestion Conflits'],
+            height=500,
+            errors=[f"{col} IC 95 %" for col in TOTAL_COLUMNS] if approximate else None
+        )
+        st.plotly_chart(fig_grouped, use_container_width=True, config=PLOTLY_CONFIG)
+        render_progressive_status(approximate)
+    
+    def estimate_grouped_means():
+        sample, mask = get_sample_mask()
+        return sample.grouped_means(mask, group_var, TOTAL_COLUMNS, weighted)
+    
+    # Calculer les moyennes par groupe (colonnes 'mean' des statistiques groupées)
+    pending = []
+    render_progressive(
+        pending,
+        ('grouped_means', group_var),
+        lambda: get_grouped_statistics(df_filtered, group_var, TOTAL_COLUMNS, weighted=weighted)
+                .xs('mean', axis=1, level=1).reset_index(),
+        estimate_grouped_means,
+        draw_grouped
+    )
+    refine_progressive(pending)
+
+
+@st.fragment
+@traced('section')
+def render_item_correlations():
+    """Heatmap des corrélations entre items, ordonnée par classification (rerun partiel)"""
+    df_filtered = get_filtered_data()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        include_totals = st.checkbox("Inclure les scores totaux", value=False,
+                                     key='item_corr_totals')
+    
+    with col2:
+        alpha = st.selectbox(
+            "Masquer les corrélations non significatives (seuil α)",
+            options=[0.05, 0.01, 0.001, 1.0],
+            format_func=lambda x: "Aucun masquage" if x == 1.0 else f"p < {x}",
+            key='item_corr_alpha'
+        )
+    
+    # Corrélations, p-values et ordre calculés une fois par état de filtres (cache)
+    item_corr, item_pvalues = get_item_correlations(df_filtered, include_totals)
+    item_order = get_item_cluster_order(df_filtered, include_totals)
+    
+    fig_item_corr = create_item_correlation_heatmap(
+        item_corr,
+        item_pvalues,
+        item_order,
+        "Corrélations entre items (ordre de classification hiérarchique)",
+        alpha=alpha
+    )
+    st.plotly_chart(fig_item_corr, use_container_width=True, config=PLOTLY_CONFIG)
+
+
+@traced('section')
+def render_analyses_croisees():
+    """Section 7 : analyses croisées et multivariées"""
+    df_filtered = get_filtered_data()
     st.header("🔗 Analyses Croisées et Multivariées")
     
     # Matrice de corrélation détaillée
     st.subheader("📊 Matrice de corrélation complète")
     
-    corr_matrix = get_correlation_matrix(df_filtered)
+    corr_matrix = get_correlation_matrix(df_filtered, weighted=weighted)
     fig_corr = create_correlation_heatmap(corr_matrix)
     st.plotly_chart(fig_corr, use_container_width=True, config=PLOTLY_CONFIG)
     
+    # Corrélations entre items
+    st.subheader("🧩 Corrélations entre items (classification hiérarchique)")
+    
+    render_item_correlations()
+    
     # Scatter matrix
     st.subheader("🎯 Matrice de scatter plots")
     
@@ -843,84 +1434,48 @@ with tab7:
     # Comparaisons par groupes
     st.subheader("👥 Comparaisons par groupes sociodémographiques")
     
-    # Choisir la variable de groupement
-    group_var = st.selectbox(
-        "Sélectionner la variable de groupement",
-        options=['Genre_label', 'Age_label', 'Etude_label', 'Item6_label', 'Item7_label'],
-        format_func=lambda x: {
-            'Genre_label': 'Genre',
-            'Age_label': 'Âge',
-            'Etude_label': 'Niveau d\'études',
-            'Item6_label': 'Cohabitation',
-            'Item7_label': 'Satisfaction'
-        }[x]
-    )
-    
-    # Calculer les moyennes par groupe
-    grouped_means = df_filtered.groupby(group_var)[
-        ['Total ES', 'Total valo', 'Total MR', 'Total GC']
-    ].mean().reset_index()
-    
-    # Graphique en barres groupées
-    fig_grouped = go.Figure()
-    
-    dimensions = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
-    dim_names = ['Estime de Soi', 'Valorisation', 'Manque Recon.', 'Gestion Conflits']
-    
-    for dim, name in zip(dimensions, dim_names):
-        fig_grouped.add_trace(go.Bar(
-            name=name,
-            x=grouped_means[group_var],
-            y=grouped_means[dim]
-        ))
-    
-    fig_grouped.update_layout(
-        title=f"Scores moyens par {group_var.replace('_label', '')}",
-        barmode='group',
-        template=PLOTLY_LAYOUT_TEMPLATE,
-        height=500,
-        xaxis_title="",
-        yaxis_title="Score moyen"
-    )
-    
-    st.plotly_chart(fig_grouped, use_container_width=True, config=PLOTLY_CONFIG)
+    render_grouped_comparison()
 
 # ============================================================================
-# TAB 8 : STATISTIQUES
+# SECTION 8 : STATISTIQUES
 # ============================================================================
 
-with tab8:
-    st.header("📈 Statistiques Descriptives Détaillées")
-    
-    # Statistiques par dimension
-    st.subheader("📊 Statistiques par dimension")
-    
-    dim_stats = calculate_dimension_stats(df_filtered)
-    st.dataframe(dim_stats, use_container_width=True)
-    
-    # Statistiques des items
-    st.subheader("🔍 Statistiques des items par dimension")
-    
-    stat_tabs = st.tabs(["Estime de Soi", "Valorisation", "Manque Reconnaissance", "Gestion Conflits"])
+@st.fragment
+@traced('section')
+def render_item_statistics():
+    """Statistiques des items de la dimension choisie (rerun partiel)"""
+    df_filtered = get_filtered_data()
+    
+    stat_choice = st.radio(
+        "Dimension",
+        options=["Estime de Soi", "Valorisation", "Manque Reconnaissance", "Gestion Conflits"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="statistiques_dimension"
+    )
     
-    with stat_tabs[0]:
+    if stat_choice == "Estime de Soi":
         es_stats = get_item_statistics(df_filtered, ITEMS_ESTIME_SOI['items'])
         st.dataframe(es_stats, use_container_width=True)
     
-    with stat_tabs[1]:
+    elif stat_choice == "Valorisation":
         valo_stats = get_item_statistics(df_filtered, ITEMS_VALORISATION['items'])
         st.dataframe(valo_stats, use_container_width=True)
     
-    with stat_tabs[2]:
+    elif stat_choice == "Manque Reconnaissance":
         mr_stats = get_item_statistics(df_filtered, ITEMS_MANQUE_RECONNAISSANCE['items'])
         st.dataframe(mr_stats, use_container_width=True)
     
-    with stat_tabs[3]:
+    elif stat_choice == "Gestion Conflits":
         gc_stats = get_item_statistics(df_filtered, ITEMS_GESTION_CONFLITS['items'])
         st.dataframe(gc_stats, use_container_width=True)
-    
-    # Statistiques groupées
-    st.subheader("📊 Comparaisons statistiques par groupes")
+
+
+@st.fragment
+@traced('section')
+def render_grouped_statistics():
+    """Statistiques groupées selon la variable choisie (rerun partiel)"""
+    df_filtered = get_filtered_data()
     
     compare_var = st.selectbox(
         "Comparer les dimensions selon:",
@@ -938,10 +1493,75 @@ with tab8:
     grouped_stats = get_grouped_statistics(
         df_filtered,
         compare_var,
-        ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+        ['Total ES', 'Total valo', 'Total MR', 'Total GC'],
+        weighted=weighted
     )
     
     st.dataframe(grouped_stats, use_container_width=True)
+
+
+@st.fragment
+@traced('section')
+def render_bootstrap():
+    """IC bootstrap des scores totaux, calculés en arrière-plan (rerun partiel)"""
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        n_resamples = st.select_slider(
+            "Nombre de rééchantillonnages",
+            options=[1000, 2000, 5000, 10000],
+            value=2000,
+            key='bootstrap_resamples'
+        )
+    
+    params = {'columns': tuple(TOTAL_COLUMNS), 'n_resamples': n_resamples, 'weighted': weighted}
+    job = find_job('bootstrap_means', params)
+    
+    with col2:
+        st.write("")
+        if st.button("▶️ Lancer", key='bootstrap_run', use_container_width=True,
+                     disabled=job is not None and job.status in (JOB_RUNNING, JOB_DONE)):
+            job = submit_job('bootstrap_means', params)
+    
+    if job is None or job.status == JOB_CANCELLED:
+        st.caption("Le calcul tourne en arrière-plan : vous pouvez continuer à naviguer "
+                   "pendant qu'il s'exécute.")
+    elif job.status == JOB_RUNNING:
+        render_job_progress(job)
+    elif job.status == JOB_FAILED:
+        st.error(f"❌ Erreur lors du calcul : {job.error}")
+    else:
+        st.dataframe(job.result(), use_container_width=True)
+        st.caption(f"✅ {n_resamples} rééchantillonnages, calculés en {job.elapsed:.1f} s "
+                   f"(IC par la méthode des percentiles)")
+
+
+@traced('section')
+def render_statistiques():
+    """Section 8 : statistiques descriptives détaillées"""
+    df_filtered = get_filtered_data()
+    st.header("📈 Statistiques Descriptives Détaillées")
+    
+    # Statistiques par dimension
+    st.subheader("📊 Statistiques par dimension")
+    
+    dim_stats = calculate_dimension_stats(df_filtered, weighted=weighted)
+    st.dataframe(dim_stats, use_container_width=True)
+    
+    # Statistiques des items
+    st.subheader("🔍 Statistiques des items par dimension")
+    
+    render_item_statistics()
+    
+    # Statistiques groupées
+    st.subheader("📊 Comparaisons statistiques par groupes")
+    
+    render_grouped_statistics()
+    
+    # Intervalles de confiance bootstrap (tâche en arrière-plan)
+    st.subheader("🎲 Intervalles de confiance bootstrap")
+    
+    render_bootstrap()
     
     # Résumé démographique
     st.subheader("👥 Résumé de l'échantillon")
@@ -967,6 +1587,344 @@ with tab8:
         for sit, count in demo_summary['cohabitation_distribution'].items():
             st.write(f"- {sit}: {count}")
 
+
+@traced('section')
+def render_vagues():
+    """Section 9 : comparaison des vagues de collecte"""
+    st.header("📅 Comparaison des vagues")
+    
+    df_waves = get_filtered_waves()
+    if df_waves is None:
+        st.info("Chargez au moins deux vagues (un fichier par semestre) dans "
+                "« 📅 Comparer plusieurs vagues de collecte », en haut de la page. "
+                "Les filtres de la barre latérale s'appliquent à toutes les vagues.")
+        return
+    
+    # Toutes les vagues en une passe groupée (moyennes, écarts-types, effectifs)
+    stats = wave_statistics(df_waves, weighted=weighted)
+    waves = list(stats['Moyenne'].columns)
+    
+    columns = st.columns(len(waves))
+    wave_sizes = df_waves[WAVE_COLUMN].value_counts(sort=False)
+    for column, wave in zip(columns, waves):
+        column.metric(f"👥 {wave}", int(wave_sizes[wave]))
+    
+    # Scores totaux par vague (barres d'erreur = IC 95 % de la moyenne)
+    st.subheader("📊 Scores moyens par vague")
+    means = stats['Moyenne'].loc[TOTAL_COLUMNS].T
+    margins = stats['IC 95 %'].loc[TOTAL_COLUMNS].T
+    data = means.join(margins.add_suffix(' IC 95 %')).rename_axis(WAVE_COLUMN).reset_index()
+    fig_waves = create_grouped_bar_chart(
+        data,
+        WAVE_COLUMN,
+        TOTAL_COLUMNS,
+        "Scores moyens par vague",
+        names=['Estime de Soi', 'Valorisation', 'Manque Recon.', 'Gestion Conflits'],
+        errors=[f"{col} IC 95 %" for col in TOTAL_COLUMNS]
+    )
+    st.plotly_chart(fig_waves, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # Évolution d'une vague à l'autre, avec taille d'effet standardisée
+    st.subheader("📈 Évolution entre vagues")
+    reference = st.selectbox(
+        "Comparer chaque vague à",
+        options=[None] + waves,
+        format_func=lambda x: "La vague précédente" if x is None else f"La vague {x}",
+        key='wave_reference'
+    )
+    differences = wave_differences(stats, reference)
+    st.caption("g de Hedges : différence de moyennes en écarts-types combinés "
+               "(|g| < 0,2 négligeable, < 0,5 petit, < 0,8 moyen, au-delà grand) ; "
+               "p : test t de Welch.")
+    st.dataframe(differences[differences.index.get_level_values('Variable').isin(TOTAL_COLUMNS)],
+                 use_container_width=True)
+    with st.expander("🔍 Tous les items"):
+        st.dataframe(differences, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    # Corrélations entre dimensions, vague par vague
+    with col1:
+        st.subheader("🔗 Corrélations par vague")
+        corr_wave = st.selectbox("Vague", options=waves, key='wave_corr')
+        corr_matrix = wave_correlations(df_waves, weighted=weighted).loc[corr_wave]
+        fig_corr = create_correlation_heatmap(corr_matrix, f"Corrélations entre scores totaux ({corr_wave})")
+        st.plotly_chart(fig_corr, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # Statistiques groupées de toutes les vagues
+    with col2:
+        st.subheader("👥 Groupes par vague")
+        group_var = st.selectbox(
+            "Variable de groupement",
+            options=['Genre_label', 'Age_label', 'Etude_label', 'Item6_label', 'Item7_label'],
+            format_func=lambda x: {
+                'Genre_label': 'Genre',
+                'Age_label': 'Âge',
+                'Etude_label': 'Niveau d\'études',
+                'Item6_label': 'Cohabitation',
+                'Item7_label': 'Satisfaction'
+            }[x],
+            key='wave_group'
+        )
+        st.dataframe(wave_group_statistics(df_waves, group_var, TOTAL_COLUMNS, weighted=weighted),
+                     use_container_width=True)
+    
+    # Répondants présents dans plusieurs vagues : changements intra-individuels
+    if PARTICIPANT_ID_COLUMN in df_waves.columns:
+        render_panel(df_waves, waves)
+
+
+def render_panel(df_waves, waves):
+    """Suivi longitudinal : répondants appariés entre deux vagues sur leur identifiant"""
+    st.subheader("🔁 Suivi longitudinal (répondants présents dans deux vagues)")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        before = st.selectbox("Vague de départ", options=waves, index=0, key='panel_before')
+    with col2:
+        after = st.selectbox("Vague d'arrivée", options=waves, index=len(waves) - 1,
+                             key='panel_after')
+    if before == after:
+        st.info("Choisissez deux vagues différentes.")
+        return
+    
+    n_linked = len(change_scores(df_waves, before, after))
+    if n_linked < 3:
+        st.info(f"{n_linked} répondant(s) présent(s) dans les deux vagues (avec les filtres "
+                f"actuels) : pas assez pour un suivi longitudinal.")
+        return
+    
+    tests = paired_tests(df_waves, before, after)
+    st.metric("👥 Répondants appariés", n_linked)
+    st.caption("Scores de changement = arrivée - départ, pour chaque répondant ; test t apparié, "
+               "taille d'effet dz = Δ moyen / écart-type des Δ. Analyses non pondérées.")
+    st.dataframe(tests.loc[TOTAL_COLUMNS], use_container_width=True)
+    with st.expander("🔍 Tous les items"):
+        st.dataframe(tests, use_container_width=True)
+    
+    # Les changements vont-ils de pair ? (ex. ΔValorisation vs ΔES)
+    corr, p_values = change_correlations(df_waves, before, after)
+    fig_changes = create_item_correlation_heatmap(
+        corr, p_values, list(corr.columns),
+        f"Corrélations entre changements ({before} → {after}), p < 0,05"
+    )
+    st.plotly_chart(fig_changes, use_container_width=True, config=PLOTLY_CONFIG)
+
+# ============================================================================
+# PRÉCHARGEMENT DES SECTIONS
+# ============================================================================
+
+def precompute_accueil(df_filtered):
+    """Calculs mis en cache de la section Accueil"""
+    calculate_kpis(df_filtered, weighted=weighted)
+    calculate_dimension_stats(df_filtered, weighted=weighted)
+    for column in ['Age_label', 'Genre_label', 'Etude_label']:
+        get_value_counts(df_filtered, column)
+    get_correlation_matrix(df_filtered, weighted=weighted)
+
+
+def precompute_moyennes(df_filtered):
+    """Calculs mis en cache de la section Analyses Moyennes"""
+    calculate_averages_by_filters(df_filtered, weighted=weighted)
+    for items_config in [ITEMS_ESTIME_SOI, ITEMS_VALORISATION,
+                         ITEMS_MANQUE_RECONNAISSANCE, ITEMS_GESTION_CONFLITS]:
+        calculate_item_means(df_filtered, items_config, weighted=weighted)
+
+
+def precompute_dimension(items_config):
+    """Calculs mis en cache d'une section de dimension"""
+    def precompute(df_filtered):
+        calculate_item_means(df_filtered, items_config, weighted=weighted)
+        get_response_frequencies(items_config, df_filtered)
+    return precompute
+
+
+def precompute_analyses_croisees(df_filtered):
+    """Calculs mis en cache de la section Analyses Croisées"""
+    get_correlation_matrix(df_filtered, weighted=weighted)
+    get_item_cluster_order(df_filtered)
+
+
+def precompute_statistiques(df_filtered):
+    """Calculs mis en cache de la section Statistiques"""
+    calculate_dimension_stats(df_filtered, weighted=weighted)
+    for items_config in [ITEMS_ESTIME_SOI, ITEMS_VALORISATION,
+                         ITEMS_MANQUE_RECONNAISSANCE, ITEMS_GESTION_CONFLITS]:
+        get_item_statistics(df_filtered, items_config['items'])
+    get_grouped_statistics(df_filtered, 'Genre', ['Total ES', 'Total valo', 'Total MR', 'Total GC'],
+                           weighted=weighted)
+
+
+def precompute_vagues(df_filtered):
+    """Calculs mis en cache de la section Vagues (si des vagues sont chargées)"""
+    if df_waves_filtered is not None:
+        wave_statistics(df_waves_filtered, weighted=weighted)
+        wave_correlations(df_waves_filtered, weighted=weighted)
+        if PARTICIPANT_ID_COLUMN in df_waves_filtered.columns:
+            # Panel affiché par défaut : première et dernière vagues
+            waves = list(df_waves_filtered[WAVE_COLUMN].cat.categories)
+            change_scores(df_waves_filtered, waves[0], waves[-1])
+            paired_tests(df_waves_filtered, waves[0], waves[-1])
+            change_correlations(df_waves_filtered, waves[0], waves[-1])
+
+
+@st.cache_resource
+def get_prefetch_executor():
+    """Pool de threads partagé pour le préchargement des sections non affichées"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+def prefetch_sections(df_filtered, active_section, filter_state):
+    """
+    Précalcule en arrière-plan les résultats des sections non affichées
+
+    Les résultats alimentent le cache des fonctions de traitement : lorsque
+    l'utilisateur change de section, seuls les graphiques restent à construire.
+    Le préchargement n'est lancé qu'une fois par état de filtres.
+
+    Args:
+        df_filtered: DataFrame filtré
+        active_section: Clé de la section affichée (déjà calculée)
+        filter_state: Représentation hashable de l'état des filtres
+    """
+    if st.session_state.get('prefetched_filter_state') == filter_state:
+        return
+    st.session_state['prefetched_filter_state'] = filter_state
+
+    executor = get_prefetch_executor()
+    for key, section in SECTIONS.items():
+        if key != active_section:
+            executor.submit(section['precompute'], df_filtered)
+
+# ============================================================================
+# NAVIGATION ENTRE LES SECTIONS
+# ============================================================================
+
+# Seule la section sélectionnée est calculée et affichée à chaque rerun
+SECTIONS = {
+    'accueil': {
+        'label': "🏠 Accueil",
+        'render': render_accueil,
+        'precompute': precompute_accueil
+    },
+    'moyennes': {
+        'label': "📊 Analyses Moyennes",
+        'render': render_moyennes,
+        'precompute': precompute_moyennes
+    },
+    'estime_soi': {
+        'label': "💙 Estime de Soi",
+        'render': render_estime_soi,
+        'precompute': precompute_dimension(ITEMS_ESTIME_SOI)
+    },
+    'valorisation': {
+        'label': "💎 Valorisation",
+        'render': render_valorisation,
+        'precompute': precompute_dimension(ITEMS_VALORISATION)
+    },
+    'manque_reconnaissance': {
+        'label': "⚠️ Manque Reconnaissance",
+        'render': render_manque_reconnaissance,
+        'precompute': precompute_dimension(ITEMS_MANQUE_RECONNAISSANCE)
+    },
+    'gestion_conflits': {
+        'label': "🤝 Gestion Conflits",
+        'render': render_gestion_conflits,
+        'precompute': precompute_dimension(ITEMS_GESTION_CONFLITS)
+    },
+    'analyses_croisees': {
+        'label': "🔗 Analyses Croisées",
+        'render': render_analyses_croisees,
+        'precompute': precompute_analyses_croisees
+    },
+    'statistiques': {
+        'label': "📈 Statistiques",
+        'render': render_statistiques,
+        'precompute': precompute_statistiques
+    },
+    'vagues': {
+        'label': "📅 Vagues",
+        'render': render_vagues,
+        'precompute': precompute_vagues
+    }
+}
+
+active_section = st.radio(
+    "Section",
+    options=list(SECTIONS.keys()),
+    format_func=lambda x: SECTIONS[x]['label'],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_section"
+)
+
+st.markdown("---")
+
+SECTIONS[active_section]['render']()
+
+# Vagues filtrées (lues par le préchargement de la section Vagues)
+df_waves_filtered = get_filtered_waves()
+prefetch_sections(df_filtered, active_section,
+                  (filter_state, st.session_state.get('wave_source_ids')))
+
+# ============================================================================
+# PANNEAU DÉVELOPPEUR
+# ============================================================================
+
+def render_profiling_panel(trace):
+    """Affiche dans la barre latérale les spans du rerun et leurs exports"""
+    spans = pd.DataFrame([span.to_dict() for span in trace.spans])
+    if spans.empty:
+        return
+
+    with st.sidebar.expander("🛠️ Profil du rerun", expanded=True):
+        st.metric("Durée tracée", f"{trace.duration * 1000:.0f} ms")
+
+        by_category = spans[spans['depth'] == 0].groupby('category')['duration_ms'].sum()
+        st.caption(" · ".join(f"{category} : {ms:.0f} ms" for category, ms in by_category.items()))
+
+        spans['name'] = ["  " * depth + name for depth, name in zip(spans['depth'], spans['name'])]
+        st.dataframe(
+            spans[['name', 'category', 'duration_ms', 'rows', 'cache', 'payload_bytes']],
+            hide_index=True,
+            use_container_width=True
+        )
+
+        st.download_button("⬇️ JSON", data=json.dumps(trace.to_json(), indent=2),
+                           file_name="trace.json", mime="application/json",
+                           use_container_width=True)
+        st.download_button("⬇️ Chrome trace", data=json.dumps(trace.to_chrome_trace()),
+                           file_name="trace.chrome.json", mime="application/json",
+                           use_container_width=True)
+
+
+def render_cache_panel():
+    """Affiche dans la barre latérale les statistiques des fonctions en cache"""
+    stats = pd.DataFrame(get_cache_stats())
+    stats = stats[stats['calls'] > 0]
+    if stats.empty:
+        return
+
+    with st.sidebar.expander("🗄️ Cache des calculs"):
+        table = pd.DataFrame({
+            'fonction': stats['function'].str.rsplit('.', n=1).str[-1],
+            'appels': stats['calls'],
+            'succès %': (stats['hit_rate'] * 100).round(0),
+            'hachage ms': stats['hash_ms_mean'].round(2),
+            'calcul ms': stats['compute_ms_mean'].round(2),
+            'entrées': stats['entries'],
+            'Ko': (stats['nbytes'] / 1024).round(1)
+        })
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        st.caption("Hachage : temps moyen de calcul de la clé (par appel). "
+                   "Calcul : temps moyen d'exécution lors d'un échec.")
+        st.button("Remettre à zéro", on_click=reset_cache_stats, use_container_width=True)
+
+
+if dev_mode:
+    render_profiling_panel(stop_trace())
+    render_cache_panel()
+
 # ============================================================================
 # FOOTER
 # ============================================================================
@@ -0,0 +1,148 @@
+"""
+Profil mémoire du chemin de données (chargement -> filtres -> graphiques)
+
+Pour une série d'états de filtres représentatifs, mesure la mémoire allouée par
+filter_data et vérifie qu'un état de filtres matérialise au plus un nouveau
+DataFrame : les octets alloués ne doivent pas dépasser la taille du jeu filtré
+(à une marge près pour le masque et les index), et un état qui n'écarte aucune
+ligne ne doit rien copier.
+
+Les allocations NumPy sont suivies par tracemalloc, celles des colonnes texte
+(Arrow) par pyarrow.total_allocated_bytes lorsque pyarrow est installé.
+
+Usage :
+    python benchmarks/filter_memory.py --data Etudes_relations_amoureuses.xlsx
+    python benchmarks/filter_memory.py --data ... --check   # code 1 si dépassement
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import estimate_nbytes, filter_data, get_dataset_store
+
+# Marge tolérée au-delà de la taille du jeu filtré (masque, index de lignes)
+OVERHEAD_RATIO = 1.25
+
+# États de filtres mesurés : (nom, filtres, bornes de durée)
+FILTER_STATES = [
+    ('aucun filtre', {}, None),
+    ('tout sélectionné', {'Age': [1, 2], 'Genre': [1, 2, 3]}, None),
+    ('genre', {'Genre': [1]}, None),
+    ('genre + âge', {'Genre': [1], 'Age': [2]}, None),
+    ('genre + âge + études', {'Genre': [1, 2], 'Age': [1, 2], 'Etude': [2, 3, 4]}, None),
+    ('durée', {}, (0, 24)),
+    ('tous les filtres', {'Genre': [2], 'Etude': [1, 2, 3], 'Item6': [2], 'Item7': [3, 4]}, (6, 60))
+]
+
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+def arrow_allocated_bytes():
+    """Octets alloués par le pool mémoire Arrow (0 sans pyarrow)"""
+    try:
+        import pyarrow
+    except ImportError:
+        return 0
+    return pyarrow.total_allocated_bytes()
+
+
+def shares_all_columns(df_filtered, df):
+    """Indique si toutes les colonnes numériques du résultat partagent les données de df"""
+    return all(
+        np.shares_memory(df_filtered[col].to_numpy(), df[col].to_numpy())
+        for col in df.columns if df[col].dtype.kind in 'biuf'
+    )
+
+
+def profile_filter_state(df, filters, duree_range):
+    """
+    Mesure les allocations d'un appel à filter_data
+
+    Returns:
+        Dict {'rows', 'frame_bytes', 'allocated_bytes', 'ratio', 'zero_copy'}
+    """
+    arrow_before = arrow_allocated_bytes()
+    tracemalloc.start()
+    df_filtered = filter_data(df, filters, duree_range)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = peak + max(0, arrow_allocated_bytes() - arrow_before)
+
+    zero_copy = len(df_filtered) == len(df) and shares_all_columns(df_filtered, df)
+    frame_bytes = 0 if zero_copy else estimate_nbytes(df_filtered)
+
+    return {
+        'rows': len(df_filtered),
+        'frame_bytes': frame_bytes,
+        'allocated_bytes': allocated,
+        'ratio': round(allocated / frame_bytes, 2) if frame_bytes else None,
+        'zero_copy': zero_copy
+    }
+
+
+def build_report(df):
+    """
+    Profile tous les états de filtres
+
+    Returns:
+        Dict {état: mesures + 'within_budget'}
+    """
+    report = {}
+
+    for name, filters, duree_range in FILTER_STATES:
+        result = profile_filter_state(df, filters, duree_range)
+        if result['zero_copy']:
+            # Aucune ligne écartée : seuls les en-têtes du DataFrame sont alloués
+            within_budget = result['allocated_bytes'] < estimate_nbytes(df) * 0.05
+        else:
+            within_budget = result['allocated_bytes'] <= result['frame_bytes'] * OVERHEAD_RATIO
+        report[name] = dict(result, within_budget=within_budget)
+
+    return report
+
+
+def print_report(report, n_rows, dataset_bytes):
+    """Affiche le rapport sous forme de tableau"""
+    print(f"Jeu de données : {n_rows} lignes, {dataset_bytes / 2**20:.2f} Mo\n")
+    print(f"{'État de filtres':<24}{'Lignes':>10}{'Jeu filtré':>14}{'Alloué':>14}{'Ratio':>8}")
+    for name, result in report.items():
+        frame = "sans copie" if result['zero_copy'] else f"{result['frame_bytes'] / 2**20:.2f} Mo"
+        ratio = f"{result['ratio']:.2f}" if result['ratio'] is not None else "-"
+        status = "" if result['within_budget'] else "  ⚠️ plus d'une copie"
+        print(f"{name:<24}{result['rows']:>10}{frame:>14}"
+              f"{result['allocated_bytes'] / 2**20:>11.2f} Mo{ratio:>8}{status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil mémoire du filtrage")
+    parser.add_argument("--data", required=True, help="Fichier Excel du questionnaire")
+    parser.add_argument("--json", help="Écrire le rapport JSON dans ce fichier")
+    parser.add_argument("--check", action="store_true",
+                        help="Code de sortie 1 si un état de filtres copie plus d'un DataFrame")
+    args = parser.parse_args()
+
+    lease = get_dataset_store().acquire(args.data)
+    df = lease.df
+
+    report = build_report(df)
+    print_report(report, len(df), lease.nbytes)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.check and not all(result['within_budget'] for result in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
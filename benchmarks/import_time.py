@@ -0,0 +1,155 @@
+"""
+Rapport des temps d'import au démarrage (démarrage à froid)
+
+Chaque cible est importée dans un interpréteur neuf avec `python -X importtime`.
+Le rapport donne le temps total, les modules les plus coûteux, et vérifie que
+les modules lourds chargés à la demande (SciPy, statsmodels, plotly.express,
+plotly.subplots) ne sont pas importés au démarrage.
+
+Usage :
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --check            # code 1 si un budget est dépassé
+    python benchmarks/import_time.py --json imports.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ============================================================================
+# CIBLES ET BUDGETS
+# ============================================================================
+
+# Budgets en millisecondes (meilleur de --repeat essais)
+IMPORT_TARGETS = {
+    'analytics': {
+        'modules': ['analytics'],
+        'budget_ms': 600
+    },
+    'visualizations': {
+        'modules': ['visualizations'],
+        'budget_ms': 400
+    },
+    'app': {
+        'modules': ['streamlit', 'analytics', 'visualizations'],
+        'budget_ms': 2500
+    }
+}
+
+# Modules qui ne doivent être chargés qu'à la première utilisation
+DEFERRED_MODULES = ['scipy', 'statsmodels', 'plotly.express', 'plotly.subplots']
+
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+def measure_imports(modules):
+    """
+    Importe des modules dans un interpréteur neuf et analyse la sortie -X importtime
+
+    Args:
+        modules: Liste de noms de modules
+
+    Returns:
+        Dict {module importé: (self_us, cumulative_us, profondeur)}
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {modules} :\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings[name.strip()] = (int(self_us), int(cumulative_us), depth)
+
+    return timings
+
+
+def build_report(repeat=3, top=10):
+    """
+    Mesure toutes les cibles (meilleur de `repeat` essais)
+
+    Returns:
+        Dict {cible: {'total_ms', 'budget_ms', 'within_budget', 'top', 'deferred_loaded'}}
+    """
+    report = {}
+
+    for target, spec in IMPORT_TARGETS.items():
+        best = None
+        for _ in range(repeat):
+            timings = measure_imports(spec['modules'])
+            total_us = sum(self_us for self_us, _, _ in timings.values())
+            if best is None or total_us < best[0]:
+                best = (total_us, timings)
+
+        total_us, timings = best
+        heaviest = sorted(
+            ((name, cumulative) for name, (_, cumulative, depth) in timings.items() if depth <= 1),
+            key=lambda item: item[1],
+            reverse=True
+        )[:top]
+        deferred_loaded = [
+            module for module in DEFERRED_MODULES
+            if any(name == module or name.startswith(module + ".") for name in timings)
+        ]
+
+        report[target] = {
+            'total_ms': round(total_us / 1000, 1),
+            'budget_ms': spec['budget_ms'],
+            'within_budget': total_us / 1000 <= spec['budget_ms'] and not deferred_loaded,
+            'top': [{'module': name, 'cumulative_ms': round(us / 1000, 1)} for name, us in heaviest],
+            'deferred_loaded': deferred_loaded
+        }
+
+    return report
+
+
+def print_report(report):
+    """Affiche le rapport sous forme de tableau"""
+    for target, result in report.items():
+        status = "OK" if result['within_budget'] else "DÉPASSEMENT"
+        print(f"\n=== {target} : {result['total_ms']:.1f} ms "
+              f"(budget {result['budget_ms']} ms) [{status}]")
+        for entry in result['top']:
+            print(f"    {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+        if result['deferred_loaded']:
+            print(f"    ⚠️ modules différés chargés au démarrage : "
+                  f"{', '.join(result['deferred_loaded'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport des temps d'import au démarrage")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre d'essais par cible")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de modules affichés")
+    parser.add_argument("--json", help="Écrire le rapport JSON dans ce fichier")
+    parser.add_argument("--check", action="store_true",
+                        help="Code de sortie 1 si une cible dépasse son budget")
+    args = parser.parse_args()
+
+    report = build_report(repeat=args.repeat, top=args.top)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.check and not all(result['within_budget'] for result in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
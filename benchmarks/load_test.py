@@ -0,0 +1,521 @@
+"""
+Test de charge : N sessions d'analystes simultanées sur une instance de l'application
+
+Le script démarre un serveur Streamlit local (streamlit run app.py, sans
+navigateur) et le pilote comme le ferait le navigateur de chaque analyste :
+un client websocket par session échange les messages du protocole Streamlit
+(BackMsg / ForwardMsg). Chaque session téléverse un questionnaire synthétique,
+puis enchaîne des changements de filtres (formulaire de la barre latérale), des
+réinitialisations et des changements de section. Chaque rerun est chronométré
+de l'envoi de la requête à la fin du script ; un thread de surveillance relève
+la mémoire résidente et le temps CPU du processus serveur (/proc, Linux).
+
+Plusieurs niveaux de charge peuvent être enchaînés (--sessions 1 2 4 8) pour
+repérer le nombre de sessions à partir duquel la latence se dégrade. Chaque
+niveau dispose d'un serveur neuf (caches vides), échauffé par une session non
+mesurée qui ouvre l'application sans fichier. Tout s'exécute hors ligne, sur
+la machine locale.
+
+Dépendance : websockets (pip install -r benchmarks/requirements.txt)
+
+Usage :
+    python benchmarks/load_test.py --sessions 1 2 4 8
+    python benchmarks/load_test.py --sessions 8 --rows 100000 --steps 20 --json charge.json
+    python benchmarks/load_test.py --sessions 4 --distinct-files     # un fichier par session
+    python benchmarks/load_test.py --sessions 4 --max-p95-ms 2000    # code 1 si dépassement
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+
+import numpy as np
+import websockets
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileURLsRequest
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from synthetic import write_dataset
+
+APP_PATH = os.path.join(REPO_ROOT, 'app.py')
+
+# Clés des widgets de filtres pilotés par les sessions
+FILTER_KEYS = ['filtre_age', 'filtre_genre', 'filtre_etude', 'filtre_cohab', 'filtre_satisf']
+
+# Proportion des actions d'une session (le reste : changement de section)
+FILTER_ACTION_RATIO = 0.4
+RESET_ACTION_RATIO = 0.1
+
+# Pause entre deux actions d'un analyste (secondes, tirée uniformément)
+THINK_TIME = (0.0, 0.5)
+
+# Période d'échantillonnage de la mémoire et du CPU (secondes)
+SAMPLE_PERIOD = 0.1
+
+# Délais maximaux : démarrage du serveur et rerun (secondes)
+SERVER_START_TIMEOUT = 60
+RERUN_TIMEOUT = 600
+
+# Options du serveur local : pas de navigateur, pas de jeton XSRF pour le
+# téléversement, sessions déconnectées libérées immédiatement
+SERVER_OPTIONS = [
+    '--server.headless', 'true',
+    '--server.enableXsrfProtection', 'false',
+    '--server.enableCORS', 'false',
+    '--server.fileWatcherType', 'none',
+    '--server.disconnectedSessionTTL', '0',
+    '--browser.gatherUsageStats', 'false'
+]
+
+
+# ============================================================================
+# MESURES DU PROCESSUS SERVEUR (/proc)
+# ============================================================================
+
+def rss_bytes(pid):
+    """Mémoire résidente d'un processus (octets)"""
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def cpu_seconds(pid):
+    """Temps CPU consommé par un processus (utilisateur + système)"""
+    with open(f'/proc/{pid}/stat') as f:
+        # Le nom du processus (2e champ) peut contenir des espaces
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+class ProcessMonitor(threading.Thread):
+    """
+    Échantillonne la mémoire résidente et l'utilisation CPU d'un processus
+
+    L'utilisation CPU est exprimée en cœurs occupés (1.0 = un cœur à 100 %) ;
+    le GIL limite un serveur Streamlit à environ un cœur pour le code Python.
+
+    Args:
+        pid: Processus surveillé
+        period: Période d'échantillonnage (secondes)
+    """
+
+    def __init__(self, pid, period=SAMPLE_PERIOD):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.period = period
+        self.stopped = threading.Event()
+        self.rss = []
+        self.cpu = []
+
+    def run(self):
+        last_wall, last_cpu = time.perf_counter(), cpu_seconds(self.pid)
+        while not self.stopped.wait(self.period):
+            wall, cpu = time.perf_counter(), cpu_seconds(self.pid)
+            self.cpu.append((cpu - last_cpu) / (wall - last_wall))
+            self.rss.append(rss_bytes(self.pid))
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+# ============================================================================
+# SERVEUR LOCAL
+# ============================================================================
+
+def free_port():
+    """Port TCP libre sur la boucle locale"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class LocalServer:
+    """
+    Serveur Streamlit local exécutant app.py dans un répertoire de travail donné
+
+    Exemple :
+        with LocalServer(directory) as server:
+            ...   # server.port, server.pid
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.port = free_port()
+        self.process = None
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+             '--server.port', str(self.port), '--server.address', '127.0.0.1'] + SERVER_OPTIONS,
+            cwd=self.directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("Le serveur Streamlit s'est arrêté au démarrage")
+            try:
+                with urllib.request.urlopen(f'{self.url}/_stcore/health', timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise TimeoutError("Le serveur Streamlit n'a pas démarré à temps")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        return False
+
+
+def upload_file(url, name, content):
+    """Téléverse un fichier (requête PUT multipart, comme le navigateur)"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{name}"; filename="{name}"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    request = urllib.request.Request(url, data=body, method='PUT', headers={
+        'Content-Type': f'multipart/form-data; boundary={boundary}'
+    })
+    with urllib.request.urlopen(request, timeout=RERUN_TIMEOUT):
+        pass
+
+
+# ============================================================================
+# SESSION SIMULÉE
+# ============================================================================
+
+class SimulatedSession:
+    """
+    Un analyste : téléversement, puis actions aléatoires sur les filtres et sections
+
+    La session conserve, comme le navigateur, l'état de tous les widgets modifiés
+    et le renvoie à chaque rerun.
+
+    Args:
+        server: LocalServer
+        file_name: Nom du fichier téléversé
+        content: Contenu du fichier (bytes)
+        steps: Nombre d'actions après le téléversement
+        seed: Graine du tirage des actions
+    """
+
+    def __init__(self, server, file_name, content, steps, seed):
+        self.server = server
+        self.file_name = file_name
+        self.content = content
+        self.steps = steps
+        self.rng = random.Random(seed)
+        self.websocket = None
+        self.session_id = None
+        self.widgets = {}
+        self.widget_states = {}
+        self.samples = []
+        self.errors = []
+
+    def widget(self, suffix):
+        """Proto du widget dont l'identifiant se termine par suffix (clé)"""
+        return next(proto for widget_id, proto in self.widgets.items() if widget_id.endswith(suffix))
+
+    def button(self, text):
+        """Proto du bouton dont le libellé contient text"""
+        return next(proto for proto in self.widgets.values()
+                    if hasattr(proto, 'is_form_submitter') and text in proto.label)
+
+    async def receive(self):
+        message = ForwardMsg()
+        message.ParseFromString(await asyncio.wait_for(self.websocket.recv(), RERUN_TIMEOUT))
+        return message
+
+    def record_element(self, element):
+        """Mémorise les widgets affichés et les exceptions de l'application"""
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.errors.append(element.exception.message)
+            return
+        proto = getattr(element, kind, None)
+        widget_id = getattr(proto, 'id', None)
+        if isinstance(widget_id, str) and widget_id.startswith('$$ID'):
+            self.widgets[widget_id] = proto
+
+    async def rerun(self, action, triggers=()):
+        """
+        Lance un rerun chronométré avec l'état courant des widgets
+
+        Args:
+            action: Nom de l'action (pour les statistiques de latence)
+            triggers: Identifiants des boutons cliqués (valeur valable pour ce rerun)
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        states = message.rerun_script.widget_states.widgets
+        for state in self.widget_states.values():
+            states.add().CopyFrom(state)
+        for widget_id in triggers:
+            states.add(id=widget_id, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        while True:
+            response = await self.receive()
+            kind = response.WhichOneof('type')
+            if kind == 'new_session' and response.new_session.initialize.session_id:
+                self.session_id = response.new_session.initialize.session_id
+            elif kind == 'delta' and response.delta.WhichOneof('type') == 'new_element':
+                self.record_element(response.delta.new_element)
+            elif kind == 'script_finished' and \
+                    response.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.samples.append((action, time.perf_counter() - start))
+
+    async def upload(self):
+        """Téléverse le questionnaire dans le widget file_uploader puis relance le script"""
+        uploader_id = next(widget_id for widget_id, proto in self.widgets.items()
+                           if hasattr(proto, 'max_upload_size_mb'))
+        request = BackMsg(file_urls_request=FileURLsRequest(
+            request_id=uuid.uuid4().hex, file_names=[self.file_name], session_id=self.session_id))
+        await self.websocket.send(request.SerializeToString())
+        while True:
+            response = await self.receive()
+            if response.WhichOneof('type') == 'file_urls_response':
+                file_urls = response.file_urls_response.file_urls[0]
+                break
+
+        await asyncio.to_thread(upload_file, self.server.url + file_urls.upload_url,
+                                self.file_name, self.content)
+
+        state = WidgetState(id=uploader_id)
+        info = state.file_uploader_state_value.uploaded_file_info.add(
+            name=self.file_name, size=len(self.content), file_id=file_urls.file_id)
+        info.file_urls.CopyFrom(file_urls)
+        self.widget_states[uploader_id] = state
+        await self.rerun('téléversement')
+
+    async def change_filters(self):
+        """Tire une nouvelle sélection pour un ou deux filtres et valide le formulaire"""
+        for key in self.rng.sample(FILTER_KEYS, self.rng.randint(1, 2)):
+            proto = self.widget(f'-{key}')
+            options = list(proto.options)
+            selection = self.rng.sample(options, self.rng.randint(1, len(options)))
+            state = WidgetState(id=proto.id)
+            state.string_array_value.data[:] = [option for option in options if option in selection]
+            self.widget_states[proto.id] = state
+        await self.rerun('filtres', triggers=[self.button("Appliquer").id])
+
+    async def reset_filters(self):
+        """Clique sur « Réinitialiser les filtres » : les filtres reviennent à leur valeur par défaut"""
+        for key in FILTER_KEYS:
+            self.widget_states.pop(self.widget(f'-{key}').id, None)
+        await self.rerun('réinitialisation', triggers=[self.button("Réinitialiser").id])
+
+    async def switch_section(self):
+        """Sélectionne une autre section dans la barre de navigation"""
+        proto = self.widget('-active_section')
+        current = self.widget_states.get(proto.id)
+        options = [option for option in proto.options
+                   if current is None or option != current.string_value]
+        self.widget_states[proto.id] = WidgetState(id=proto.id, string_value=self.rng.choice(options))
+        await self.rerun('section')
+
+    async def run(self, upload=True):
+        uri = f'ws://127.0.0.1:{self.server.port}/_stcore/stream'
+        async with websockets.connect(uri, subprotocols=['streamlit'], max_size=None) as websocket:
+            self.websocket = websocket
+            await self.rerun('ouverture')
+            if not upload:
+                return
+
+            await self.upload()
+            if self.errors:
+                return
+
+            for _ in range(self.steps):
+                await asyncio.sleep(self.rng.uniform(*THINK_TIME))
+                draw = self.rng.random()
+                if draw < FILTER_ACTION_RATIO:
+                    await self.change_filters()
+                elif draw < FILTER_ACTION_RATIO + RESET_ACTION_RATIO:
+                    await self.reset_filters()
+                else:
+                    await self.switch_section()
+
+
+# ============================================================================
+# NIVEAUX DE CHARGE
+# ============================================================================
+
+def prepare_files(directory, n_rows, n_files):
+    """
+    Génère les questionnaires téléversés par les sessions
+
+    Returns:
+        Liste de (nom de fichier, contenu)
+    """
+    extension = 'xlsx' if n_rows <= 100_000 else 'csv'
+    files = []
+    for seed in range(n_files):
+        path = os.path.join(directory, f'synthetic_{n_rows}_{seed}.{extension}')
+        write_dataset(n_rows, path, seed=seed)
+        with open(path, 'rb') as f:
+            files.append((os.path.basename(path), f.read()))
+    return files
+
+
+def percentiles(durations):
+    """p50/p95/p99 et maximum (millisecondes)"""
+    values = np.array(durations) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 1),
+        'p95_ms': round(float(np.percentile(values, 95)), 1),
+        'p99_ms': round(float(np.percentile(values, 99)), 1),
+        'max_ms': round(float(values.max()), 1)
+    }
+
+
+async def run_sessions(sessions):
+    """Exécute les sessions simultanément ; une session en échec n'arrête pas les autres"""
+    outcomes = await asyncio.gather(*(session.run() for session in sessions), return_exceptions=True)
+    for session, outcome in zip(sessions, outcomes):
+        if isinstance(outcome, BaseException):
+            session.errors.append(f"{type(outcome).__name__} : {outcome}")
+
+
+def run_level(directory, n_sessions, files, steps, seed):
+    """
+    Lance n_sessions sessions simultanées sur un serveur neuf et agrège leurs mesures
+
+    Returns:
+        Dict des latences (globales et par action), du débit, de la mémoire et du CPU
+    """
+    with LocalServer(directory) as server:
+        # Échauffement non mesuré : imports et première exécution du script
+        asyncio.run(SimulatedSession(server, *files[0], steps=0, seed=seed).run(upload=False))
+        baseline_rss = rss_bytes(server.pid)
+
+        sessions = [SimulatedSession(server, *files[i % len(files)], steps=steps, seed=seed + i)
+                    for i in range(n_sessions)]
+
+        monitor = ProcessMonitor(server.pid)
+        monitor.start()
+        start = time.perf_counter()
+        asyncio.run(run_sessions(sessions))
+        elapsed = time.perf_counter() - start
+        monitor.stop()
+
+    # Ouverture et téléversement (lecture et préparation du fichier) sont rapportés à part
+    samples = [sample for session in sessions for sample in session.samples]
+    interactive = [duration for action, duration in samples if action not in ('ouverture', 'téléversement')]
+    by_action = {}
+    for action, duration in samples:
+        by_action.setdefault(action, []).append(duration)
+
+    peak_rss = max(monitor.rss, default=baseline_rss)
+    return {
+        'sessions': n_sessions,
+        'reruns': len(samples),
+        'elapsed_s': round(elapsed, 2),
+        'reruns_per_s': round(len(samples) / elapsed, 2),
+        'latency': percentiles(interactive) if interactive else None,
+        'latency_by_action': {action: dict(percentiles(durations), count=len(durations))
+                              for action, durations in by_action.items()},
+        'rss_baseline_mb': round(baseline_rss / 2**20, 1),
+        'rss_peak_mb': round(peak_rss / 2**20, 1),
+        'rss_per_session_mb': round((peak_rss - baseline_rss) / n_sessions / 2**20, 1),
+        'cpu_mean_cores': round(float(np.mean(monitor.cpu)), 2) if monitor.cpu else 0.0,
+        'cpu_peak_cores': round(float(np.max(monitor.cpu)), 2) if monitor.cpu else 0.0,
+        'errors': [error for session in sessions for error in session.errors]
+    }
+
+
+def print_results(results):
+    """Affiche un tableau par niveau de charge"""
+    print(f"\n{'Sessions':>8}{'Reruns/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'Téléversement p95':>19}{'RSS/session':>13}{'CPU moy.':>10}{'CPU max':>9}")
+    for result in results:
+        latency = result['latency'] or {'p50_ms': 0, 'p95_ms': 0, 'p99_ms': 0}
+        upload = result['latency_by_action'].get('téléversement', {}).get('p95_ms', 0)
+        print(f"{result['sessions']:>8}{result['reruns_per_s']:>10.2f}{latency['p50_ms']:>10.0f}"
+              f"{latency['p95_ms']:>10.0f}{latency['p99_ms']:>10.0f}{upload:>16.0f} ms"
+              f"{result['rss_per_session_mb']:>10.1f} Mo{result['cpu_mean_cores']:>10.2f}"
+              f"{result['cpu_peak_cores']:>9.2f}")
+        for error in result['errors'][:5]:
+            print(f"    ⚠️ {error}")
+
+    print(f"\nCPU du serveur en cœurs occupés ({os.cpu_count()} disponibles) ; "
+          "latences hors ouverture et téléversement.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de l'application (sessions simultanées)")
+    parser.add_argument("--sessions", type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Nombres de sessions simultanées, un niveau de charge par valeur")
+    parser.add_argument("--rows", type=int, default=10_000, help="Participants par fichier téléversé")
+    parser.add_argument("--steps", type=int, default=10, help="Actions par session après le téléversement")
+    parser.add_argument("--distinct-files", action="store_true",
+                        help="Un fichier différent par session (sinon toutes téléversent le même)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Écrire les résultats JSON dans ce fichier")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Code de sortie 1 si la latence p95 d'un niveau dépasse ce seuil")
+    args = parser.parse_args()
+
+    # Répertoire de travail du serveur sans fichier local : les sessions doivent téléverser
+    with tempfile.TemporaryDirectory(prefix="load_test_") as directory:
+        n_files = max(args.sessions) if args.distinct_files else 1
+        print(f"Génération de {n_files} fichier(s) de {args.rows} participants...", flush=True)
+        files = prepare_files(directory, args.rows, n_files)
+
+        results = []
+        for n_sessions in args.sessions:
+            print(f"{n_sessions} session(s)...", flush=True)
+            results.append(run_level(directory, n_sessions, files, args.steps, args.seed))
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'rows': args.rows, 'steps': args.steps, 'distinct_files': args.distinct_files,
+                       'cpu_count': os.cpu_count(), 'levels': results}, f, indent=2, ensure_ascii=False)
+
+    failed = any(result['errors'] for result in results)
+    if args.max_p95_ms is not None:
+        failed |= any(result['latency'] and result['latency']['p95_ms'] > args.max_p95_ms
+                      for result in results)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
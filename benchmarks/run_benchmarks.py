@@ -0,0 +1,297 @@
+"""
+Suite de benchmarks du cœur analytique sur des questionnaires synthétiques
+
+Pour chaque taille, un fichier synthétique est généré (une fois, dans
+benchmarks/data/) puis la suite chronomètre le chargement, le labellisage, le
+filtrage, chaque fonction de statistiques (sans cache) et chaque constructeur de
+graphique create_*. Les résultats sont enregistrés en JSON dans
+benchmarks/results/ ; --compare signale les régressions par rapport à un
+résultat précédent.
+
+Usage :
+    python benchmarks/run_benchmarks.py                          # 100 à 100 000 lignes
+    python benchmarks/run_benchmarks.py --sizes 100 1000000 10000000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json --check
+    python benchmarks/run_benchmarks.py --output benchmarks/results/baseline.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from config import *
+from analytics import processing
+from analytics.cache import NullCache, set_cache_backend
+import visualizations
+from synthetic import EXCEL_MAX_ROWS, write_dataset
+
+DATA_DIR = os.path.join(BENCHMARKS_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+DEFAULT_SIZES = [100, 1000, 10_000, 100_000]
+
+# Au-delà, les fichiers sont générés en CSV (écriture Excel trop lente)
+EXCEL_BENCHMARK_MAX_ROWS = 100_000
+
+# Ratio de temps à partir duquel une mesure est signalée comme régression
+REGRESSION_RATIO = 1.5
+
+# Les mesures plus courtes sont trop bruitées pour être comparées
+MIN_COMPARABLE_SECONDS = 0.005
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+
+# ============================================================================
+# CAS MESURÉS
+# ============================================================================
+
+def processing_cases(df):
+    """
+    Appels mesurés des fonctions de traitement (versions sans cache)
+
+    Returns:
+        Liste de (nom, fonction sans argument)
+    """
+    p = processing
+    return [
+        ('filter_data/aucun', lambda: p.filter_data(df, {})),
+        ('filter_data/genre', lambda: p.filter_data(df, {'Genre': [1]})),
+        ('filter_data/tous', lambda: p.filter_data(
+            df, {'Age': [2], 'Genre': [1, 2], 'Etude': [2, 3, 4], 'Item6': [2], 'Item7': [3, 4]}, (6, 60))),
+        ('calculate_kpis', lambda: p.calculate_kpis(df)),
+        ('get_item_statistics', lambda: p.get_item_statistics.uncached(df, ITEMS_ESTIME_SOI['items'])),
+        ('calculate_dimension_stats', lambda: p.calculate_dimension_stats.uncached(df)),
+        ('get_correlation_matrix', lambda: p.get_correlation_matrix.uncached(df)),
+        ('get_item_correlations', lambda: p.get_item_correlations.uncached(df)),
+        ('get_item_cluster_order', lambda: p.get_item_cluster_order.uncached(df)),
+        ('get_grouped_statistics', lambda: p.get_grouped_statistics.uncached(df, 'Genre_label', TOTALS)),
+        ('calculate_item_means', lambda: p.calculate_item_means.uncached(df, ITEMS_ESTIME_SOI)),
+        ('calculate_averages_by_filters', lambda: p.calculate_averages_by_filters.uncached(df)),
+        ('get_demographic_summary', lambda: p.get_demographic_summary(df)),
+        ('get_satisfaction_groups', lambda: p.get_satisfaction_groups(df))
+    ]
+
+
+def figure_cases(df):
+    """
+    Appels mesurés des constructeurs de graphiques, avec les entrées de l'application
+
+    Returns:
+        Liste de (nom, fonction sans argument)
+    """
+    v = visualizations
+    etude_dist = df['Etude_label'].value_counts().reset_index()
+    etude_dist.columns = ['Niveau', 'Nombre']
+    genre_dist = df['Genre_label'].value_counts().reset_index()
+    genre_dist.columns = ['Genre', 'Nombre']
+    corr = processing.get_correlation_matrix.uncached(df)
+    item_corr, item_p = processing.get_item_correlations.uncached(df)
+    item_order = processing.get_item_cluster_order.uncached(df)
+    means_es = processing.calculate_item_means.uncached(df, ITEMS_ESTIME_SOI).sort_values()
+    grouped = df.groupby('Genre_label')[TOTALS].mean().reset_index()
+    grouped_stats = processing.get_grouped_statistics.uncached(df, 'Genre_label', TOTALS)
+    dimension_means = df[TOTALS].mean()
+    duree_means = df.groupby('Item5')['Total ES'].mean().reset_index()
+
+    return [
+        ('create_bar_chart', lambda: v.create_bar_chart(etude_dist, 'Niveau', 'Nombre', 'Études')),
+        ('create_histogram', lambda: v.create_histogram(df, 'Total ES', 'ES', nbins=15)),
+        ('create_box_plot', lambda: v.create_box_plot(df, 'Etude_label', 'Total ES', 'ES')),
+        ('create_violin_plot', lambda: v.create_violin_plot(df, 'Genre_label', 'Total ES', 'ES')),
+        ('create_scatter_plot', lambda: v.create_scatter_plot(
+            df, 'Total valo', 'Total ES', 'Valo vs ES', color='Genre_label', trendline='ols')),
+        ('create_correlation_heatmap', lambda: v.create_correlation_heatmap(corr)),
+        ('create_item_correlation_heatmap', lambda: v.create_item_correlation_heatmap(
+            item_corr, item_p, item_order, 'Items')),
+        ('create_grouped_bar_chart', lambda: v.create_grouped_bar_chart(
+            grouped, 'Genre_label', TOTALS, 'Scores par genre')),
+        ('create_radar_chart', lambda: v.create_radar_chart(
+            df, list(dimension_means.index), dimension_means.values, 'Profil')),
+        ('create_sunburst', lambda: v.create_sunburst(df, ['Genre_label', 'Age_label'], 'Total ES', 'Sunburst')),
+        ('create_distribution_comparison', lambda: v.create_distribution_comparison(
+            df, 'Total ES', 'Genre_label', 'ES par genre')),
+        ('create_item_means_chart', lambda: v.create_item_means_chart(
+            means_es, 'Items ES', ITEMS_ESTIME_SOI_LABELS)),
+        ('create_parallel_coordinates', lambda: v.create_parallel_coordinates(
+            df, TOTALS, 'Total ES', 'Profils')),
+        ('create_line_chart', lambda: v.create_line_chart(duree_means, 'Item5', 'Total ES', 'ES selon la durée')),
+        ('create_stacked_bar', lambda: v.create_stacked_bar(grouped, 'Genre_label', TOTALS, 'Scores')),
+        ('create_pie_chart', lambda: v.create_pie_chart(genre_dist, 'Genre', 'Nombre', 'Genre')),
+        ('create_multi_scatter_matrix', lambda: v.create_multi_scatter_matrix(
+            df, TOTALS, 'Genre_label', 'Dimensions')),
+        ('create_comparison_table_figure', lambda: v.create_comparison_table_figure(grouped_stats, 'Table')),
+        ('create_dimension_overview', lambda: v.create_dimension_overview(df))
+    ]
+
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+def dataset_path(n_rows):
+    """Fichier synthétique d'une taille donnée (généré s'il n'existe pas)"""
+    extension = 'xlsx' if n_rows <= min(EXCEL_BENCHMARK_MAX_ROWS, EXCEL_MAX_ROWS) else 'csv'
+    path = os.path.join(DATA_DIR, f'synthetic_{n_rows}.{extension}')
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        print(f"  génération de {os.path.basename(path)}...", flush=True)
+        write_dataset(n_rows, path)
+    return path
+
+
+def best_time(func, repeat):
+    """Meilleur temps (secondes) sur repeat exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_size(n_rows, repeat, include_figures=True):
+    """
+    Mesure toute la suite pour une taille
+
+    Returns:
+        Dict {mesure: secondes}
+    """
+    path = dataset_path(n_rows)
+    # Les grandes tailles ne sont mesurées qu'une fois
+    repeat = repeat if n_rows <= 100_000 else 1
+
+    timings = {}
+    timings['load_data'] = best_time(lambda: processing.load_data.uncached(path), min(repeat, 2))
+    df_raw = processing.load_data.uncached(path)
+    timings['apply_labels'] = best_time(lambda: processing.apply_labels.uncached(df_raw), repeat)
+    df = processing.apply_labels.uncached(df_raw)
+
+    cases = processing_cases(df) + (figure_cases(df) if include_figures else [])
+    for name, func in cases:
+        func()  # échauffement (imports différés)
+        timings[name] = best_time(func, repeat)
+
+    return timings
+
+
+def environment():
+    """Description de l'environnement de mesure"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def compare(results, baseline):
+    """
+    Compare deux résultats
+
+    Returns:
+        Liste de (taille, mesure, secondes de référence, secondes, ratio) pour
+        les mesures plus lentes que REGRESSION_RATIO
+    """
+    regressions = []
+    for size, timings in results['timings'].items():
+        reference = baseline['timings'].get(size, {})
+        for name, seconds in timings.items():
+            before = reference.get(name)
+            if before is None or max(before, seconds) < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = seconds / before
+            if ratio > REGRESSION_RATIO:
+                regressions.append((size, name, before, seconds, ratio))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    """Affiche les temps (ms) par mesure et par taille"""
+    sizes = list(results['timings'])
+    names = list(dict.fromkeys(name for timings in results['timings'].values() for name in timings))
+
+    print(f"\n{'Mesure (ms)':<34}" + "".join(f"{int(size):>12,}".replace(',', ' ') for size in sizes))
+    for name in names:
+        row = f"{name:<34}"
+        for size in sizes:
+            seconds = results['timings'][size].get(name)
+            cell = f"{seconds * 1000:.1f}" if seconds is not None else "-"
+            if baseline is not None and seconds is not None:
+                before = baseline['timings'].get(size, {}).get(name)
+                if before and max(before, seconds) >= MIN_COMPARABLE_SECONDS and seconds / before > REGRESSION_RATIO:
+                    cell = "⚠" + cell
+            row += f"{cell:>12}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du cœur analytique")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Nombres de participants (100 à 10 000 000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Essais par mesure (meilleur temps)")
+    parser.add_argument("--no-figures", action="store_true", help="Ne pas mesurer les graphiques")
+    parser.add_argument("--output", help="Fichier JSON de résultats "
+                                         "(défaut : benchmarks/results/<date>.json)")
+    parser.add_argument("--compare", help="Résultat de référence (JSON)")
+    parser.add_argument("--check", action="store_true",
+                        help="Code de sortie 1 en cas de régression par rapport à --compare")
+    args = parser.parse_args()
+
+    # Mesures sans cache : chaque appel recalcule
+    set_cache_backend(NullCache())
+
+    results = {'environment': environment(), 'timings': {}}
+    for n_rows in args.sizes:
+        print(f"{n_rows} lignes", flush=True)
+        results['timings'][str(n_rows)] = run_size(n_rows, args.repeat, not args.no_figures)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline)
+        for size, name, before, seconds, ratio in regressions:
+            print(f"⚠️ {name} ({size} lignes) : {before * 1000:.1f} ms -> {seconds * 1000:.1f} ms (x{ratio:.2f})")
+        if args.check and regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
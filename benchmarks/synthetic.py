@@ -0,0 +1,212 @@
+"""
+Générateur de questionnaires synthétiques (même format que le fichier réel)
+
+Le jeu de données réel est privé : ce module produit des fichiers au format
+attendu par l'application (39 colonnes, deux lignes d'en-tête) à partir de traits
+latents corrélés (estime de soi, valorisation, manque de reconnaissance, gestion
+des conflits, satisfaction). Les items inversés de config.py sont générés en
+sens inverse et rétablis dans les totaux, comme dans la cotation du questionnaire.
+
+Usage :
+    python benchmarks/synthetic.py 1000 data.xlsx
+    python benchmarks/synthetic.py 10000000 data.csv       # au-delà de la limite Excel
+    python benchmarks/synthetic.py 10000000 data.parquet   # nécessite pyarrow
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+
+# Nombre maximal de lignes de données dans une feuille Excel (2 lignes d'en-tête)
+EXCEL_MAX_ROWS = 1_048_576 - 2
+
+# Lignes générées et écrites par bloc (mémoire bornée pour les grands volumes)
+CHUNK_ROWS = 500_000
+
+# Traits latents et corrélations entre eux
+LATENT_TRAITS = ['ES', 'Valorisation', 'MR', 'GC', 'Satisfaction']
+
+LATENT_CORRELATIONS = np.array([
+    #  ES     Valo    MR     GC    Satisf
+    [1.00,  0.40, -0.35,  0.30,  0.25],
+    [0.40,  1.00, -0.55,  0.45,  0.50],
+    [-0.35, -0.55, 1.00, -0.40, -0.45],
+    [0.30,  0.45, -0.40,  1.00,  0.40],
+    [0.25,  0.50, -0.45,  0.40,  1.00]
+])
+
+# Dimensions : (configuration des items, labels, nombre de modalités, trait latent)
+DIMENSIONS = [
+    (ITEMS_ESTIME_SOI, ITEMS_ESTIME_SOI_LABELS, 4, 'ES'),
+    (ITEMS_VALORISATION, ITEMS_VALORISATION_LABELS, 5, 'Valorisation'),
+    (ITEMS_MANQUE_RECONNAISSANCE, ITEMS_MANQUE_RECONNAISSANCE_LABELS, 5, 'MR'),
+    (ITEMS_GESTION_CONFLITS, ITEMS_GESTION_CONFLITS_LABELS, 5, 'GC')
+]
+
+# Seuils (échelle normale centrée réduite) entre modalités successives
+THRESHOLDS = {
+    4: np.array([-1.4, -0.4, 0.7]),
+    5: np.array([-1.5, -0.6, 0.3, 1.2])
+}
+
+# Saturation des items par leur trait latent
+ITEM_LOADING = 0.75
+
+SECTION_TITLES = [
+    ('Variables sociodémographiques', 4),
+    ('Variables relationnelles', 4),
+    (ITEMS_ESTIME_SOI['description'], 11),
+    (ITEMS_VALORISATION['description'], 6),
+    (ITEMS_MANQUE_RECONNAISSANCE['description'], 7),
+    (ITEMS_GESTION_CONFLITS['description'], 7)
+]
+
+
+# ============================================================================
+# GÉNÉRATION
+# ============================================================================
+
+def reversed_items(labels):
+    """Items cotés en sens inverse (mention « (inversé) » dans config.py)"""
+    return {item for item, label in labels.items() if '(inversé)' in label}
+
+
+def ordinal(values, n_levels):
+    """Discrétise des scores continus en modalités 1..n_levels"""
+    return (np.searchsorted(THRESHOLDS[n_levels], values) + 1).astype(np.int8)
+
+
+def generate_dataset(n_rows, seed=0, start_id=1):
+    """
+    Génère un questionnaire synthétique
+
+    Args:
+        n_rows: Nombre de participants
+        seed: Graine du générateur aléatoire
+        start_id: Premier identifiant de participant
+
+    Returns:
+        DataFrame aux 39 colonnes du fichier réel (noms de la deuxième ligne d'en-tête)
+    """
+    rng = np.random.default_rng(seed)
+    latent = rng.multivariate_normal(np.zeros(len(LATENT_TRAITS)), LATENT_CORRELATIONS,
+                                     size=n_rows, method='cholesky')
+    traits = dict(zip(LATENT_TRAITS, latent.T))
+
+    columns = {
+        'id_participants': np.arange(start_id, start_id + n_rows, dtype=np.int64),
+        'Age': rng.choice([1, 2], size=n_rows, p=[0.45, 0.55]).astype(np.int8),
+        'Genre': rng.choice([1, 2, 3], size=n_rows, p=[0.62, 0.34, 0.04]).astype(np.int8),
+        'Etude': rng.choice([1, 2, 3, 4, 5], size=n_rows, p=[0.08, 0.30, 0.25, 0.22, 0.15]).astype(np.int8)
+    }
+
+    # Variables relationnelles : durée (mois) log-normale, cohabitation plus
+    # fréquente dans les relations longues, satisfaction liée au trait latent
+    duree = np.clip(np.round(rng.lognormal(np.log(14), 0.9, n_rows)), 1, 120).astype(np.int16)
+    columns['Item4'] = rng.choice([1, 2], size=n_rows, p=[0.9, 0.1]).astype(np.int8)
+    columns['Item5'] = duree
+    columns['Item6'] = np.where(rng.random(n_rows) < np.clip(duree / 60, 0.05, 0.8), 1, 2).astype(np.int8)
+    columns['Item7'] = ordinal(traits['Satisfaction'] + 0.3, 4)
+
+    for items_config, labels, n_levels, trait in DIMENSIONS:
+        inverted = reversed_items(labels)
+        total = np.zeros(n_rows, dtype=np.int16)
+        for item in items_config['items']:
+            noise = rng.normal(0, np.sqrt(1 - ITEM_LOADING ** 2), n_rows)
+            score = ordinal(ITEM_LOADING * traits[trait] + noise + rng.normal(0, 0.2), n_levels)
+            total += score
+            # Réponse brute : les items inversés sont formulés négativement
+            columns[item] = (n_levels + 1 - score).astype(np.int8) if item in inverted else score
+        columns[items_config['total']] = total
+
+    return pd.DataFrame(columns)
+
+
+# ============================================================================
+# ÉCRITURE
+# ============================================================================
+
+def header_rows(columns):
+    """Les deux lignes d'en-tête du fichier : titres de sections puis noms des colonnes"""
+    sections = []
+    for title, width in SECTION_TITLES:
+        sections += [title] + [''] * (width - 1)
+    return [sections, list(columns)]
+
+
+def write_dataset(n_rows, path, seed=0):
+    """
+    Génère et écrit un questionnaire synthétique
+
+    Le format suit l'extension : .xlsx (deux lignes d'en-tête, limité à
+    EXCEL_MAX_ROWS lignes), .csv (deux lignes d'en-tête, écrit par blocs) ou
+    .parquet (une ligne d'en-tête, nécessite pyarrow).
+
+    Args:
+        n_rows: Nombre de participants
+        path: Fichier de sortie
+        seed: Graine du générateur aléatoire
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.xlsx':
+        if n_rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel est limité à {EXCEL_MAX_ROWS} lignes : utilisez .csv ou .parquet")
+        df = generate_dataset(n_rows, seed)
+        sections, names = header_rows(df.columns)
+        # Première ligne du fichier = titres de sections, deuxième = noms des colonnes
+        out = pd.DataFrame(df.to_numpy(), columns=names)
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame([names], columns=sections).to_excel(writer, index=False)
+            out.to_excel(writer, index=False, header=False, startrow=2)
+
+    elif extension == '.csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for start in range(0, n_rows, CHUNK_ROWS):
+                chunk = generate_dataset(min(CHUNK_ROWS, n_rows - start), seed + start, start + 1)
+                if start == 0:
+                    for row in header_rows(chunk.columns):
+                        f.write(','.join(row) + '\n')
+                chunk.to_csv(f, index=False, header=False)
+
+    elif extension == '.parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for start in range(0, max(n_rows, 1), CHUNK_ROWS):
+                chunk = generate_dataset(min(CHUNK_ROWS, n_rows - start), seed + start, start + 1)
+                # Mêmes types que la lecture d'un fichier Excel (entiers 64 bits)
+                table = pa.Table.from_pandas(chunk.astype('int64'), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    else:
+        raise ValueError(f"Format non pris en charge : {extension} (.xlsx, .csv ou .parquet)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un questionnaire synthétique")
+    parser.add_argument("rows", type=int, help="Nombre de participants")
+    parser.add_argument("output", help="Fichier de sortie (.xlsx, .csv ou .parquet)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_dataset(args.rows, args.output, args.seed)
+    print(f"{args.rows} participants écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
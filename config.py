@@ -2,6 +2,9 @@
 Configuration et mappings pour l'application d'analyse des relations amoureuses
 """
 
+import json
+import os
+
 # ============================================================================
 # MAPPINGS DES VARIABLES CATÉGORIELLES
 # ============================================================================
@@ -42,7 +45,16 @@ SATISFACTION_LABELS = {
     4: "Très satisfaisante"
 }
 
-# Échelle de Likert 5 points (pour Items 8-17 et autres items psychométriques)
+# Regroupement binaire de la satisfaction relationnelle (Item 7)
+SATISFACTION_GROUP_LABELS = {
+    1: "Insatisfait",
+    2: "Insatisfait",
+    3: "Satisfait",
+    4: "Satisfait"
+}
+
+# Échelle de Likert 5 points (pour les Items 18-34 : valorisation, manque de
+# reconnaissance, gestion des conflits)
 LIKERT_5_LABELS = {
     1: "Pas du tout d'accord",
     2: "Plutôt pas d'accord",
@@ -51,7 +63,8 @@ LIKERT_5_LABELS = {
     5: "Tout à fait d'accord"
 }
 
-# Échelle de Likert 4 points (pour Item 7 - Satisfaction)
+# Échelle de Likert 4 points (pour Item 7 - Satisfaction et les Items 8-17 de
+# l'échelle de Rosenberg)
 LIKERT_4_LABELS = {
     1: "Tout à fait en désaccord",
     2: "Plutôt en désaccord",
@@ -69,7 +82,8 @@ ITEMS_ESTIME_SOI = {
               'Item 13', 'Item 14', 'Item 15', 'Item 16', 'Item 17'],
     'total': 'Total ES',
     'description': 'Estime de Soi (Rosenberg)',
-    'short_name': 'ES'
+    'short_name': 'ES',
+    'scale': LIKERT_4_LABELS
 }
 
 ITEMS_ESTIME_SOI_LABELS = {
@@ -90,7 +104,8 @@ ITEMS_VALORISATION = {
     'items': ['Item 18', 'Item 19', 'Item 20', 'Item21', 'Item 22'],
     'total': 'Total valo',
     'description': 'Valorisation dans la relation',
-    'short_name': 'Valorisation'
+    'short_name': 'Valorisation',
+    'scale': LIKERT_5_LABELS
 }
 
 ITEMS_VALORISATION_LABELS = {
@@ -106,7 +121,8 @@ ITEMS_MANQUE_RECONNAISSANCE = {
     'items': ['Item 23', 'Item 24', 'Item 25', 'Item 26', 'Item 27', 'Item 28'],
     'total': 'Total MR',
     'description': 'Manque de Reconnaissance',
-    'short_name': 'MR'
+    'short_name': 'MR',
+    'scale': LIKERT_5_LABELS
 }
 
 ITEMS_MANQUE_RECONNAISSANCE_LABELS = {
@@ -123,7 +139,8 @@ ITEMS_GESTION_CONFLITS = {
     'items': ['Item 29', 'Item 30', 'Item 31', 'Item 32', 'Item 33', 'Item 34'],
     'total': 'Total GC',
     'description': 'Gestion des Conflits',
-    'short_name': 'GC'
+    'short_name': 'GC',
+    'scale': LIKERT_5_LABELS
 }
 
 ITEMS_GESTION_CONFLITS_LABELS = {
@@ -192,6 +209,22 @@ COLORS_AGE = {
     '20-25 ans': '#8c564b'
 }
 
+# Échelles divergentes des réponses de Likert (désaccord -> accord)
+COLORS_LIKERT_4 = {
+    1: '#d7301f',
+    2: '#fc8d59',
+    3: '#91bfdb',
+    4: '#4575b4'
+}
+
+COLORS_LIKERT_5 = {
+    1: '#d7301f',
+    2: '#fc8d59',
+    3: '#d9d9d9',
+    4: '#91bfdb',
+    5: '#4575b4'
+}
+
 # ============================================================================
 # PARAMÈTRES PLOTLY
 # ============================================================================
@@ -211,6 +244,100 @@ PLOTLY_CONFIG = {
 
 PLOTLY_LAYOUT_TEMPLATE = 'plotly_white'
 
+# ============================================================================
+# BUDGETS MÉMOIRE
+# ============================================================================
+
+# Budget global du processus (Mo) : jeux de données chargés + résultats en cache.
+# Le cache de résultats se contente de ce que les jeux de données laissent libre.
+MEMORY_BUDGET_MB = int(os.environ.get('ANALYSE_MEMORY_BUDGET_MB', 2048))
+
+# Budget par session (Mo) : taille maximale en mémoire d'un jeu de données
+# chargé par un utilisateur
+SESSION_MEMORY_BUDGET_MB = int(os.environ.get('ANALYSE_SESSION_MEMORY_BUDGET_MB', 256))
+
+# Répertoire partagé entre processus (plusieurs serveurs Streamlit sur une même
+# machine) : les jeux de données y sont écrits une fois puis mappés en mémoire en
+# lecture seule par les autres processus. None = chaque processus garde sa copie.
+SHARED_DATA_DIR = os.environ.get('ANALYSE_SHARED_DATA_DIR') or None
+
+# ============================================================================
+# RÉSULTATS PROGRESSIFS
+# ============================================================================
+
+# À partir de ce nombre de participants, les indicateurs, le tableau des
+# moyennes et les comparaisons de groupes s'affichent d'abord sous forme
+# d'estimations (échantillon stratifié, IC 95 %), remplacées par les valeurs
+# exactes dès qu'elles sont calculées
+PROGRESSIVE_MIN_ROWS = int(os.environ.get('ANALYSE_PROGRESSIVE_MIN_ROWS', 200_000))
+
+# Taille de l'échantillon stratifié (Genre x Âge x Études)
+PROGRESSIVE_SAMPLE_SIZE = 20_000
+
+# Délai (secondes) laissé au calcul exact avant d'afficher l'estimation : un
+# résultat en cache ou rapide s'affiche directement
+PROGRESSIVE_GRACE_SECONDS = 0.3
+
+# ============================================================================
+# TÂCHES EN ARRIÈRE-PLAN
+# ============================================================================
+
+# Processus du pool qui exécute les analyses longues (bootstrap...)
+JOB_WORKERS = int(os.environ.get('ANALYSE_JOB_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Répertoire où les résultats des tâches terminées sont conservés et retrouvés
+# après un redémarrage du serveur. None = résultats gardés en mémoire seulement.
+JOB_RESULTS_DIR = os.environ.get('ANALYSE_JOB_RESULTS_DIR') or None
+
+# Intervalle (secondes) de rafraîchissement de l'avancement d'une tâche
+JOB_POLL_SECONDS = 1.0
+
+# ============================================================================
+# PONDÉRATION
+# ============================================================================
+
+# Colonne des poids de redressement (fournie par le fichier ou calculée au
+# chargement à partir des marges cibles)
+WEIGHT_COLUMN = 'Poids'
+
+# Marges cibles du redressement (raking sur Genre x Âge x Études), en JSON :
+# {"Genre": {"1": 0.5, "2": 0.48, "3": 0.02}, "Age": {...}, "Etude": {...}}
+# Les proportions de chaque variable sont renormalisées. None = pas de
+# redressement (les poids éventuels du fichier sont conservés).
+WEIGHTING_MARGINS = (
+    {col: {int(code): float(share) for code, share in targets.items()}
+     for col, targets in json.loads(os.environ['ANALYSE_WEIGHTING_MARGINS']).items()}
+    if os.environ.get('ANALYSE_WEIGHTING_MARGINS') else None
+)
+
+# Itérations maximales et tolérance (écart relatif aux marges) du raking
+RAKING_MAX_ITER = 50
+RAKING_TOLERANCE = 1e-6
+
+# ============================================================================
+# COMPARAISON DE VAGUES
+# ============================================================================
+
+# Colonne qui identifie la vague (semestre de collecte) dans les vagues empilées
+WAVE_COLUMN = 'Vague'
+
+# Fichiers de vagues lus en parallèle
+WAVE_LOAD_WORKERS = min(4, os.cpu_count() or 1)
+
+# Identifiant d'un répondant, commun aux vagues (suivi longitudinal)
+PARTICIPANT_ID_COLUMN = 'id_participants'
+
+# Seuils conventionnels de Cohen pour qualifier la taille d'effet |g|
+EFFECT_SIZE_THRESHOLDS = [(0.2, "Négligeable"), (0.5, "Petit"), (0.8, "Moyen"), (float('inf'), "Grand")]
+
+# ============================================================================
+# MODE DÉVELOPPEUR
+# ============================================================================
+
+# Panneau de profilage des reruns dans la barre latérale (aussi activable par
+# le paramètre d'URL ?dev=1)
+DEV_MODE = os.environ.get('ANALYSE_DEV_MODE') == '1'
+
 # ============================================================================
 # TEXTES ET DESCRIPTIONS
 # ============================================================================
@@ -246,4 +373,13 @@ DESCRIPTION_DIMENSIONS = {
     Évalue la qualité de la communication et de la résolution des désaccords dans le couple.
     Score de 6 à 30 (6 items). Plus le score est élevé, meilleure est la gestion des conflits.
     """
-}
\ No newline at end of file
+}
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+
+# Le module est importé par "from config import *" : seules les constantes
+# (noms en majuscules) sont exportées, pas les modules json et os
+__all__ = [name for name in list(globals()) if name.isupper()]
@@ -0,0 +1,32 @@
+"""
+Jeux de données de test : questionnaires synthétiques (benchmarks/synthetic.py)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from synthetic import generate_dataset
+from analytics import NullCache, apply_labels, set_cache_backend
+
+
+@pytest.fixture(autouse=True, scope='session')
+def no_cache():
+    """Chaque appel calcule son résultat : les tests ne dépendent pas du cache"""
+    set_cache_backend(NullCache())
+
+
+@pytest.fixture(scope='session')
+def survey():
+    """Questionnaire labellisé de 2000 participants, avec quelques valeurs manquantes"""
+    df = generate_dataset(2000, seed=1).astype({'Item 9': 'float64', 'Total ES': 'float64'})
+    rng = np.random.default_rng(1)
+    df.loc[rng.choice(len(df), 40, replace=False), 'Item 9'] = np.nan
+    df.loc[rng.choice(len(df), 25, replace=False), 'Total ES'] = np.nan
+    return apply_labels.uncached(df)
@@ -0,0 +1,180 @@
+"""
+Tests du cache de résultats : clés de contenu, éviction LRU par taille et
+statistiques par fonction
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.cache import (
+    MISSING,
+    MemoryCache,
+    NullCache,
+    cached,
+    fingerprint,
+    get_cache_stats,
+    make_key,
+    reset_cache_stats,
+    set_cache_backend
+)
+
+
+@pytest.fixture
+def memory_cache():
+    """Cache mémoire actif le temps d'un test"""
+    cache = MemoryCache()
+    previous = set_cache_backend(cache)
+    yield cache
+    set_cache_backend(previous)
+
+
+def frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'a': rng.normal(size=50), 'b': rng.integers(0, 5, 50)})
+
+
+def mean_of(df, column='a', weighted=False):
+    return df[column].mean()
+
+
+# ============================================================================
+# CLÉS DE CONTENU
+# ============================================================================
+
+def test_content_keys():
+    # Même contenu, objets distincts : même empreinte
+    assert fingerprint(frame()) == fingerprint(frame())
+    assert fingerprint(frame()) != fingerprint(frame(1))
+    assert fingerprint(frame()) != fingerprint(frame().astype({'b': 'float64'}))
+    assert fingerprint({'x': [1, 2], 'y': None}) == fingerprint({'y': None, 'x': [1, 2]})
+    assert fingerprint({1, 2, 3}) == fingerprint({3, 2, 1})
+    assert fingerprint(np.arange(4)) != fingerprint(np.arange(4).reshape(2, 2))
+
+
+def test_keys_bind_the_signature():
+    df = frame()
+    key = make_key(mean_of, (df,), {})
+
+    assert make_key(mean_of, (df, 'a'), {}) == key
+    assert make_key(mean_of, (df,), {'weighted': False}) == key
+    assert make_key(mean_of, (frame(),), {'column': 'a'}) == key
+    assert make_key(mean_of, (df, 'b'), {}) != key
+    assert key.startswith(f"{__name__}.mean_of:")
+
+
+def test_cached_function(memory_cache):
+    calls = []
+
+    @cached
+    def total(df, column):
+        calls.append(column)
+        return df[column].sum()
+
+    assert total(frame(), 'a') == total(frame(), column='a')
+    assert calls == ['a']
+
+    total.clear_cache()
+    total(frame(), 'a')
+    assert calls == ['a', 'a']
+    assert total.uncached(frame(), 'b') == frame()['b'].sum() and calls[-1] == 'b'
+    assert len(memory_cache) == 1
+
+
+# ============================================================================
+# ÉVICTION
+# ============================================================================
+
+def test_lru_eviction_by_bytes():
+    block = np.zeros(1000)
+    cache = MemoryCache(max_bytes=3 * block.nbytes)
+    for key in 'abc':
+        cache.set(key, block.copy())
+    assert cache.nbytes == 3 * block.nbytes
+
+    cache.get('a')
+    cache.set('d', block.copy())
+    assert cache.get('b') is MISSING
+    assert all(cache.get(key) is not MISSING for key in 'acd')
+
+    # Plus gros que le budget entier : jamais conservé
+    cache.set('e', np.zeros(4000))
+    assert cache.get('e') is MISSING and cache.nbytes == 3 * block.nbytes
+
+
+def test_resize_evicts_oldest():
+    block = np.zeros(1000)
+    cache = MemoryCache(max_entries=10)
+    for key in 'abcd':
+        cache.set(key, block.copy())
+
+    cache.resize(2 * block.nbytes)
+    assert [cache.get(key) is MISSING for key in 'abcd'] == [True, True, False, False]
+    assert cache.nbytes == 2 * block.nbytes
+
+    cache.resize(None)
+    cache.set('e', block.copy())
+    assert len(cache) == 3
+
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+@cached
+def column_sum(df, column):
+    return df[column].sum()
+
+
+@cached
+def column_max(df, column):
+    return df[column].max()
+
+
+def stats_of(func):
+    [stats] = [entry for entry in get_cache_stats() if entry['function'] + ':' == func.key_prefix]
+    return stats
+
+
+def test_usage_by_prefix():
+    cache = MemoryCache()
+    cache.set('module.f:1', np.zeros(10))
+    cache.set('module.f:2', np.zeros(20))
+    cache.set('module.g:1', np.zeros(5))
+
+    assert cache.usage_by_prefix() == {
+        'module.f:': {'entries': 2, 'nbytes': 240},
+        'module.g:': {'entries': 1, 'nbytes': 40}
+    }
+
+
+def test_get_cache_stats(memory_cache):
+    reset_cache_stats()
+    df = frame()
+    for column in ['a', 'b', 'a', 'a']:
+        column_sum(df, column)
+    column_max(df, 'a')
+
+    stats = stats_of(column_sum)
+    assert (stats['calls'], stats['hits'], stats['misses']) == (4, 2, 2)
+    assert stats['hit_rate'] == 0.5
+    assert stats['hash_ms_total'] > 0 and stats['compute_ms_mean'] > 0
+    assert stats['entries'] == 2
+    assert stats['nbytes'] == memory_cache.usage_by_prefix()[column_sum.key_prefix]['nbytes'] > 0
+    assert stats_of(column_max)['entries'] == 1
+
+    column_sum.clear_cache()
+    assert stats_of(column_sum)['entries'] == 0
+
+    reset_cache_stats()
+    assert stats_of(column_sum)['calls'] == 0 and stats_of(column_sum)['hit_rate'] is None
+
+
+def test_get_cache_stats_without_memory_backend():
+    previous = set_cache_backend(NullCache())
+    try:
+        column_sum(frame(), 'a')
+        assert stats_of(column_sum)['entries'] is None
+        assert stats_of(column_sum)['nbytes'] is None
+    finally:
+        set_cache_backend(previous)
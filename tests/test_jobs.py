@@ -0,0 +1,99 @@
+"""
+Tests des analyses en arrière-plan : déduplication des soumissions, annulation
+au départ du dernier demandeur et résultats conservés sur disque
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.jobs import (
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_RUNNING,
+    JobCancelledError,
+    JobManager,
+    bootstrap_batch,
+    bootstrap_combine,
+    bootstrap_split
+)
+
+COLUMNS = ('Total ES', 'Total valo')
+
+QUICK = {'columns': COLUMNS, 'n_resamples': 300, 'seed': 1}
+
+# Assez de lots pour que la tâche soit toujours en cours à l'annulation
+SLOW = {'columns': COLUMNS, 'n_resamples': 200000, 'seed': 1}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(workers=1, result_dir=str(tmp_path / 'results'))
+    yield manager
+    manager.shutdown()
+
+
+def test_bootstrap_is_deterministic(survey, tmp_path):
+    """Le résultat ne dépend que des données et des paramètres"""
+    tasks = bootstrap_split(survey, QUICK, str(tmp_path))
+    values = survey[list(COLUMNS)].to_numpy(dtype=np.float64, na_value=np.nan)
+    expected = bootstrap_combine([bootstrap_batch(values, n, seed) for _, n, seed in tasks], QUICK)
+
+    manager = JobManager(workers=1)
+    try:
+        result = manager.submit('bootstrap_means', QUICK, survey, key='survey').result(timeout=120)
+    finally:
+        manager.shutdown()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_submissions_are_deduplicated(manager, survey):
+    job = manager.submit('bootstrap_means', QUICK, survey, key='survey', owner='a')
+    again = manager.submit('bootstrap_means', dict(reversed(list(QUICK.items()))), survey,
+                           key='survey', owner='b')
+
+    assert again is job
+    assert manager.get('bootstrap_means', QUICK, 'survey') is job
+    assert manager.get('bootstrap_means', QUICK, 'autre') is None
+    assert manager.submit('bootstrap_means', QUICK, survey, key='autre') is not job
+
+    job.result(timeout=120)
+    assert job.status == JOB_DONE and job.progress == 1.0
+    assert manager.submit('bootstrap_means', QUICK, survey, key='survey') is job
+
+
+def test_cancelled_when_last_owner_releases(manager, survey):
+    job = manager.submit('bootstrap_means', SLOW, survey, key='survey', owner='a')
+    manager.submit('bootstrap_means', SLOW, survey, key='survey', owner='b')
+
+    manager.release(job, 'a')
+    assert job.status == JOB_RUNNING
+
+    manager.release(job, 'b')
+    assert job.status == JOB_CANCELLED
+    assert job not in manager.jobs()
+    assert not os.path.exists(job.data_dir)
+    with pytest.raises(JobCancelledError):
+        job.result(timeout=0)
+
+    # Une nouvelle soumission relance la tâche
+    assert manager.submit('bootstrap_means', SLOW, survey, key='survey', owner='c') is not job
+
+
+def test_results_persisted_without_pickle(manager, survey, tmp_path):
+    result = manager.submit('bootstrap_means', QUICK, survey, key='survey').result(timeout=120)
+
+    [name] = os.listdir(manager.result_dir)
+    assert name.endswith('.json')
+
+    restarted = JobManager(workers=1, result_dir=manager.result_dir)
+    job = restarted.get('bootstrap_means', QUICK, 'survey')
+    assert job.status == JOB_DONE and job.n_tasks == 0
+    pd.testing.assert_frame_equal(job.result(), result, check_exact=True)
+
+    # Fichier corrompu ou d'une autre tâche : ignoré
+    with open(os.path.join(manager.result_dir, name), 'w', encoding='utf-8') as f:
+        f.write('{"key": "autre"}')
+    assert JobManager(result_dir=manager.result_dir).get('bootstrap_means', QUICK, 'survey') is None
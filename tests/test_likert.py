@@ -0,0 +1,71 @@
+"""
+Tests du cube des réponses de Likert : les effectifs sommés par cellule de
+filtres doivent redonner count_responses sur le jeu filtré, pour les échelles
+à 4 points (Rosenberg) et à 5 points
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import ITEMS_ESTIME_SOI, ITEMS_VALORISATION, WEIGHT_COLUMN
+from analytics.likert import LikertCube, count_responses, dimension_categories
+from analytics.processing import filter_data
+
+DIMENSIONS = [ITEMS_ESTIME_SOI, ITEMS_VALORISATION]
+
+FILTER_STATES = [
+    ({}, None),
+    ({'Genre': [1, 2], 'Etude': [2, 3, 4]}, None),
+    ({'Age': [1], 'Item7': [3, 4]}, (0, 1000))
+]
+
+
+@pytest.fixture(scope='module')
+def responses(survey):
+    """Questionnaire pondéré, avec une réponse hors de l'échelle à 4 points"""
+    df = survey.assign(**{WEIGHT_COLUMN: np.random.default_rng(3).uniform(0.5, 2.0, len(survey))})
+    df.loc[0, 'Item 9'] = 5
+    return df
+
+
+@pytest.fixture(scope='module')
+def cube(responses):
+    return LikertCube.build(responses)
+
+
+def test_dimension_categories():
+    assert dimension_categories(ITEMS_ESTIME_SOI) == [1, 2, 3, 4]
+    assert dimension_categories(ITEMS_VALORISATION) == [1, 2, 3, 4, 5]
+
+
+def test_count_responses_match_value_counts(responses):
+    for items_config in DIMENSIONS:
+        categories = dimension_categories(items_config)
+        counts = count_responses(responses, items_config['items'], categories)
+
+        assert list(counts.columns) == categories
+        for item in items_config['items']:
+            expected = responses[item].value_counts().reindex(categories, fill_value=0)
+            np.testing.assert_array_equal(counts.loc[item], expected)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('filters, duree_range', FILTER_STATES)
+def test_cube_matches_count_responses(responses, cube, filters, duree_range, weighted):
+    assert cube.covers(filters, duree_range)
+    df = filter_data(responses, filters, duree_range)
+
+    for items_config in DIMENSIONS:
+        items = items_config['items']
+        categories = dimension_categories(items_config)
+        pd.testing.assert_frame_equal(
+            cube.frequencies(filters, duree_range, weighted=weighted, items=items, categories=categories),
+            count_responses(df, items, categories, weighted=weighted),
+            check_dtype=False
+        )
+
+
+def test_cube_rejects_unknown_categories(cube):
+    with pytest.raises(ValueError):
+        cube.frequencies({}, categories=[0, 1, 2, 3])
@@ -0,0 +1,84 @@
+"""
+Tests des statistiques hors mémoire : la fusion des résumés de plusieurs blocs
+doit redonner les résultats des fonctions en mémoire
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import generate_dataset, write_dataset
+from analytics.outofcore import scan_statistics
+from analytics.processing import (
+    apply_labels,
+    calculate_averages_by_filters,
+    calculate_dimension_stats,
+    filter_data,
+    get_correlation_matrix,
+    get_grouped_statistics,
+    load_data
+)
+
+N_ROWS = 3000
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+FILTER_STATES = [
+    ({}, None),
+    ({'Genre': [1, 2], 'Etude': [2, 3, 4]}, None),
+    ({'Age': [1], 'Item7': [3, 4]}, (6, 60))
+]
+
+
+@pytest.fixture(scope='module')
+def csv_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('outofcore') / 'questionnaire.csv'
+    write_dataset(N_ROWS, str(path), seed=3)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def parquet_path(tmp_path_factory):
+    """Parquet en petits groupes de lignes, avec des valeurs manquantes"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = generate_dataset(N_ROWS, seed=4).astype('float64')
+    rng = np.random.default_rng(4)
+    for col in ['Item 9', 'Item 20', 'Total MR', 'Item5']:
+        df.loc[rng.choice(N_ROWS, 60, replace=False), col] = np.nan
+
+    path = tmp_path_factory.mktemp('outofcore') / 'questionnaire.parquet'
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), str(path), row_group_size=400)
+    return str(path)
+
+
+def assert_same(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_exact=False, atol=1e-9)
+
+
+def check_scan(path, filters, duree_range, workers, **chunks):
+    stats = scan_statistics(path, filters, duree_range, workers=workers, **chunks)
+    df = filter_data(apply_labels.uncached(load_data.uncached(path)), filters, duree_range)
+
+    assert stats.n_rows == len(df)
+    assert_same(stats.averages_by_filters(), calculate_averages_by_filters(df))
+    assert_same(stats.dimension_stats(), calculate_dimension_stats(df))
+    assert_same(stats.correlation_matrix(), get_correlation_matrix(df))
+    for group_by_col in ['Genre', 'Etude_label', 'Satisfaction_group']:
+        assert_same(stats.grouped_statistics(group_by_col, TOTALS),
+                    get_grouped_statistics(df, group_by_col, TOTALS))
+
+
+@pytest.mark.parametrize('filters, duree_range', FILTER_STATES)
+def test_csv_chunks_match_in_memory(csv_path, filters, duree_range):
+    check_scan(csv_path, filters, duree_range, workers=1, chunk_bytes=32 * 1024)
+
+
+@pytest.mark.parametrize('filters, duree_range', FILTER_STATES)
+def test_parquet_chunks_match_in_memory(parquet_path, filters, duree_range):
+    check_scan(parquet_path, filters, duree_range, workers=1, chunk_rows=500)
+
+
+def test_parallel_scan_matches_in_memory(parquet_path):
+    check_scan(parquet_path, *FILTER_STATES[1], workers=2, chunk_rows=500)
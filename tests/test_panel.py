@@ -0,0 +1,111 @@
+"""
+Tests du suivi longitudinal : appariement des répondants, scores de
+changement, tests appariés et corrélations des changements
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as scipy_stats
+
+from synthetic import generate_dataset
+from config import PARTICIPANT_ID_COLUMN
+from analytics.panel import TOTAL_COLUMNS, change_correlations, change_scores, link_panel, paired_tests
+from analytics.processing import correlation_p_values, get_all_items, get_item_correlations
+from analytics.waves import stack_waves
+
+ID = PARTICIPANT_ID_COLUMN
+
+
+@pytest.fixture(scope='module')
+def waves():
+    """
+    Deux vagues : les participants 101 à 300 répondent aux deux, un
+    identifiant est répété dans la seconde vague et quelques-uns manquent
+    """
+    before = generate_dataset(300, seed=5, start_id=1).astype('float64')
+    after = generate_dataset(300, seed=6, start_id=101).astype('float64')
+    after.loc[5, ID] = after.loc[4, ID]
+    after.loc[10:12, ID] = np.nan
+    before.loc[150, ID] = np.nan
+    after.loc[20:30, 'Total ES'] = np.nan
+    return before, after
+
+
+@pytest.fixture(scope='module')
+def stacked(waves):
+    return stack_waves(list(waves), ['S1', 'S2'])
+
+
+def expected_changes(waves):
+    """Scores de changement par jointure pandas sur l'identifiant"""
+    before, after = waves
+    columns = get_all_items(include_totals=True)
+    before = before.dropna(subset=[ID]).drop_duplicates(ID).set_index(ID)[columns]
+    after = after.dropna(subset=[ID]).drop_duplicates(ID).set_index(ID)[columns]
+    ids = before.index.intersection(after.index)
+    return after.loc[ids] - before.loc[ids]
+
+
+def test_link_panel(stacked, waves):
+    rows_before, rows_after, ids = link_panel(stacked, 'S1', 'S2')
+
+    assert sorted(ids) == sorted(expected_changes(waves).index)
+    np.testing.assert_array_equal(stacked[ID].to_numpy()[rows_before], ids)
+    np.testing.assert_array_equal(stacked[ID].to_numpy()[rows_after], ids)
+    # Identifiant répété : seule sa première ligne est liée
+    first = 300 + 4
+    assert first in rows_after and first + 1 not in rows_after
+
+
+def test_change_scores(stacked, waves):
+    changes = change_scores(stacked, 'S1', 'S2')
+    expected = expected_changes(waves)
+
+    pd.testing.assert_frame_equal(changes.sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_paired_tests_match_scipy(stacked, waves):
+    before, after = waves
+    results = paired_tests(stacked, 'S1', 'S2')
+    rows_before, rows_after, _ = link_panel(stacked, 'S1', 'S2')
+
+    for col in ['Item 18', 'Total ES', 'Total GC']:
+        start = stacked[col].to_numpy()[rows_before]
+        end = stacked[col].to_numpy()[rows_after]
+        complete = ~np.isnan(start) & ~np.isnan(end)
+        test = scipy_stats.ttest_rel(end[complete], start[complete])
+        delta = end[complete] - start[complete]
+
+        assert results.loc[col, 'N paires'] == complete.sum()
+        assert results.loc[col, 'Δ moyen'] == pytest.approx(delta.mean(), abs=5e-4)
+        assert results.loc[col, 't'] == pytest.approx(test.statistic, abs=5e-4)
+        assert results.loc[col, 'p'] == pytest.approx(test.pvalue, abs=5e-4)
+        assert results.loc[col, 'dz'] == pytest.approx(delta.mean() / delta.std(ddof=1), abs=5e-4)
+
+
+def test_change_correlations_match_scipy(stacked):
+    corr, p_values = change_correlations(stacked, 'S1', 'S2')
+    changes = change_scores(stacked, 'S1', 'S2')[TOTAL_COLUMNS]
+
+    for i, a in enumerate(TOTAL_COLUMNS):
+        for j, b in enumerate(TOTAL_COLUMNS):
+            if i == j:
+                continue
+            pair = changes[[a, b]].dropna()
+            r, p = scipy_stats.pearsonr(pair[a], pair[b])
+            assert corr.iloc[i, j] == pytest.approx(r)
+            assert p_values.iloc[i, j] == pytest.approx(p)
+
+
+def test_correlation_p_values(survey):
+    corr, p_values = get_item_correlations(survey)
+
+    pair = survey[['Item 9', 'Item 18']].dropna()
+    _, p = scipy_stats.pearsonr(pair['Item 9'], pair['Item 18'])
+    assert p_values.loc['Item 9', 'Item 18'] == pytest.approx(p)
+    assert np.all(np.diag(p_values) == 0.0)
+
+    # Moins de 3 observations complètes : pas de p-value
+    tiny = survey[['Item 9', 'Item 18']].head(2)
+    assert np.isnan(correlation_p_values(tiny.corr(), tiny.notna()).iloc[0, 1])
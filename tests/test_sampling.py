@@ -0,0 +1,64 @@
+"""
+Tests des estimations sur échantillon stratifié : un échantillon complet
+redonne les valeurs exactes, et la variance est celle de la formule par strate
+"""
+
+import numpy as np
+import pytest
+
+from config import WEIGHT_COLUMN
+from analytics.processing import filter_data
+from analytics.sampling import StratifiedSample
+
+COLUMNS = ['Item 9', 'Total ES', 'Total GC']
+
+FILTERS = {'Genre': [1, 2], 'Etude': [2, 3, 4]}
+
+
+def test_allocation(survey):
+    sample = StratifiedSample.build(survey, size=300)
+
+    assert sample.population_sizes.sum() == len(survey)
+    np.testing.assert_array_equal(np.bincount(sample.strata), sample.sample_sizes)
+    assert np.all(sample.sample_sizes >= np.minimum(2, sample.population_sizes))
+    assert abs(len(sample) - 300) < len(sample.sample_sizes)
+
+
+def test_full_sample_is_exact(survey):
+    sample = StratifiedSample.build(survey, size=len(survey))
+    assert len(sample) == len(survey)
+
+    estimates = sample.estimate(COLUMNS, sample.filter_mask(FILTERS))
+    expected = filter_data(survey, FILTERS)[COLUMNS]
+
+    np.testing.assert_allclose(estimates['Moyenne'], expected.mean())
+    np.testing.assert_allclose(estimates['Écart-type'], expected.std())
+    np.testing.assert_array_equal(estimates['N'], expected.count())
+    np.testing.assert_allclose(estimates['Erreur-type'], 0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+def test_variance_matches_per_stratum_formula(survey, weighted):
+    df = survey.head(400).assign(**{WEIGHT_COLUMN: np.random.default_rng(4).uniform(0.5, 2.0, 400)})
+    sample = StratifiedSample.build(df, size=80, seed=3)
+    mask = sample.filter_mask(FILTERS)
+    estimates = sample.estimate(COLUMNS, mask, weighted=weighted)
+
+    adjustment = sample.df[WEIGHT_COLUMN].to_numpy() if weighted else np.ones(len(sample))
+    for col in COLUMNS:
+        y = sample.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        domain = mask & ~np.isnan(y)
+        w = sample.weights * adjustment
+        population = w[domain].sum()
+        mean = np.average(y[domain], weights=w[domain])
+
+        # Variable linéarisée, nulle hors du domaine
+        z = np.where(domain, adjustment * (np.nan_to_num(y) - mean) / population, 0.0)
+        variance = 0.0
+        for h, (N_h, n_h) in enumerate(zip(sample.population_sizes, sample.sample_sizes)):
+            if n_h > 1:
+                variance += N_h ** 2 * (1 - n_h / N_h) * z[sample.strata == h].var(ddof=1) / n_h
+
+        assert estimates.loc[col, 'Moyenne'] == pytest.approx(mean)
+        assert estimates.loc[col, 'Erreur-type'] == pytest.approx(np.sqrt(variance))
+        assert estimates.loc[col, 'n'] == domain.sum()
@@ -0,0 +1,62 @@
+"""
+Tests du répertoire partagé : le jeu mappé doit redonner le jeu écrit, sans
+qu'aucun fichier ne soit relu avec pickle
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import generate_dataset
+from analytics.processing import apply_labels
+from analytics.shared import SHARED_AGGREGATES, FilterIndex, load_shared_dataset, map_shared_dataset
+
+
+@pytest.fixture(scope='module')
+def raw():
+    """Questionnaire brut avec des colonnes non numériques et des valeurs manquantes"""
+    df = generate_dataset(500, seed=2).astype({'Item 20': 'float64'})
+    df.loc[[3, 7], 'Item 20'] = np.nan
+    df['Commentaire'] = pd.Series(['oui', None, 'non', 'peut-être'] * 125, dtype='str')
+    df['Horodateur'] = pd.date_range('2024-01-01', periods=len(df), freq='h')
+    df.loc[5, 'Horodateur'] = pd.NaT
+    return df
+
+
+@pytest.fixture(scope='module')
+def shared(raw, tmp_path_factory):
+    shared_dir = str(tmp_path_factory.mktemp('shared'))
+    load_shared_dataset(shared_dir, 'empreinte', b'', lambda data: raw)
+    return os.path.join(shared_dir, 'empreinte')
+
+
+def test_no_pickle_files(shared):
+    for name in os.listdir(shared):
+        assert name.endswith(('.npy', '.json'))
+        if name.endswith('.npy'):
+            np.load(os.path.join(shared, name), allow_pickle=False)
+
+
+def test_mapped_dataset_matches_written(raw, shared):
+    df_raw, filter_index, aggregates, mapped_bytes = map_shared_dataset(shared)
+
+    # Copie : les colonnes mappées sont des np.memmap, pas des ndarray
+    pd.testing.assert_frame_equal(df_raw.copy(), raw)
+    assert mapped_bytes > 0
+    expected = FilterIndex.build(raw)
+    for col, (values, bitmaps) in expected.bitmaps.items():
+        assert filter_index.bitmaps[col][0] == values
+        np.testing.assert_array_equal(filter_index.bitmaps[col][1], bitmaps)
+
+
+def test_aggregates_round_trip_exactly(raw, shared):
+    _, _, aggregates, _ = map_shared_dataset(shared)
+    df_labeled = apply_labels.uncached(raw)
+
+    assert len(aggregates) == len(SHARED_AGGREGATES)
+    for func in SHARED_AGGREGATES:
+        expected = func.uncached(df_labeled, weighted=False)
+        [actual] = [value for key, value in aggregates.items() if key.startswith(func.key_prefix)]
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
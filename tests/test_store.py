@@ -0,0 +1,143 @@
+"""
+Tests du magasin de jeux de données : compteur de références, budget global
+et budget de session, éviction des jeux libérés et taille du cache de résultats
+"""
+
+import io
+import threading
+
+import pytest
+
+from synthetic import generate_dataset
+from analytics.cache import MISSING, MemoryCache, set_cache_backend
+from analytics.store import DatasetStore, MemoryBudgetError
+
+
+def parquet_bytes(seed):
+    buffer = io.BytesIO()
+    generate_dataset(400, seed=seed).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope='module')
+def files():
+    return [parquet_bytes(seed) for seed in range(3)]
+
+
+@pytest.fixture(scope='module')
+def dataset_bytes(files):
+    """Mémoire comptée pour un jeu de données seul (sans objets dérivés)"""
+    lease = DatasetStore().acquire(files[0])
+    return lease.nbytes
+
+
+def test_refcounting(files):
+    store = DatasetStore()
+    first = store.acquire(files[0])
+    second = store.acquire(files[0], source_id='copie')
+
+    assert len(store) == 1 and store.stats()[0]['refs'] == 2
+    assert first._entry is second._entry and second.source_id == 'copie'
+
+    first.release()
+    first.release()
+    assert store.stats()[0]['refs'] == 1
+    with pytest.raises(RuntimeError):
+        first.df
+
+    del second
+    assert len(store) == 0 and store.nbytes() == 0
+
+
+def test_released_dataset_is_kept_within_budget(files, dataset_bytes):
+    store = DatasetStore(max_bytes=10 * dataset_bytes)
+    lease = store.acquire(files[0])
+    entry = lease._entry
+    lease.release()
+
+    assert store.stats()[0]['refs'] == 0
+    assert store.acquire(files[0])._entry is entry
+
+
+def test_budget_refusal(files, dataset_bytes):
+    store = DatasetStore(max_bytes=dataset_bytes // 2)
+    with pytest.raises(MemoryBudgetError):
+        store.acquire(files[0])
+    assert len(store) == 0 and store.nbytes() == 0
+
+    store = DatasetStore()
+    with pytest.raises(MemoryBudgetError):
+        store.acquire(files[0], max_bytes=dataset_bytes // 2)
+    assert len(store) == 0
+
+
+def test_released_datasets_are_evicted_first(files, dataset_bytes):
+    store = DatasetStore(max_bytes=int(2.5 * dataset_bytes))
+    kept = store.acquire(files[0])
+    store.acquire(files[1]).release()
+
+    new = store.acquire(files[2])
+    assert [entry['refs'] for entry in store.stats()] == [1, 1]
+    assert {entry['key'] for entry in store.stats()} == {kept.key, new.key}
+
+    # Tous les jeux sont référencés : plus rien à évincer
+    with pytest.raises(MemoryBudgetError):
+        store.acquire(files[1])
+
+
+def test_concurrent_loads_share_the_budget(files, dataset_bytes):
+    store = DatasetStore(max_bytes=int(1.5 * dataset_bytes))
+    barrier = threading.Barrier(2)
+    leases, errors = [], []
+
+    def acquire(data):
+        barrier.wait()
+        try:
+            leases.append(store.acquire(data))
+        except MemoryBudgetError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=acquire, args=(data,)) for data in files[:2]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(leases) == 1 and len(errors) == 1
+    assert store.nbytes() <= store.max_bytes
+
+
+def test_derived_objects_are_counted(files, dataset_bytes):
+    store = DatasetStore()
+    lease = store.acquire(files[0])
+
+    sample, cube = lease.sample, lease.likert_cube
+    assert lease.nbytes == dataset_bytes + sample.nbytes + cube.nbytes
+    assert store.nbytes() == lease.nbytes
+
+    # Sans place pour eux, les objets dérivés ne sont pas conservés
+    store = DatasetStore(max_bytes=dataset_bytes)
+    lease = store.acquire(files[0])
+    assert lease.sample is not lease.sample
+    assert lease.nbytes == dataset_bytes
+
+
+def test_rebalance_resizes_result_cache(files, dataset_bytes):
+    cache = MemoryCache()
+    previous = set_cache_backend(cache)
+    try:
+        store = DatasetStore(max_bytes=3 * dataset_bytes)
+        store.rebalance()
+        assert cache.max_bytes == 3 * dataset_bytes
+
+        lease = store.acquire(files[0])
+        assert cache.max_bytes == 2 * dataset_bytes
+
+        cache.set('grand', b'x' * (3 * dataset_bytes // 2))
+        assert cache.get('grand') is not MISSING
+
+        other = store.acquire(files[1])
+        assert cache.max_bytes == store.max_bytes - lease.nbytes - other.nbytes
+        assert cache.get('grand') is MISSING
+    finally:
+        set_cache_backend(previous)
@@ -0,0 +1,81 @@
+"""
+Tests de la comparaison de vagues : statistiques et corrélations par vague
+comparées à un groupby pandas, écarts comparés au test de Welch de SciPy
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as scipy_stats
+
+from synthetic import generate_dataset
+from config import WAVE_COLUMN
+from analytics.processing import apply_labels
+from analytics.waves import DIMENSION_NAMES, stack_waves, wave_correlations, wave_differences, wave_statistics
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+WAVES = ['S1', 'S2', 'S3']
+
+
+@pytest.fixture(scope='module')
+def stacked():
+    """Trois vagues de tailles différentes, avec des scores manquants"""
+    frames = []
+    for seed, n_rows in zip([7, 8, 9], [300, 450, 200]):
+        df = generate_dataset(n_rows, seed=seed).astype({'Total MR': 'float64', 'Item 20': 'float64'})
+        rng = np.random.default_rng(seed)
+        df.loc[rng.choice(n_rows, 20, replace=False), 'Total MR'] = np.nan
+        df.loc[rng.choice(n_rows, 15, replace=False), 'Item 20'] = np.nan
+        frames.append(apply_labels.uncached(df))
+    return stack_waves(frames, WAVES)
+
+
+def test_wave_statistics_match_groupby(stacked):
+    stats = wave_statistics(stacked)
+    grouped = stacked.groupby(WAVE_COLUMN, observed=True)
+
+    for col in ['Item 20', 'Total ES', 'Total MR']:
+        np.testing.assert_allclose(stats['Moyenne'].loc[col], grouped[col].mean())
+        np.testing.assert_allclose(stats['Écart-type'].loc[col], grouped[col].std())
+        np.testing.assert_array_equal(stats['N'].loc[col], grouped[col].count())
+
+
+def test_wave_correlations_match_groupby(stacked):
+    corr = wave_correlations(stacked)
+
+    for wave in WAVES:
+        expected = stacked.loc[stacked[WAVE_COLUMN] == wave, TOTALS].corr()
+        np.testing.assert_allclose(corr.loc[wave].to_numpy(), expected.to_numpy())
+        assert list(corr.loc[wave].index) == DIMENSION_NAMES
+
+
+def test_wave_correlations_with_large_offsets(stacked):
+    """Scores centrés par vague : un décalage ne change pas les corrélations"""
+    shifted = stacked.assign(**{col: stacked[col] + 1e8 for col in TOTALS})
+
+    np.testing.assert_allclose(wave_correlations(shifted), wave_correlations(stacked), atol=1e-6)
+
+
+def test_wave_differences_match_scipy(stacked):
+    differences = wave_differences(wave_statistics(stacked))
+
+    for before, after in [('S1', 'S2'), ('S2', 'S3')]:
+        for col in ['Total ES', 'Total MR']:
+            x = stacked.loc[stacked[WAVE_COLUMN] == before, col].dropna().to_numpy()
+            y = stacked.loc[stacked[WAVE_COLUMN] == after, col].dropna().to_numpy()
+            n1, n2 = len(x), len(y)
+            pooled = np.sqrt(((n1 - 1) * x.var(ddof=1) + (n2 - 1) * y.var(ddof=1)) / (n1 + n2 - 2))
+            g = (1 - 3 / (4 * (n1 + n2) - 9)) * (y.mean() - x.mean()) / pooled
+            welch = scipy_stats.ttest_ind(y, x, equal_var=False)
+
+            row = differences.loc[(f"{before} → {after}", col)]
+            assert row['Différence'] == pytest.approx(y.mean() - x.mean(), abs=5e-4)
+            assert row['g de Hedges'] == pytest.approx(g, abs=5e-4)
+            assert row['p (Welch)'] == pytest.approx(welch.pvalue, abs=5e-4)
+
+
+def test_wave_differences_against_reference(stacked):
+    differences = wave_differences(wave_statistics(stacked), reference='S2')
+
+    assert list(differences.index.get_level_values('Comparaison').unique()) == ['S2 → S1', 'S2 → S3']
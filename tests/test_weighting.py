@@ -0,0 +1,168 @@
+"""
+Tests de la pondération : raking, moments pondérés et chemins weighted=True
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import WEIGHT_COLUMN, ITEMS_VALORISATION
+from analytics.processing import (
+    calculate_averages_by_filters,
+    calculate_dimension_stats,
+    calculate_item_means,
+    calculate_kpis,
+    get_correlation_matrix,
+    get_grouped_statistics
+)
+from analytics.weighting import (
+    add_weights,
+    effective_sample_size,
+    rake,
+    weighted_corr,
+    weighted_group_moments,
+    weighted_median,
+    weighted_moments
+)
+
+MARGINS = {
+    'Genre': {1: 0.49, 2: 0.49, 3: 0.02},
+    'Age': {1: 0.3, 2: 0.7},
+    'Etude': {1: 0.1, 2: 0.2, 3: 0.3, 4: 0.25, 5: 0.15}
+}
+
+TOTALS = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
+
+
+def weighted_shares(df, col, weights):
+    """Parts pondérées des modalités d'une colonne"""
+    return pd.Series(weights).groupby(df[col].to_numpy()).sum() / weights.sum()
+
+
+@pytest.fixture
+def random_weights(survey):
+    return np.random.default_rng(2).uniform(0.2, 3.0, len(survey))
+
+
+# ============================================================================
+# RAKING
+# ============================================================================
+
+def test_rake_reaches_target_margins(survey):
+    weights = rake(survey, MARGINS)
+
+    assert weights.mean() == pytest.approx(1.0)
+    for col, targets in MARGINS.items():
+        shares = weighted_shares(survey, col, weights)
+        for category, target in targets.items():
+            assert shares[category] == pytest.approx(target, abs=1e-5)
+
+
+def test_rake_renormalises_missing_categories(survey):
+    margins = {'Genre': {1: 0.4, 2: 0.4, 3: 0.1, 9: 0.1}}
+    weights = rake(survey, margins)
+
+    shares = weighted_shares(survey, 'Genre', weights)
+    assert shares[1] == pytest.approx(4 / 9, abs=1e-6)
+    assert shares[3] == pytest.approx(1 / 9, abs=1e-6)
+
+
+def test_add_weights_keeps_existing_column(survey):
+    df = survey.assign(**{WEIGHT_COLUMN: 2.0})
+
+    assert add_weights(df, MARGINS) is df
+    assert add_weights(survey, None) is survey
+    assert WEIGHT_COLUMN in add_weights(survey, MARGINS).columns
+
+
+def test_effective_sample_size():
+    assert effective_sample_size(np.ones(50)) == pytest.approx(50)
+    assert effective_sample_size(np.array([1.0, 0.0, 0.0])) == pytest.approx(1)
+
+
+# ============================================================================
+# POIDS UNITAIRES : MÊMES RÉSULTATS QUE SANS PONDÉRATION
+# ============================================================================
+
+def test_unit_weights_match_pandas(survey):
+    columns = ['Item 9'] + TOTALS
+    values = survey[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    ones = np.ones(len(survey))
+
+    mean, std, n = weighted_moments(values, ones)
+    np.testing.assert_allclose(mean, survey[columns].mean())
+    np.testing.assert_allclose(std, survey[columns].std())
+    np.testing.assert_array_equal(n, survey[columns].count())
+
+    np.testing.assert_allclose(weighted_median(values, ones), survey[columns].median())
+    np.testing.assert_allclose(weighted_corr(values, ones), survey[columns].corr())
+
+
+def test_unit_weights_match_groupby(survey):
+    codes, groups = pd.factorize(survey['Etude'], sort=True)
+    values = survey[TOTALS].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    mean, std, n = weighted_group_moments(codes, len(groups), values, np.ones(len(survey)))
+    expected = survey.groupby('Etude')[TOTALS]
+    np.testing.assert_allclose(mean, expected.mean())
+    np.testing.assert_allclose(std, expected.std())
+    np.testing.assert_array_equal(n, expected.count())
+
+
+def test_unit_weights_processing(survey):
+    df = survey.assign(**{WEIGHT_COLUMN: 1.0})
+
+    pd.testing.assert_frame_equal(calculate_dimension_stats(df, weighted=True),
+                                  calculate_dimension_stats(df, weighted=False),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(get_correlation_matrix(df, weighted=True),
+                                  get_correlation_matrix(df, weighted=False))
+    pd.testing.assert_frame_equal(get_grouped_statistics(df, 'Genre', TOTALS, weighted=True),
+                                  get_grouped_statistics(df, 'Genre', TOTALS, weighted=False),
+                                  check_dtype=False)
+    pd.testing.assert_series_equal(calculate_item_means(df, ITEMS_VALORISATION, weighted=True),
+                                   calculate_item_means(df, ITEMS_VALORISATION, weighted=False),
+                                   check_names=False)
+    pd.testing.assert_frame_equal(calculate_averages_by_filters(df, weighted=True),
+                                  calculate_averages_by_filters(df, weighted=False),
+                                  check_dtype=False)
+
+    weighted_kpis = calculate_kpis(df, weighted=True)
+    for name, value in calculate_kpis(df, weighted=False).items():
+        assert weighted_kpis[name] == pytest.approx(value)
+
+
+# ============================================================================
+# POIDS QUELCONQUES : MOYENNES DE np.average
+# ============================================================================
+
+def test_weighted_means_match_np_average(survey, random_weights):
+    columns = ['Item 9'] + TOTALS
+    values = survey[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    mean, _, _ = weighted_moments(values, random_weights)
+    for j in range(len(columns)):
+        present = ~np.isnan(values[:, j])
+        assert mean[j] == pytest.approx(np.average(values[present, j], weights=random_weights[present]))
+
+
+def test_weighted_group_means_match_np_average(survey, random_weights):
+    codes, groups = pd.factorize(survey['Genre'], sort=True)
+    values = survey[TOTALS].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    mean, _, _ = weighted_group_moments(codes, len(groups), values, random_weights)
+    for g in range(len(groups)):
+        for j in range(len(TOTALS)):
+            rows = (codes == g) & ~np.isnan(values[:, j])
+            assert mean[g, j] == pytest.approx(np.average(values[rows, j], weights=random_weights[rows]))
+
+
+def test_weighted_processing_means_match_np_average(survey, random_weights):
+    df = survey.assign(**{WEIGHT_COLUMN: random_weights})
+
+    item_means = calculate_item_means(df, ITEMS_VALORISATION, weighted=True)
+    for item, value in item_means.items():
+        assert value == pytest.approx(np.average(df[item], weights=random_weights))
+
+    kpis = calculate_kpis(df, weighted=True)
+    assert kpis['Valorisation (moy)'] == pytest.approx(np.average(df['Total valo'], weights=random_weights))
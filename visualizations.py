@@ -2,62 +2,194 @@
 Module de visualisations avec Plotly
 """
 
+from functools import lru_cache
+
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
+import plotly.io as pio
 import numpy as np
 from config import *
+from analytics.processing import calculate_dimension_stats, calculate_kpis
+from analytics.profiling import traced
 
+# plotly.express (et, via trendline='ols', statsmodels/scipy) n'est importé
+# qu'au premier graphique qui en a besoin : il n'entre pas dans le temps de
+# démarrage de l'application.
 
-def create_bar_chart(data, x, y, title, color=None, labels=None, orientation='v'):
+
+# ============================================================================
+# CONSTRUCTION RAPIDE DES FIGURES
+# ============================================================================
+#
+# Les graphiques de données agrégées (quelques dizaines de points) sont
+# construits directement à partir de tableaux, sans plotly.express : pour de
+# si petites entrées, l'introspection du DataFrame et la validation des traces
+# coûtent bien plus que le graphique lui-même. Les traces et le layout sont
+# écrits sous leur forme canonique Plotly (titres en {'text': ...}, pas de
+# raccourcis "xaxis_title") puisqu'ils ne passent plus par la validation.
+# plotly.express reste utilisé pour les graphiques sur données brutes
+# (box, violin, scatter avec trendline, scatter matrix, sunburst...).
+
+
+@lru_cache(maxsize=None)
+def get_template_layout(template_name=PLOTLY_LAYOUT_TEMPLATE):
+    """
+    Résout une seule fois le template Plotly en dictionnaire
+
+    Args:
+        template_name: Nom du template enregistré dans plotly.io.templates
+
+    Returns:
+        Dict du template (layout + valeurs par défaut des traces)
+    """
+    return pio.templates[template_name].to_plotly_json()
+
+
+def axis_title(text):
+    """Forme canonique d'un titre (figure, axe ou colorbar)"""
+    return {'text': text}
+
+
+def build_figure(traces, title=None, **layout):
+    """
+    Construit une figure à partir de traces déjà au format Plotly
+
+    Le template de PLOTLY_LAYOUT_TEMPLATE est appliqué depuis le cache et la
+    validation des propriétés est désactivée.
+
+    Args:
+        traces: Liste de dicts de traces ({'type': 'bar', 'x': ..., ...})
+        title: Titre de la figure
+        **layout: Propriétés de layout (forme canonique)
+
+    Returns:
+        Figure Plotly
+    """
+    base_layout = {'template': get_template_layout(PLOTLY_LAYOUT_TEMPLATE)}
+    if title is not None:
+        base_layout['title'] = axis_title(title)
+    base_layout.update(layout)
+
+    return go.Figure(data=traces, layout=base_layout, _validate=False)
+
+
+def histogram_trace(values, nbins, name=None, edges=None):
+    """
+    Agrège une série en histogramme et renvoie la trace en barres correspondante
+
+    Args:
+        values: Valeurs brutes (les NaN sont ignorés)
+        nbins: Nombre de classes
+        name: Nom de la trace (légende)
+        edges: Bornes des classes imposées (pour partager les classes entre groupes)
+
+    Returns:
+        Dict de trace 'bar'
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=edges if edges is not None else nbins)
+
+    trace = {
+        'type': 'bar',
+        'x': (edges[:-1] + edges[1:]) / 2,
+        'y': counts,
+        'width': np.diff(edges),
+        'hovertemplate': '[%{customdata[0]:.4g} ; %{customdata[1]:.4g}[<br>N = %{y}<extra></extra>',
+        'customdata': np.column_stack([edges[:-1], edges[1:]])
+    }
+    if name is not None:
+        trace['name'] = str(name)
+
+    return trace
+
+
+def grouped_histogram_traces(data, column, group_by, nbins, opacity=None):
     """
-    Crée un graphique en barres
+    Histogrammes d'une variable par groupe, sur des classes communes
+
+    Returns:
+        Liste de dicts de traces 'bar'
+    """
+    all_values = data[column].dropna().to_numpy(dtype=float)
+    if len(all_values) == 0:
+        return []
+    _, edges = np.histogram(all_values, bins=nbins)
+
+    traces = []
+    for group, values in data.groupby(group_by, sort=True, observed=True)[column]:
+        trace = histogram_trace(values.to_numpy(), nbins, name=group, edges=edges)
+        if opacity is not None:
+            trace['opacity'] = opacity
+        traces.append(trace)
+
+    return traces
+
+
+@traced('figure')
+def create_bar_chart(data, x, y, title, color=None, labels=None, orientation='v'):
     """
-    fig = px.bar(
-        data, 
-        x=x, 
-        y=y, 
+    Crée un graphique en barres (données agrégées)
+    """
+    labels = labels or {}
+    groups = data.groupby(color, sort=False) if color else [(None, data)]
+
+    traces = []
+    for group, group_data in groups:
+        trace = {
+            'type': 'bar',
+            'x': group_data[x].to_numpy(),
+            'y': group_data[y].to_numpy(),
+            'orientation': orientation
+        }
+        if group is not None:
+            trace['name'] = str(group)
+        traces.append(trace)
+
+    fig = build_figure(
+        traces,
         title=title,
-        color=color,
-        labels=labels,
-        orientation=orientation,
-        template=PLOTLY_LAYOUT_TEMPLATE
-    )
-    
-    fig.update_layout(
         showlegend=True if color else False,
-        height=400
+        height=400,
+        barmode='relative',
+        xaxis={'title': axis_title(labels.get(x, x))},
+        yaxis={'title': axis_title(labels.get(y, y))},
+        legend={'title': axis_title(labels.get(color, color))} if color else {}
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_histogram(data, column, title, nbins=20, color=None):
     """
-    Crée un histogramme
+    Crée un histogramme (classes calculées avec NumPy)
     """
-    fig = px.histogram(
-        data,
-        x=column,
+    if color:
+        traces = grouped_histogram_traces(data, column, color, nbins)
+    else:
+        traces = [histogram_trace(data[column].to_numpy(), nbins)]
+
+    fig = build_figure(
+        traces,
         title=title,
-        nbins=nbins,
-        color=color,
-        template=PLOTLY_LAYOUT_TEMPLATE
-    )
-    
-    fig.update_layout(
         showlegend=True if color else False,
-        height=400
+        height=400,
+        barmode='relative',
+        bargap=0,
+        xaxis={'title': axis_title(column)},
+        yaxis={'title': axis_title('count')}
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_box_plot(data, x, y, title, color=None, points='all'):
     """
     Crée un box plot
     """
+    import plotly.express as px
+
     fig = px.box(
         data,
         x=x,
@@ -75,10 +207,13 @@ def create_box_plot(data, x, y, title, color=None, points='all'):
     return fig
 
 
+@traced('figure')
 def create_violin_plot(data, x, y, title, color=None, box=True):
     """
     Crée un violin plot
     """
+    import plotly.express as px
+
     fig = px.violin(
         data,
         x=x,
@@ -97,10 +232,13 @@ def create_violin_plot(data, x, y, title, color=None, box=True):
     return fig
 
 
+@traced('figure')
 def create_scatter_plot(data, x, y, title, color=None, size=None, hover_data=None, trendline=None):
     """
     Crée un scatter plot
     """
+    import plotly.express as px
+
     fig = px.scatter(
         data,
         x=x,
@@ -120,90 +258,145 @@ def create_scatter_plot(data, x, y, title, color=None, size=None, hover_data=Non
     return fig
 
 
+@traced('figure')
 def create_correlation_heatmap(corr_matrix, title="Matrice de Corrélation"):
     """
     Crée une heatmap de corrélation
     """
-    fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.index,
-        colorscale='RdBu',
-        zmid=0,
-        text=corr_matrix.values.round(2),
-        texttemplate='%{text}',
-        textfont={"size": 12},
-        colorbar=dict(title="Corrélation")
-    ))
-    
-    fig.update_layout(
+    fig = build_figure(
+        [{
+            'type': 'heatmap',
+            'z': corr_matrix.values,
+            'x': list(corr_matrix.columns),
+            'y': list(corr_matrix.index),
+            'colorscale': 'RdBu',
+            'zmid': 0,
+            'text': corr_matrix.values.round(2),
+            'texttemplate': '%{text}',
+            'textfont': {'size': 12},
+            'colorbar': {'title': axis_title("Corrélation")}
+        }],
         title=title,
-        template=PLOTLY_LAYOUT_TEMPLATE,
         height=500,
-        xaxis_title="",
-        yaxis_title=""
+        xaxis={'title': axis_title("")},
+        yaxis={'title': axis_title("")}
     )
-    
+
+    return fig
+
+
+@traced('figure')
+def create_item_correlation_heatmap(corr_matrix, p_values, order, title, alpha=0.05):
+    """
+    Crée une heatmap des corrélations entre items, ordonnée par classification
+
+    Les corrélations non significatives (p >= alpha) sont masquées. Les
+    matrices sont envoyées en float32 : Plotly les sérialise en tableaux
+    binaires (base64) au lieu de listes JSON, et le texte des cellules est
+    généré côté navigateur via texttemplate.
+
+    Args:
+        corr_matrix: Matrice de corrélation entre items
+        p_values: Matrice des p-values (mêmes index/colonnes)
+        order: Ordre des items (classification hiérarchique)
+        title: Titre du graphique
+        alpha: Seuil de significativité
+    """
+    corr = corr_matrix.loc[order, order].to_numpy()
+    p = p_values.loc[order, order].to_numpy()
+
+    z = np.where(p < alpha, corr, np.nan).round(2).astype(np.float32)
+
+    fig = build_figure(
+        [{
+            'type': 'heatmap',
+            'z': z,
+            'x': list(order),
+            'y': list(order),
+            'customdata': p.astype(np.float32),
+            'colorscale': 'RdBu',
+            'zmin': -1,
+            'zmax': 1,
+            'texttemplate': '%{z:.2f}',
+            'textfont': {'size': 8},
+            'hovertemplate': '%{y} × %{x}<br>r = %{z:.2f}<br>p = %{customdata:.3g}<extra></extra>',
+            'hoverongaps': False,
+            'colorbar': {'title': axis_title("Corrélation")}
+        }],
+        title=title,
+        height=max(500, 22 * len(order)),
+        xaxis={'title': axis_title(""), 'tickangle': -45, 'constrain': 'domain'},
+        yaxis={'title': axis_title(""), 'autorange': 'reversed', 'scaleanchor': 'x'}
+    )
+
     return fig
 
 
-def create_grouped_bar_chart(data, x, y_cols, title, labels=None):
+@traced('figure')
+def create_grouped_bar_chart(data, x, y_cols, title, labels=None, names=None, height=450,
+                             errors=None):
     """
     Crée un graphique en barres groupées
-    """
-    fig = go.Figure()
-    
-    for col in y_cols:
-        fig.add_trace(go.Bar(
-            x=data[x],
-            y=data[col],
-            name=col
-        ))
-    
-    fig.update_layout(
+
+    Args:
+        names: Noms affichés des séries (par défaut, les noms de colonnes)
+        errors: Colonnes des demi-largeurs des barres d'erreur, une par série
+            (par défaut, pas de barres d'erreur)
+    """
+    names = names or y_cols
+    traces = [
+        {'type': 'bar', 'x': data[x].to_numpy(), 'y': data[col].to_numpy(), 'name': name}
+        for col, name in zip(y_cols, names)
+    ]
+    if errors:
+        for trace, col in zip(traces, errors):
+            trace['error_y'] = {'type': 'data', 'array': data[col].to_numpy(), 'visible': True}
+
+    fig = build_figure(
+        traces,
         title=title,
         barmode='group',
-        template=PLOTLY_LAYOUT_TEMPLATE,
-        height=450,
-        xaxis_title=labels.get(x, x) if labels else x,
-        yaxis_title="Score moyen"
+        height=height,
+        xaxis={'title': axis_title(labels.get(x, x) if labels else x)},
+        yaxis={'title': axis_title("Score moyen")}
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_radar_chart(data, categories, values, title, name="Score"):
     """
     Crée un radar chart
     """
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name=name
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, max(values) * 1.1]
-            )
-        ),
+    fig = build_figure(
+        [{
+            'type': 'scatterpolar',
+            'r': list(values),
+            'theta': list(categories),
+            'fill': 'toself',
+            'name': name
+        }],
         title=title,
-        template=PLOTLY_LAYOUT_TEMPLATE,
+        polar={
+            'radialaxis': {
+                'visible': True,
+                'range': [0, max(values) * 1.1]
+            }
+        },
         height=500
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_sunburst(data, path, values, title):
     """
     Crée un sunburst chart
     """
+    import plotly.express as px
+
     fig = px.sunburst(
         data,
         path=path,
@@ -219,27 +412,26 @@ def create_sunburst(data, path, values, title):
     return fig
 
 
-def create_distribution_comparison(data, column, group_by, title):
+@traced('figure')
+def create_distribution_comparison(data, column, group_by, title, nbins=20):
     """
     Compare les distributions d'une variable selon un groupement
     """
-    fig = px.histogram(
-        data,
-        x=column,
-        color=group_by,
-        barmode='overlay',
+    fig = build_figure(
+        grouped_histogram_traces(data, column, group_by, nbins, opacity=0.7),
         title=title,
-        opacity=0.7,
-        template=PLOTLY_LAYOUT_TEMPLATE
-    )
-    
-    fig.update_layout(
-        height=450
+        barmode='overlay',
+        bargap=0,
+        height=450,
+        xaxis={'title': axis_title(column)},
+        yaxis={'title': axis_title('count')},
+        legend={'title': axis_title(group_by)}
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_item_means_chart(means_series, title, item_labels=None):
     """
     Crée un graphique des moyennes des items
@@ -247,30 +439,109 @@ def create_item_means_chart(means_series, title, item_labels=None):
     if item_labels:
         labels = [item_labels.get(item, item) for item in means_series.index]
     else:
-        labels = means_series.index
-    
-    fig = go.Figure(go.Bar(
-        x=means_series.values,
-        y=labels,
-        orientation='h',
-        marker=dict(
-            color=means_series.values,
-            colorscale='Viridis',
-            showscale=True,
-            colorbar=dict(title="Moyenne")
-        ),
-        text=means_series.values.round(2),
-        textposition='auto'
-    ))
-    
-    fig.update_layout(
+        labels = list(means_series.index)
+
+    values = means_series.to_numpy(dtype=float)
+
+    fig = build_figure(
+        [{
+            'type': 'bar',
+            'x': values,
+            'y': labels,
+            'orientation': 'h',
+            'marker': {
+                'color': values,
+                'colorscale': 'Viridis',
+                'showscale': True,
+                'colorbar': {'title': axis_title("Moyenne")}
+            },
+            'text': values.round(2),
+            'textposition': 'auto'
+        }],
         title=title,
-        xaxis_title="Moyenne",
-        yaxis_title="",
-        template=PLOTLY_LAYOUT_TEMPLATE,
+        xaxis={'title': axis_title("Moyenne")},
+        yaxis={'title': axis_title("")},
         height=max(400, len(means_series) * 40)
     )
-    
+
+    return fig
+
+
+@traced('figure')
+def create_likert_chart(counts, title, item_labels=None, category_labels=LIKERT_5_LABELS,
+                        colors=COLORS_LIKERT_5):
+    """
+    Crée un graphique en barres empilées divergentes de la répartition des réponses
+
+    Les modalités de désaccord partent vers la gauche, celles d'accord vers la
+    droite ; la modalité neutre d'une échelle impaire est répartie de part et
+    d'autre de zéro (une échelle paire, comme LIKERT_4_LABELS, n'en a pas).
+
+    Args:
+        counts: DataFrame des effectifs (items x modalités), voir count_responses
+        title: Titre du graphique
+        item_labels: Dict {item: libellé} des items
+        category_labels: Dict {modalité: libellé} de l'échelle de la dimension
+        colors: Dict {modalité: couleur} (COLORS_LIKERT_4 pour une échelle à 4 points)
+
+    Returns:
+        Figure Plotly
+    """
+    if item_labels:
+        labels = [item_labels.get(item, item) for item in counts.index]
+    else:
+        labels = list(counts.index)
+
+    values = counts.to_numpy(dtype=float)
+    totals = values.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = np.nan_to_num(values / totals * 100)
+
+    categories = list(counts.columns)
+    middle = len(categories) // 2 if len(categories) % 2 else None
+
+    def bar(position, x, show_legend=True):
+        category = categories[position]
+        return {
+            'type': 'bar',
+            'orientation': 'h',
+            'name': category_labels.get(category, str(category)),
+            'x': x,
+            'y': labels,
+            'customdata': shares[:, position],
+            'marker': {'color': colors.get(category)},
+            'legendrank': position,
+            'showlegend': show_legend,
+            'hovertemplate': '%{y}<br>%{fullData.name} : %{customdata:.1f} %<extra></extra>'
+        }
+
+    # Barres empilées à partir de zéro, dans l'ordre des traces de chaque côté
+    left = range(len(categories) // 2 - 1, -1, -1)
+    right = range((len(categories) + 1) // 2, len(categories))
+    traces = []
+    if middle is not None:
+        traces.append(bar(middle, -shares[:, middle] / 2, show_legend=False))
+    traces += [bar(position, -shares[:, position]) for position in left]
+    if middle is not None:
+        traces.append(bar(middle, shares[:, middle] / 2))
+    traces += [bar(position, shares[:, position]) for position in right]
+
+    ticks = np.arange(-100, 101, 25)
+    fig = build_figure(
+        traces,
+        title=title,
+        barmode='relative',
+        xaxis={
+            'title': axis_title("Part des réponses (%)"),
+            'range': [-100, 100],
+            'tickvals': ticks,
+            'ticktext': [f"{abs(tick)} %" for tick in ticks]
+        },
+        yaxis={'title': axis_title(""), 'autorange': 'reversed'},
+        legend={'orientation': 'h', 'y': -0.15, 'traceorder': 'normal'},
+        height=max(400, len(counts) * 40 + 150)
+    )
+
     return fig
 
 
@@ -278,22 +549,16 @@ def create_kpi_cards_data(df):
     """
     Prépare les données pour les KPI cards
     """
-    kpis = {
-        'N Participants': len(df),
-        'Estime de Soi (moy)': df['Total ES'].mean(),
-        'Valorisation (moy)': df['Total valo'].mean(),
-        'Manque Reconnaissance (moy)': df['Total MR'].mean(),
-        'Gestion Conflits (moy)': df['Total GC'].mean(),
-        'Durée relation (moy)': df['Item5'].mean() if 'Item5' in df.columns else None
-    }
-    
-    return kpis
+    return calculate_kpis(df)
 
 
+@traced('figure')
 def create_parallel_coordinates(data, dimensions, color_col, title):
     """
     Crée un graphique de coordonnées parallèles
     """
+    import plotly.express as px
+
     fig = px.parallel_coordinates(
         data,
         dimensions=dimensions,
@@ -309,78 +574,85 @@ def create_parallel_coordinates(data, dimensions, color_col, title):
     return fig
 
 
+@traced('figure')
 def create_line_chart(data, x, y, title, markers=True, color=None):
     """
-    Crée un graphique en ligne
+    Crée un graphique en ligne (données agrégées)
     """
-    fig = px.line(
-        data,
-        x=x,
-        y=y,
+    groups = data.groupby(color, sort=False) if color else [(None, data)]
+
+    traces = []
+    for group, group_data in groups:
+        trace = {
+            'type': 'scatter',
+            'mode': 'lines+markers' if markers else 'lines',
+            'x': group_data[x].to_numpy(),
+            'y': group_data[y].to_numpy()
+        }
+        if group is not None:
+            trace['name'] = str(group)
+        traces.append(trace)
+
+    fig = build_figure(
+        traces,
         title=title,
-        markers=markers,
-        color=color,
-        template=PLOTLY_LAYOUT_TEMPLATE
-    )
-    
-    fig.update_layout(
-        height=400
+        showlegend=True if color else False,
+        height=400,
+        xaxis={'title': axis_title(x)},
+        yaxis={'title': axis_title(y)}
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_stacked_bar(data, x, y_cols, title):
     """
     Crée un graphique en barres empilées
     """
-    fig = go.Figure()
-    
-    for col in y_cols:
-        fig.add_trace(go.Bar(
-            name=col,
-            x=data[x],
-            y=data[col]
-        ))
-    
-    fig.update_layout(
+    traces = [
+        {'type': 'bar', 'name': col, 'x': data[x].to_numpy(), 'y': data[col].to_numpy()}
+        for col in y_cols
+    ]
+
+    fig = build_figure(
+        traces,
         title=title,
         barmode='stack',
-        template=PLOTLY_LAYOUT_TEMPLATE,
         height=450
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_pie_chart(data, names, values, title):
     """
     Crée un graphique en camembert
     """
-    fig = px.pie(
-        data,
-        names=names,
-        values=values,
+    fig = build_figure(
+        [{
+            'type': 'pie',
+            'labels': data[names].to_numpy(),
+            'values': data[values].to_numpy(),
+            'textposition': 'inside',
+            'textinfo': 'percent+label',
+            'hovertemplate': names + '=%{label}<br>' + values + '=%{value}<extra></extra>'
+        }],
         title=title,
-        template=PLOTLY_LAYOUT_TEMPLATE
-    )
-    
-    fig.update_traces(
-        textposition='inside',
-        textinfo='percent+label'
-    )
-    
-    fig.update_layout(
         height=400
     )
-    
+
     return fig
 
 
+@traced('figure')
 def create_multi_scatter_matrix(data, dimensions, color, title):
     """
     Crée une matrice de scatter plots
     """
+    import plotly.express as px
+
     fig = px.scatter_matrix(
         data,
         dimensions=dimensions,
@@ -396,66 +668,71 @@ def create_multi_scatter_matrix(data, dimensions, color, title):
     return fig
 
 
+@traced('figure')
 def create_comparison_table_figure(grouped_stats, title):
     """
     Crée un tableau de comparaison sous forme de figure Plotly
     """
     # Réinitialiser l'index pour avoir les groupes en colonne
     table_data = grouped_stats.reset_index()
-    
-    fig = go.Figure(data=[go.Table(
-        header=dict(
-            values=list(table_data.columns),
-            fill_color='paleturquoise',
-            align='left',
-            font=dict(size=12, color='black')
-        ),
-        cells=dict(
-            values=[table_data[col] for col in table_data.columns],
-            fill_color='lavender',
-            align='left',
-            font=dict(size=11)
-        )
-    )])
-    
-    fig.update_layout(
+
+    fig = build_figure(
+        [{
+            'type': 'table',
+            'header': {
+                'values': [str(col) for col in table_data.columns],
+                'fill': {'color': 'paleturquoise'},
+                'align': 'left',
+                'font': {'size': 12, 'color': 'black'}
+            },
+            'cells': {
+                'values': [table_data[col].to_numpy() for col in table_data.columns],
+                'fill': {'color': 'lavender'},
+                'align': 'left',
+                'font': {'size': 11}
+            }
+        }],
         title=title,
         height=min(400, 100 + len(table_data) * 30)
     )
-    
+
     return fig
 
 
-def create_dimension_overview(df):
+@traced('figure')
+def create_dimension_overview(df, weighted=False):
     """
     Crée un graphique de vue d'ensemble des 4 dimensions
+    
+    Args:
+        df: DataFrame
+        weighted: Moyennes et écarts-types pondérés (voir calculate_dimension_stats)
     """
     dimensions = ['Estime de Soi', 'Valorisation', 'Manque Reconnaissance', 'Gestion Conflits']
-    totals = ['Total ES', 'Total valo', 'Total MR', 'Total GC']
     colors_list = [COLORS_DIMENSIONS['ES'], COLORS_DIMENSIONS['Valorisation'], 
                    COLORS_DIMENSIONS['MR'], COLORS_DIMENSIONS['GC']]
     
-    means = [df[col].mean() for col in totals]
-    stds = [df[col].std() for col in totals]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=dimensions,
-        y=means,
-        error_y=dict(type='data', array=stds),
-        marker=dict(color=colors_list),
-        text=[f"{m:.1f}" for m in means],
-        textposition='outside'
-    ))
-    
-    fig.update_layout(
+    # Statistiques des scores totaux (mises en cache, dans l'ordre des dimensions)
+    dimension_stats = calculate_dimension_stats(df, weighted=weighted)
+    totals = dimension_stats[dimension_stats['Type'] == 'Score Total']
+    means = totals['Moyenne'].tolist()
+    stds = totals['Écart-type'].tolist()
+
+    fig = build_figure(
+        [{
+            'type': 'bar',
+            'x': dimensions,
+            'y': means,
+            'error_y': {'type': 'data', 'array': stds},
+            'marker': {'color': colors_list},
+            'text': [f"{m:.1f}" for m in means],
+            'textposition': 'outside'
+        }],
         title="Vue d'ensemble des scores moyens par dimension",
-        xaxis_title="Dimension",
-        yaxis_title="Score moyen",
-        template=PLOTLY_LAYOUT_TEMPLATE,
+        xaxis={'title': axis_title("Dimension")},
+        yaxis={'title': axis_title("Score moyen")},
         height=450,
         showlegend=False
     )
-    
-    return fig
\ No newline at end of file
+
+    return fig